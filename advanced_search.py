@@ -3,6 +3,7 @@ from bs4 import BeautifulSoup
 import json
 import time
 from datetime import datetime
+from intent_matcher import SEARCH_INTENT_MATCHER
 
 class AdvancedSearchEngine:
     def __init__(self):
@@ -29,25 +30,7 @@ class AdvancedSearchEngine:
     
     def analyze_search_intent(self, query):
         """Analyze what type of search the user wants"""
-        query_lower = query.lower()
-        
-        # Current events indicators
-        if any(word in query_lower for word in ['latest', 'recent', 'today', 'news', '2024', '2025']):
-            return 'current_events'
-        
-        # Educational indicators
-        if any(word in query_lower for word in ['how to', 'what is', 'explain', 'learn', 'tutorial']):
-            return 'educational'
-        
-        # Local search indicators
-        if any(word in query_lower for word in ['near me', 'nearby', 'local', 'in my area']):
-            return 'local'
-        
-        # Factual indicators
-        if any(word in query_lower for word in ['definition', 'meaning', 'facts about', 'information']):
-            return 'factual'
-        
-        return 'general'
+        return SEARCH_INTENT_MATCHER.first(query, 'general')
     
     def factual_search(self, query):
         """Search for factual information"""
@@ -10,6 +10,8 @@ from datetime import datetime
 from typing import List, Dict, Tuple
 import re
 from urllib.parse import quote
+from cache_engine import LRUCache
+from single_flight import SingleFlight
 
 class AdvancedSearchEngine:
     """Advanced search engine with multiple open sources and precision ranking"""
@@ -23,8 +25,9 @@ class AdvancedSearchEngine:
             'arxiv': self._search_arxiv,
             'dbpedia': self._search_dbpedia,
         }
-        self.cache = {}
         self.result_cache_ttl = 3600  # 1 hour
+        self.cache = LRUCache(ttl=self.result_cache_ttl, name="advanced_search")
+        self.flight = SingleFlight(name="advanced_search")  # Coalesce identical concurrent searches
         
     def search(self, query: str, sources: List[str] = None, max_results: int = 5) -> Dict:
         """
@@ -43,11 +46,15 @@ class AdvancedSearchEngine:
         
         # Check cache
         cache_key = f"{query}:{','.join(sorted(sources))}"
-        if cache_key in self.cache:
-            cached_data = self.cache[cache_key]
-            if (datetime.now() - cached_data['timestamp']).total_seconds() < self.result_cache_ttl:
-                return cached_data['results']
+        cached_results = self.cache.get(cache_key)
+        if cached_results is not None:
+            return cached_results
         
+        flight_key = f"{cache_key}:{max_results}"
+        return self.flight.do(flight_key, self._search_uncached, query, sources, max_results, cache_key)
+    
+    def _search_uncached(self, query: str, sources: List[str], max_results: int, cache_key: str) -> List[Dict]:
+        """Search every source, rank and cache the results"""
         # Optimize query
         optimized_query = self._optimize_query(query)
         
@@ -66,10 +73,7 @@ class AdvancedSearchEngine:
         ranked_results = self._rank_results(all_results, query)
         
         # Cache results
-        self.cache[cache_key] = {
-            'results': ranked_results,
-            'timestamp': datetime.now()
-        }
+        self.cache.set(cache_key, ranked_results)
         
         return ranked_results
     
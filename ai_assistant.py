@@ -11,6 +11,9 @@ import numpy as np
 import whisper
 from functools import lru_cache
 from concurrent.futures import ThreadPoolExecutor
+from cache_engine import LRUCache
+from response_cache import fingerprint
+from single_flight import SingleFlight
 
 # Global model cache to avoid reloading
 _whisper_model_cache = None
@@ -28,7 +31,8 @@ class AIAssistant:
         # Lazy load Whisper model only when needed
         self.whisper_model = None
         self.executor = ThreadPoolExecutor(max_workers=2)
-        self.response_cache = {}  # Cache for search results
+        self.response_cache = LRUCache(name="assistant")  # Cache for search results and AI responses
+        self.flight = SingleFlight(name="assistant")  # Share identical in-flight calls across script reruns
         
     def _load_whisper_model(self):
         """Lazy load Whisper model only when needed"""
@@ -82,24 +86,29 @@ class AIAssistant:
         """Search web using DuckDuckGo (cached)"""
         # Check cache first
         cache_key = f"{query}:{max_results}".lower()
-        if cache_key in self.response_cache:
-            return self.response_cache[cache_key]
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
         try:
-            results = []
-            with DDGS() as ddgs:
-                for result in ddgs.text(query, max_results=max_results):
-                    results.append({
-                        'title': result['title'],
-                        'snippet': result['body'],
-                        'url': result['href']
-                    })
+            results = self.flight.do(cache_key, self._fetch_web_results, query, max_results)
 
             # Cache the results
-            self.response_cache[cache_key] = results
+            self.response_cache.set(cache_key, results)
             return results
         except:
             return []
+
+    def _fetch_web_results(self, query, max_results):
+        results = []
+        with DDGS() as ddgs:
+            for result in ddgs.text(query, max_results=max_results):
+                results.append({
+                    'title': result['title'],
+                    'snippet': result['body'],
+                    'url': result['href']
+                })
+        return results
     
     def search_wikipedia(self, query):
         """Search Wikipedia"""
@@ -112,25 +121,28 @@ class AIAssistant:
     def get_ai_response(self, prompt, context=""):
         """Get response from local AI model (cached)"""
         # Check cache first
-        cache_key = f"{prompt}:{context}".lower()[:100]
-        if cache_key in self.response_cache:
-            return self.response_cache[cache_key]
+        cache_key = fingerprint('llama3.2', "", prompt, context)
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
         try:
             full_prompt = f"Context: {context}\n\nUser: {prompt}\n\nProvide a helpful, concise response:"
 
-            response = ollama.chat(model='llama3.2', messages=[
-                {'role': 'user', 'content': full_prompt}
-            ], stream=False)
-
-            result = response['message']['content']
+            result = self.flight.do(cache_key, self._generate, full_prompt)
 
             # Cache the response
-            self.response_cache[cache_key] = result
+            self.response_cache.set(cache_key, result)
             return result
         except:
             return "AI model not available. Please install Ollama and pull llama3.2 model."
 
+    def _generate(self, full_prompt):
+        response = ollama.chat(model='llama3.2', messages=[
+            {'role': 'user', 'content': full_prompt}
+        ], stream=False)
+        return response['message']['content']
+
     def summarize_content(self, content):
         """Summarize long content (async)"""
         prompt = f"Summarize this content in 2-3 sentences: {content}"
@@ -0,0 +1,74 @@
+"""
+Smart Assistant Commands
+Terminal commands for reminders, habits, goals, personality and smart search, imported on first use
+"""
+
+
+def smart_search(ai, args):
+    print(f"\nSmart search: {args}")
+    results = ai.advanced_search.intelligent_search(args)
+    summary = ai.advanced_search.smart_summarize(results, args)
+    print(f"\n{summary}")
+    ai.speak(summary)
+
+
+def personality_mode(ai, args):
+    greeting = ai.ai_personality.generate_greeting()
+    starter = ai.ai_personality.get_conversation_starter(ai.memory_system.topics)
+    print(f"\n🤖 {greeting} {starter}")
+    ai.speak(f"{greeting} {starter}")
+
+
+def remind(ai, args):
+    # "remind call mom at 6pm"
+    message, sep, time_str = args.rpartition(' at ')
+    if not sep:
+        print("Usage: remind [message] at [time]")
+        return
+    result = ai.smart_assistant.set_reminder(message.strip(), time_str.strip())
+    print(f"⏰ {result}")
+    ai.speak(result)
+
+
+def habit(ai, args):
+    name = args.strip()
+    result = ai.smart_assistant.track_habit(name)
+    streak = ai.smart_assistant.habits[name]['streak']
+    print(f"✅ {result} (streak: {streak} days)")
+    ai.speak(result)
+
+
+def goal(ai, args):
+    # "goal read books 12 by 2026-12-31"
+    goal_text, _, target_date = args.partition(' by ')
+    parts = goal_text.rsplit(' ', 1)
+    if len(parts) != 2:
+        print("Usage: goal [name] [target] by [date]")
+        return
+    name, target = parts
+    try:
+        target_value = int(target) if target.isdigit() else float(target)
+    except ValueError:
+        print("Goal target must be a number")
+        return
+    result = ai.smart_assistant.set_goal(name.strip(), target_value, target_date.strip() or "no deadline")
+    print(f"🎯 {result}")
+    ai.speak(result)
+
+
+def daily_summary(ai, args):
+    summary = ai.smart_assistant.get_daily_summary().replace("\\n", "\n")
+    print(f"\n📋 Daily Summary:\n{summary}")
+    print(ai.smart_assistant.get_motivational_message())
+    ai.speak(summary)
+
+
+def suggestions(ai, args):
+    tips = ai.smart_assistant.smart_suggestions()
+    if tips:
+        print("\n💡 Suggestions:")
+        for tip in tips:
+            print(f"- {tip}")
+        ai.speak(tips[0])
+    else:
+        print("No suggestions right now - keep going!")
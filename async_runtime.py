@@ -0,0 +1,55 @@
+"""
+Async Runtime
+Background asyncio event loop shared by the async TerminalAI core and its sync wrappers
+"""
+
+import asyncio
+import threading
+
+
+class AsyncRuntime:
+    """Runs an event loop in a daemon thread so sync code can call async code"""
+
+    def __init__(self, executor=None):
+        self.loop = asyncio.new_event_loop()
+        if executor is not None:
+            # asyncio.to_thread / run_in_executor use this pool
+            self.loop.set_default_executor(executor)
+
+        self.thread = threading.Thread(target=self._run_loop, name="ai-event-loop", daemon=True)
+        self.thread.start()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_forever()
+        finally:
+            # Cancel what is still scheduled (keep-alive pings, digests) and free the loop
+            tasks = asyncio.all_tasks(self.loop)
+            for task in tasks:
+                task.cancel()
+            self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+            self.loop.close()
+
+    def in_loop_thread(self):
+        """True when called from the event loop thread"""
+        return threading.current_thread() is self.thread
+
+    def run(self, coro, timeout=None):
+        """Run a coroutine on the loop and block until it finishes"""
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError("Blocking call from the event loop thread - await the async method instead")
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    def submit(self, coro):
+        """Schedule a coroutine without waiting, returns a concurrent Future"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def stop(self):
+        """Stop the loop, cancelling pending coroutines, and wait for its thread"""
+        if self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+        if not self.in_loop_thread():
+            self.thread.join(timeout=5)
@@ -0,0 +1,140 @@
+"""
+Cache Engine
+Bounded LRU cache with per-entry TTL, shared by the search and AI response caches
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import performance_config
+
+_MISSING = object()
+
+
+def estimate_size(value):
+    """Rough size of a cached value in bytes"""
+    if isinstance(value, (str, bytes)):
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """Thread-safe LRU cache with TTL expiry and an entry and/or byte budget"""
+
+    def __init__(self, max_entries=None, ttl=None, max_bytes=None, name="cache"):
+        self.name = name
+        self.max_entries = performance_config.MAX_CACHE_SIZE if max_entries is None else max_entries
+        self.ttl = performance_config.CACHE_TTL if ttl is None else ttl
+        self.max_bytes = performance_config.MAX_CACHE_BYTES if max_bytes is None else max_bytes
+
+        self._data = OrderedDict()  # key -> (value, expires_at, size)
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        """Return the cached value, or default if missing or expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, expires_at, _ = entry
+            if expires_at is not None and time.monotonic() >= expires_at:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        """Store a value, evicting least recently used entries if over budget"""
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        size = estimate_size(value) if self.max_bytes else 0
+
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+
+            self._data[key] = (value, expires_at, size)
+            self.total_bytes += size
+            self._evict()
+
+    def _remove(self, key):
+        _, _, size = self._data.pop(key)
+        self.total_bytes -= size
+
+    def _evict(self):
+        """Drop oldest entries until both budgets are met"""
+        while self._data and (
+            (self.max_entries and len(self._data) > self.max_entries) or
+            (self.max_bytes and self.total_bytes > self.max_bytes)
+        ):
+            key = next(iter(self._data))
+            self._remove(key)
+            self.evictions += 1
+
+    def purge_expired(self):
+        """Remove every expired entry, returns how many were dropped"""
+        now = time.monotonic()
+        with self._lock:
+            expired = [k for k, (_, expires_at, _) in self._data.items()
+                       if expires_at is not None and now >= expires_at]
+            for key in expired:
+                self._remove(key)
+            self.expirations += len(expired)
+        return len(expired)
+
+    def pop(self, key, default=None):
+        """Remove and return a value"""
+        with self._lock:
+            if key not in self._data:
+                return default
+            value = self._data[key][0]
+            self._remove(key)
+            return value
+
+    def clear(self):
+        """Remove all entries (counters are kept)"""
+        with self._lock:
+            self._data.clear()
+            self.total_bytes = 0
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        """Hit/miss/eviction counters and current usage"""
+        lookups = self.hits + self.misses
+        return {
+            'name': self.name,
+            'entries': len(self._data),
+            'max_entries': self.max_entries,
+            'bytes': self.total_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations
+        }
+
@@ -0,0 +1,115 @@
+"""
+Chat Session
+Multi-turn conversation sent to Ollama as real user/assistant messages behind a stable
+system prompt. Earlier turns are never rewritten, so Ollama can reuse its cached prompt
+prefix and only evaluate the new turn. When the history outgrows its token budget the
+oldest turns are rolled into a summary. Context recalled from long-term memory is sent
+with each turn, after the cached prefix, and never becomes part of the history.
+"""
+
+import json
+import threading
+from prompt_budget import TOKEN_COUNTER, MESSAGE_OVERHEAD
+
+SUMMARY_PREFIX = "Summary of the earlier conversation: "
+MEMORY_PREFIX = "Remembered from earlier conversations: "
+
+
+class ChatSession:
+    """Rolling multi-turn chat history"""
+
+    def __init__(self, system_prompt, max_tokens, keep_turns=2, counter=None):
+        self.system_prompt = system_prompt
+        self.max_tokens = max_tokens  # Budget for summary + history turns
+        self.keep_turns = keep_turns  # Most recent turns never rolled into the summary
+        self.counter = counter or TOKEN_COUNTER
+        self.summary = ""
+        self.turns = []  # [(user, assistant), ...]
+        self.rolls = 0
+        self.last_key = None  # Key of the last recorded model call
+        self._lock = threading.Lock()
+
+    def prefix(self):
+        """Messages before the new turn - identical from one turn to the next"""
+        messages = [{'role': 'system', 'content': self.system_prompt}]
+        if self.summary:
+            messages.append({'role': 'system', 'content': SUMMARY_PREFIX + self.summary})
+        for user, assistant in self.turns:
+            messages.append({'role': 'user', 'content': user})
+            messages.append({'role': 'assistant', 'content': assistant})
+        return messages
+
+    def messages(self, prompt, memory=""):
+        """Full message list for a new user turn, with this turn's recalled memory just before it"""
+        with self._lock:
+            messages = self.prefix()
+        if memory:
+            messages.append({'role': 'system', 'content': MEMORY_PREFIX + memory})
+        return messages + [{'role': 'user', 'content': prompt}]
+
+    def prefix_key(self, messages):
+        """Stable text of everything before the last message, for cache keys"""
+        return json.dumps(messages[:-1], ensure_ascii=False)
+
+    def record(self, user, assistant, key=None):
+        """Append a finished turn, returns False if it was already recorded
+
+        key identifies the model call (prompt and history): callers that shared
+        one coalesced call all try to record it, but it is one turn.
+        """
+        with self._lock:
+            if key is not None and key == self.last_key:
+                return False
+            self.last_key = key
+            self.turns.append((user, assistant))
+            return True
+
+    def user_turns(self):
+        """User messages in the history"""
+        with self._lock:
+            return {user for user, _ in self.turns}
+
+    def history_tokens(self):
+        tokens = self.counter.count(self.summary)
+        for user, assistant in self.turns:
+            tokens += self.counter.count(user) + self.counter.count(assistant) + 2 * MESSAGE_OVERHEAD
+        return tokens
+
+    def needs_roll(self):
+        """True when the history is over budget and has turns old enough to roll"""
+        return len(self.turns) > self.keep_turns and self.history_tokens() > self.max_tokens
+
+    def turns_to_roll(self):
+        """Summary and the oldest turns to fold into a new summary"""
+        with self._lock:
+            return self.summary, list(self.turns[:len(self.turns) - self.keep_turns])
+
+    def apply_roll(self, rolled_count, summary):
+        """Replace the summary and drop the turns it now covers"""
+        with self._lock:
+            self.summary = self.counter.truncate(summary.strip(), self.max_tokens // 3)
+            self.turns = self.turns[rolled_count:]
+            self.rolls += 1
+
+    def transcript(self, summary, turns):
+        """Plain text of a summary and turns, to be summarized"""
+        lines = [f"Earlier: {summary}"] if summary else []
+        for user, assistant in turns:
+            lines.append(f"User: {user}\nAssistant: {assistant}")
+        return "\n".join(lines)
+
+    def reset(self):
+        with self._lock:
+            self.summary = ""
+            self.turns = []
+            self.last_key = None
+
+    def stats(self):
+        """Session size counters"""
+        return {
+            'turns': len(self.turns),
+            'history_tokens': self.history_tokens(),
+            'max_tokens': self.max_tokens,
+            'summary_tokens': self.counter.count(self.summary),
+            'rolls': self.rolls
+        }
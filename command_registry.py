@@ -0,0 +1,136 @@
+"""
+Command Registry
+Terminal commands registered by decorator and dispatched through a word trie.
+Dispatch walks at most one trie node per command word, so chat messages that
+are not commands cost a dictionary lookup or two instead of a scan over every command.
+"""
+
+import importlib
+
+
+class Command:
+    """A registered command and its help entry"""
+
+    def __init__(self, name, handler, usage=None, help="", section="General", args=False, hidden=False):
+        self.name = name
+        self.usage = usage or name
+        self.help = help
+        self.section = section
+        self.args = args  # True: "name [text]", False: exact "name" only, None: either
+        self.hidden = hidden
+        # Either a callable or a "module:function" reference resolved on first use
+        self._handler = handler
+
+    @property
+    def handler(self):
+        if isinstance(self._handler, str):
+            module_name, _, attr = self._handler.partition(':')
+            self._handler = getattr(importlib.import_module(module_name), attr)
+        return self._handler
+
+    @property
+    def resolved(self):
+        """True once the handler has been imported"""
+        return not isinstance(self._handler, str)
+
+
+class _Node:
+    __slots__ = ('children', 'exact', 'with_args')
+
+    def __init__(self):
+        self.children = {}
+        self.exact = None  # Command run when the input ends here
+        self.with_args = None  # Command run when more text follows
+
+
+class CommandRegistry:
+    """Prefix trie of command words -> handlers"""
+
+    def __init__(self):
+        self.root = _Node()
+        self.commands = []
+        self.sections = []
+        self.max_words = 0
+
+    def _section(self, section):
+        if section not in self.sections:
+            self.sections.append(section)
+
+    def register(self, name, handler, usage=None, help="", section="General", args=False, hidden=False):
+        """Register handler(ai, args) under the words of name
+
+        handler may be a "module:function" string so heavy modules load on first use.
+        """
+        command = Command(name, handler, usage, help, section, args, hidden)
+        words = name.lower().split()
+        self.max_words = max(self.max_words, len(words))
+        node = self.root
+        for word in words:
+            node = node.children.setdefault(word, _Node())
+
+        if args is not False:
+            node.with_args = command
+        if not args:
+            node.exact = command
+
+        self.commands.append(command)
+        self._section(section)
+        return command
+
+    def command(self, name, usage=None, help="", section="General", args=False, aliases=()):
+        """Decorator form of register(); aliases share the handler but stay out of the help"""
+        def decorator(handler):
+            self.register(name, handler, usage, help, section, args)
+            for alias in aliases:
+                self.register(alias, handler, section=section, args=args, hidden=True)
+            return handler
+        return decorator
+
+    def describe(self, usage, help, section="General"):
+        """Help-only entry for input handled outside the registry (quit, chat)"""
+        self.commands.append(Command(usage, None, usage, help, section))
+        self._section(section)
+
+    def lookup(self, text):
+        """Find the command for text, returns (command, args) or (None, None)
+
+        The longest run of matching words wins, so "search memory x" beats "search x".
+        """
+        # Only the leading command words are split off, the rest of the message is never scanned
+        words = text.split(None, self.max_words)
+        node = self.root
+        found = None
+        for depth, word in enumerate(words[:self.max_words], 1):
+            node = node.children.get(word.lower())
+            if node is None:
+                break
+            if depth == len(words):
+                if node.exact:
+                    found = (node.exact, depth)
+            elif node.with_args:
+                found = (node.with_args, depth)
+
+        if found is None:
+            return None, None
+
+        command, depth = found
+        parts = text.split(None, depth)
+        return command, parts[depth] if len(parts) > depth else ""
+
+    def dispatch(self, ai, text):
+        """Run the command for text, returns False if text is not a command"""
+        command, args = self.lookup(text)
+        if command is None:
+            return False
+        command.handler(ai, args)
+        return True
+
+    def help_lines(self):
+        """Help screen lines grouped by section in registration order"""
+        lines = []
+        for section in self.sections:
+            lines.append(f"\n{section}:")
+            for command in self.commands:
+                if command.section == section and not command.hidden:
+                    lines.append(f"  {command.usage:<23} - {command.help}")
+        return lines
@@ -0,0 +1,92 @@
+"""
+Test Helpers for TerminalAI
+A headless TerminalAI built inside a temporary working directory, with a fake Ollama client.
+pytest loads this file on its own; test modules import the helpers from it so they also
+run as plain scripts, and the assistant itself never imports it.
+"""
+
+import asyncio
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+
+class FakeClient:
+    """Fake Ollama async client that records the messages of every chat call
+
+    The Nth call answers "answer N"; delay makes identical calls overlap and the
+    first failures calls raise as if Ollama were down.
+    Streamed calls yield the answer word by word like Ollama's chunks.
+    """
+
+    def __init__(self, delay=0, failures=0):
+        self.calls = []
+        self.delay = delay
+        self.failures = failures
+
+    async def chat(self, model, messages, stream=False, **options):
+        self.calls.append(messages)
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("Ollama is not running")
+        answer = f"answer {len(self.calls)}"
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if stream:
+            return self._stream(answer)
+        return {'message': {'content': answer}, 'done': True}
+
+    async def _stream(self, answer):
+        words = answer.split(" ")
+        for i, word in enumerate(words):
+            yield {'message': {'content': word if i == 0 else " " + word}, 'done': False}
+        yield {'message': {'content': ""}, 'done': True, 'eval_count': len(words)}
+
+
+class FakeSearchEngine:
+    """Search engine with the async interface TerminalAI uses, recording every query"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def asmart_search(self, query):
+        self.calls.append(query)
+        await asyncio.sleep(0.01)
+        return f"results for {query}"
+
+
+def settle(ai):
+    """Wait for the background saves submitted so far (memory, knowledge, caches)"""
+    ai.executor.shutdown(wait=True)
+    ai.executor = ThreadPoolExecutor(max_workers=4)
+
+
+@contextmanager
+def headless_ai(client=None):
+    """Yield (ai, directory): a headless TerminalAI whose files all live in directory
+
+    The temporary directory is the working directory until the block ends, so
+    the response cache, knowledge log, memory and metrics files named in
+    performance_config are created there instead of in the repository.
+    """
+    from terminal_ai import TerminalAI
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        ai = None
+        try:
+            ai = TerminalAI(headless=True)
+            ai.semantic_cache = None
+            ai._ollama_client = client if client is not None else FakeClient()
+            yield ai, directory
+        finally:
+            if ai is not None:
+                # Background writes (metrics, saved answers) land before the stores close
+                ai.executor.shutdown(wait=True)
+                ai.shutdown()
+                ai.persistent_cache.close()
+                ai.runtime.stop()
+                ai.pipeline_executor.shutdown(wait=True)
+            os.chdir(cwd)
@@ -0,0 +1,161 @@
+"""
+Episodic Memory
+Vector index over past conversations, so get_context_for_query can recall turns
+that are relevant but old. Embeddings are computed in the background when a
+conversation is added and kept in a fixed-size float32 ring buffer memory-mapped
+on disk; lookups are one vectorized cosine top-k over it.
+"""
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import performance_config
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, episodic memory simply stays disabled
+    np = None
+
+
+class EpisodicMemory:
+    """Conversation embeddings with top-k cosine search"""
+
+    def __init__(self, path=None, capacity=None, model=None, embed_fn=None):
+        self.path = path or performance_config.EPISODIC_MEMORY_FILE
+        self.meta_path = self.path + ".json"
+        self.ids_path = self.path + ".ids"
+        self.capacity = capacity or performance_config.EPISODIC_MEMORY_CAPACITY
+        self.model = model or performance_config.EMBEDDING_MODEL
+        self.embed_fn = embed_fn or self._ollama_embed
+        self.enabled = np is not None
+
+        self.dim = None
+        self.vectors = None  # (capacity, dim) float32 memmap, rows are unit length
+        self.ids = None  # (capacity,) int64 memmap, conversation id per row (-1 = empty)
+        self.next_slot = 0
+        self.filled = 0  # Rows in use - the first rows until the buffer wraps, then all of them
+        self._lock = threading.Lock()
+        # One worker, so embeddings are stored in the order conversations were added
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._last_task = None
+        self.failures = 0  # Embedding calls that failed (the turn is stored or searched without one)
+
+        if self.enabled:
+            self._open()
+
+    def _ollama_embed(self, text):
+        import ollama
+        response = ollama.embeddings(model=self.model, prompt=text)
+        return response['embedding']
+
+    def _open(self):
+        """Map existing files (nothing exists before the first embedding)"""
+        try:
+            with open(self.meta_path, 'r') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return
+        if meta.get('capacity') != self.capacity:
+            return  # Capacity changed - start over
+        try:
+            # A short file would be mapped zero-filled as if it held data
+            if (os.path.getsize(self.path) != self.capacity * meta['dim'] * np.dtype(np.float32).itemsize
+                    or os.path.getsize(self.ids_path) != self.capacity * np.dtype(np.int64).itemsize):
+                return  # Truncated - start over, the first embedding remaps both files
+            self._map(meta['dim'], 'r+')
+        except (OSError, ValueError, KeyError, TypeError):
+            # Missing or unreadable files - start over the same way
+            self.dim = self.vectors = self.ids = None
+            return
+        self.next_slot = meta['next_slot']
+        self.filled = meta.get('filled', self.capacity)
+
+    def _map(self, dim, mode):
+        self.dim = dim
+        self.vectors = np.memmap(self.path, dtype=np.float32, mode=mode, shape=(self.capacity, dim))
+        self.ids = np.memmap(self.ids_path, dtype=np.int64, mode=mode, shape=(self.capacity,))
+        if mode == 'w+':
+            self.ids[:] = -1
+
+    def _write_meta(self):
+        temp_path = self.meta_path + ".tmp"
+        with open(temp_path, 'w') as f:
+            json.dump({'dim': self.dim, 'capacity': self.capacity, 'next_slot': self.next_slot,
+                       'filled': self.filled}, f)
+        os.replace(temp_path, self.meta_path)
+
+    def embed(self, text):
+        """Unit-length float32 embedding"""
+        vector = np.asarray(self.embed_fn(text), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def add(self, conversation_id, text):
+        """Embed and store a conversation in the background"""
+        if self.enabled:
+            self._last_task = self._executor.submit(self._add, conversation_id, text)
+
+    def _add(self, conversation_id, text):
+        try:
+            vector = self.embed(text)
+        except Exception:
+            self.failures += 1
+            return
+
+        with self._lock:
+            if self.vectors is None or vector.shape[0] != self.dim:
+                self._map(vector.shape[0], 'w+')  # First embedding, or the model changed
+                self.next_slot = self.filled = 0
+            slot = self.next_slot
+            self.vectors[slot] = vector
+            self.ids[slot] = conversation_id
+            self.next_slot = (slot + 1) % self.capacity
+            self.filled = max(self.filled, slot + 1)
+            self.vectors.flush()
+            self.ids.flush()
+            self._write_meta()
+
+    def wait(self):
+        """Block until queued embeddings are stored"""
+        if self._last_task is not None:
+            self._last_task.result()
+
+    def search(self, query, k):
+        """[(conversation id, cosine similarity), ...] best first"""
+        if not self.enabled or self.vectors is None:
+            return []
+        try:
+            vector = self.embed(query)
+        except Exception:
+            self.failures += 1
+            return []
+
+        with self._lock:
+            n = self.filled
+            if vector.shape[0] != self.dim or n == 0:
+                return []
+            similarities = np.asarray(self.vectors[:n] @ vector)
+            similarities[np.asarray(self.ids[:n]) < 0] = -np.inf
+            k = min(k, n)
+            top = np.argpartition(-similarities, k - 1)[:k]
+            top = top[np.argsort(-similarities[top])]
+            return [(int(self.ids[row]), float(similarities[row])) for row in top if similarities[row] > -np.inf]
+
+    def __len__(self):
+        return 0 if self.ids is None else int(np.count_nonzero(np.asarray(self.ids) >= 0))
+
+    def clear(self):
+        """Forget every embedding"""
+        self.wait()
+        with self._lock:
+            if self.ids is not None:
+                self.ids[:] = -1
+                self.ids.flush()
+                self.next_slot = self.filled = 0
+                self._write_meta()
+
+    def close(self):
+        self.wait()
+        self._executor.shutdown(wait=True)
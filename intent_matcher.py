@@ -0,0 +1,198 @@
+"""
+Intent Matcher
+Finds every keyword category in a query with one compiled regex pass.
+Keyword tables are declared here and compiled once at import time.
+"""
+
+import re
+
+
+class IntentMatcher:
+    """Multi-pattern substring matcher over declarative keyword tables"""
+
+    def __init__(self, tables):
+        # Table order is priority order for first()
+        self.order = list(tables)
+        keyword_categories = {}
+        for category, keywords in tables.items():
+            for keyword in keywords:
+                keyword_categories.setdefault(keyword, set()).add(category)
+
+        # A match only reports the longest keyword at each position, so every
+        # keyword also carries the categories of keywords that are its prefixes
+        self.categories = {}
+        for keyword in keyword_categories:
+            closure = set()
+            for other, categories in keyword_categories.items():
+                if keyword.startswith(other):
+                    closure |= categories
+            self.categories[keyword] = frozenset(closure)
+
+        # Lookahead finds overlapping matches, so results equal `keyword in text`;
+        # the alternation is built as a trie so shared prefixes are tested once
+        self.pattern = re.compile(f"(?=({_trie_regex(keyword_categories)}))")
+
+    def match(self, text):
+        """Set of every category with a keyword in text"""
+        found = set()
+        for keyword in self.pattern.findall(text.lower()):
+            found |= self.categories[keyword]
+        return found
+
+    def first(self, text, default=None):
+        """Highest priority matching category"""
+        found = self.match(text)
+        for category in self.order:
+            if category in found:
+                return category
+        return default
+
+
+def _trie_regex(keywords):
+    """Regex equivalent to the longest-first alternation of keywords, factored by prefix"""
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = True  # End of keyword
+    return _node_regex(trie)
+
+
+def _node_regex(node):
+    branches = [re.escape(char) + _node_regex(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+    # Longer keywords are tried first, the keyword ending here is the fallback
+    return f"(?:{body})?" if '' in node else body
+
+
+# TerminalAI.needs_search
+SEARCH_DECISION_TABLES = {
+    # Don't search for basic conversational responses
+    'skip_search': [
+        'hello', 'hi', 'thanks', 'thank you', 'bye', 'goodbye',
+        'how are you', 'what can you do', 'who are you', 'good morning',
+        'good evening', 'nice', 'great', 'okay', 'yes', 'no', 'sure',
+        'alright', 'fine', 'cool', 'awesome', 'perfect'
+    ],
+    # Don't search for basic knowledge questions
+    'basic_knowledge': [
+        'what is love', 'what is life', 'what is happiness', 'what is time',
+        'what is water', 'what is fire', 'what is earth', 'what is air',
+        'what is human', 'what is animal', 'what is plant', 'what is tree',
+        'what is sun', 'what is moon', 'what is oxygen', 'what is carbon',
+        'what is house', 'what is home', 'what is building', 'what is room'
+    ],
+    # Don't search for basic anatomy/science facts
+    'basic_science': [
+        'bones in human', 'bones in body', 'human bones', 'total bones'
+    ],
+    # Don't search for general concepts or philosophical questions
+    'general_concepts': [
+        'functions within', 'evolved over time', 'technological advancement',
+        'societal values', 'how they have changed', 'what do you think',
+        'your opinion', 'explain to me', 'tell me more', 'can you explain',
+        'search story', 'story search'
+    ],
+    # Don't search for conversational requests
+    'conversational': [
+        'can you ask me', 'ask me a question', 'quiz me', 'test me',
+        'can you help', 'help me with', 'i want to', 'let me',
+        'what do you think', 'your thoughts', 'your opinion'
+    ],
+    # Only search for specific information needs
+    'search_trigger': [
+        # Current/time-sensitive info
+        'current', 'latest', 'recent', 'today', 'now', '2024', '2025',
+        # Specific data requests
+        'price', 'cost', 'statistics', 'population', 'news', 'rate', 'crime',
+        # Weather and location
+        'weather', 'temperature', 'forecast',
+        # Specific factual queries
+        'best colleges', 'best hospitals', 'best restaurants',
+        'deaths in', 'mortality in', 'happened in', 'crime rate'
+    ],
+    # Search for specific patterns
+    'search_pattern': [
+        'tell me about current', 'latest information about', 'recent details about',
+        'what happened recently', 'how many people', 'current statistics',
+        'best in 2024', 'best in 2025', 'near me', 'in this pin code'
+    ],
+    # "How" questions about general concepts
+    'general_how': ['evolved', 'changed', 'developed', 'work', 'function']
+}
+
+# UnifiedSearchEngine._detect_search_type (in priority order)
+SEARCH_TYPE_TABLES = {
+    'news': ['news', 'latest', 'recent', 'today', 'breaking', 'current'],
+    'academic': ['research', 'paper', 'study', 'academic', 'journal', 'thesis'],
+    'statistics': ['statistics', 'data', 'percent', 'average', 'rate', 'number'],
+    'definition': ['define', 'meaning', 'what is', 'definition', 'explain'],
+    'images': ['image', 'picture', 'photo', 'show me', 'look like'],
+    'videos': ['video', 'youtube', 'watch', 'tutorial', 'how to'],
+    'local': ['near me', 'nearby', 'local', 'in my area', 'around'],
+    'weather': ['weather', 'temperature', 'forecast', 'rain', 'sunny'],
+    'products': ['buy', 'price', 'product', 'shop', 'store', 'cost'],
+    'jobs': ['job', 'hiring', 'career', 'position', 'employment'],
+    'recipes': ['recipe', 'cook', 'ingredients', 'prepare', 'make']
+}
+
+# MultiSearchEngine source selection (in priority order)
+SOURCE_TABLES = {
+    'current': ['news', 'latest', 'recent', 'today', 'current'],
+    'education': ['college', 'university', 'school', 'education'],
+    'definition': ['what is', 'define', 'meaning', 'explain'],
+    'statistics': ['population', 'statistics', 'data', 'demographics'],
+    'institute': ['institute'],
+    'mortality': ['deaths', 'mortality', 'crime', 'crime rate'],
+    'business': ['company', 'business', 'stock', 'economy'],
+    'science': ['technology', 'science', 'research']
+}
+
+# advanced_search.AdvancedSearchEngine.analyze_search_intent (in priority order)
+SEARCH_INTENT_TABLES = {
+    'current_events': ['latest', 'recent', 'today', 'news', '2024', '2025'],
+    'educational': ['how to', 'what is', 'explain', 'learn', 'tutorial'],
+    'local': ['near me', 'nearby', 'local', 'in my area'],
+    'factual': ['definition', 'meaning', 'facts about', 'information']
+}
+
+# AdvancedMemorySystem.detect_topic (in priority order)
+TOPIC_TABLES = {
+    'weather': ['weather', 'temperature', 'forecast', 'rain', 'sunny'],
+    'health': ['bones', 'body', 'disease', 'medicine', 'doctor'],
+    'education': ['college', 'school', 'university', 'study'],
+    'technology': ['computer', 'software', 'internet'],
+    'location': ['pincode', 'address', 'city', 'place'],
+    'news': ['news', 'current', 'latest', 'today'],
+    'crime': ['crime', 'police', 'murder', 'theft'],
+    'population': ['population', 'people', 'demographics'],
+    'stories': ['story', 'ghost', 'horror', 'adventure', 'romance', 'tale']
+}
+
+# TerminalAI.answer_type: whole phrases only, so "define" is never "fine"
+# Answers such as "yes", "no" or "fine" reply to the assistant and get a full answer
+GREETING_PHRASES = [
+    'hello', 'hi', 'hey', 'thanks', 'thank you', 'bye', 'goodbye', 'how are you',
+    'what can you do', 'who are you', 'good morning', 'good afternoon', 'good evening',
+    'good night', 'nice', 'okay', 'ok', 'alright', 'cool', 'awesome', 'perfect'
+]
+# Only after a greeting phrase ("hi there", "thanks a lot") - never on their own
+GREETING_SUFFIXES = ['there', 'so much', 'a lot', 'again']
+GREETING_PATTERN = re.compile(
+    rf"(?:(?:{_trie_regex(GREETING_PHRASES)})(?: (?:{_trie_regex(GREETING_SUFFIXES)}))?(?: |$))+")
+
+
+def is_greeting(text):
+    """True when text is nothing but greeting phrases ("hi there", "thanks a lot")"""
+    words = " ".join(re.findall(r"[a-z]+", text.lower()))
+    return bool(words) and GREETING_PATTERN.fullmatch(words) is not None
+
+
+SEARCH_DECISION_MATCHER = IntentMatcher(SEARCH_DECISION_TABLES)
+SEARCH_TYPE_MATCHER = IntentMatcher(SEARCH_TYPE_TABLES)
+SOURCE_MATCHER = IntentMatcher(SOURCE_TABLES)
+SEARCH_INTENT_MATCHER = IntentMatcher(SEARCH_INTENT_TABLES)
+TOPIC_MATCHER = IntentMatcher(TOPIC_TABLES)
@@ -0,0 +1,477 @@
+"""
+Knowledge Store
+Search-backed answers saved by TerminalAI, indexed with BM25 over normalized
+queries and answers so a repeated question is answered locally in milliseconds.
+BM25 only ranks candidates: an answer is reused only when every content word of
+the new question is in the saved one.
+Entries expire by age, with a shorter lifetime for time-sensitive query types.
+An answer built from one user's own context is saved for that owner: other owners
+never see it, and it wins over a shared answer to the same question.
+
+Answers live in an append-only JSONL log: a save is one appended line and answers are
+read back by offset only when they are returned. A snapshot of the index (everything
+but the answers) lets startup skip the log up to the snapshot point. Compaction rewrites
+the log without replaced or expired entries and swaps files with atomic renames.
+"""
+
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+import performance_config
+from intent_matcher import SEARCH_TYPE_MATCHER
+
+WORD_PATTERN = re.compile(r"\w+")
+STOPWORDS = {
+    'a', 'an', 'the', 'is', 'are', 'was', 'were', 'be', 'of', 'in', 'on', 'at', 'to', 'for',
+    'and', 'or', 'what', 'who', 'whom', 'which', 'how', 'why', 'when', 'where', 'do', 'does',
+    'did', 'can', 'could', 'tell', 'me', 'about', 'please', 'give', 'show', 'i', 'you', 'my'
+}
+QUERY_WEIGHT = 2  # Query terms count twice: they describe the entry better than the answer does
+
+
+def normalize(text):
+    """Lowercase content words with plural 's' stripped"""
+    terms = []
+    for word in WORD_PATTERN.findall(text.lower()):
+        if word in STOPWORDS:
+            continue
+        if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+            word = word[:-1]
+        terms.append(word)
+    return terms
+
+
+class KnowledgeStore:
+    """BM25 inverted index over saved answers"""
+
+    def __init__(self, path=None, ttls=None, min_score=None, min_coverage=None, k1=1.5, b=0.75,
+                 legacy_path=None, compact_after=None):
+        self.path = path or performance_config.KNOWLEDGE_LOG_FILE
+        self.snapshot_path = self.path + ".snapshot"
+        self.legacy_path = legacy_path  # Whole-file JSON written before the log, imported once
+        self.compact_after = compact_after or performance_config.KNOWLEDGE_COMPACT_AFTER
+        self.ttls = ttls or performance_config.KNOWLEDGE_TTL
+        self.min_score = performance_config.KNOWLEDGE_MIN_SCORE if min_score is None else min_score
+        self.min_coverage = performance_config.KNOWLEDGE_MIN_COVERAGE if min_coverage is None else min_coverage
+        self.k1 = k1
+        self.b = b
+
+        self.entries = {}  # normalized query key -> entry without the answer, plus its log offset
+        self.postings = {}  # term -> {key: term frequency}
+        self.lengths = {}  # key -> document length in terms
+        self.total_length = 0
+        self._lock = threading.RLock()
+        # Serializes compaction and snapshots, whose file I/O runs without the index lock
+        self._maintenance_lock = threading.Lock()
+        self._log = None  # Append handle
+        self._reader = None  # Read handle for answers by offset
+
+        self.dead = 0  # Log records replaced, deleted or expired since the last compaction
+        self.since_snapshot = 0  # Log records not covered by the snapshot
+        self.compactions = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+
+    def _key(self, query, owner=None):
+        key = " ".join(normalize(query)) or query.strip().lower()
+        return key if owner is None else f"{owner}\x1f{key}"
+
+    def _ttl(self, query):
+        """Shortest lifetime among the query's search types (news and weather go stale fast)"""
+        kinds = SEARCH_TYPE_MATCHER.match(query.lower())
+        ttls = [self.ttls[kind] for kind in kinds if kind in self.ttls]
+        return min(ttls) if ttls else self.ttls['default']
+
+    def _index(self, key, entry):
+        if key in self.entries:
+            self._unindex(key)
+            self.dead += 1
+        for term, count in entry['terms'].items():
+            self.postings.setdefault(term, {})[key] = count
+        self.lengths[key] = sum(entry['terms'].values())
+        self.total_length += self.lengths[key]
+        self.entries[key] = entry
+
+    def _unindex(self, key):
+        entry = self.entries.pop(key)
+        for term in entry['terms']:
+            postings = self.postings.get(term)
+            if postings is not None:
+                postings.pop(key, None)
+                if not postings:
+                    del self.postings[term]
+        self.total_length -= self.lengths.pop(key)
+
+    def _expire(self, key):
+        self._unindex(key)
+        self.dead += 1
+        self.expired += 1
+
+    def _append(self, record):
+        """Append one log record, returns its offset"""
+        if self._log is None:
+            self._log = open(self.path, 'ab')
+        offset = self._log.tell()
+        self._log.write(json.dumps(record, ensure_ascii=False).encode('utf-8') + b"\n")
+        self._log.flush()
+        self.since_snapshot += 1
+        return offset
+
+    def _read(self, offset):
+        """Log record at offset"""
+        if self._reader is None:
+            self._reader = open(self.path, 'rb')
+        self._reader.seek(offset)
+        return json.loads(self._reader.readline())
+
+    def _close_files(self):
+        for handle in (self._log, self._reader):
+            if handle is not None:
+                handle.close()
+        self._log = self._reader = None
+
+    def answer(self, key):
+        """Answer of an entry, read from the log"""
+        with self._lock:
+            return self._read(self.entries[key]['offset'])['answer']
+
+    def add(self, query, answer, query_type='search', owner=None):
+        """Save an answer, replacing any entry for the same normalized query and owner
+
+        owner (a user id) keeps the answer from everyone else; None shares it.
+        """
+        now = time.time()
+        key = self._key(query, owner)
+        entry = {
+            'key': key,
+            'query': query,
+            'query_type': query_type,
+            'owner': owner,
+            'timestamp': datetime.fromtimestamp(now).isoformat(),
+            'expires': now + self._ttl(query),
+            'terms': Counter(normalize(query) * QUERY_WEIGHT + normalize(answer))
+        }
+        with self._lock:
+            entry['offset'] = self._append(dict(entry, answer=answer))
+            self._index(key, entry)
+
+    def search(self, query, limit=5, owner=None):
+        """BM25 ranking of every entry sharing a term with query: [(score, key), ...]
+
+        Entries saved for another owner are left out.
+        """
+        terms = set(normalize(query))
+        n = len(self.entries)
+        if not terms or not n:
+            return []
+        average_length = self.total_length / n
+        scores = {}
+        for term in terms:
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for key, tf in postings.items():
+                if self.entries[key].get('owner') not in (None, owner):
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[key] / average_length)
+                scores[key] = scores.get(key, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        ranked = sorted(((score, key) for key, score in scores.items()), reverse=True)
+        return ranked[:limit]
+
+    def coverage(self, query, entry):
+        """Share of the saved question's terms that were asked
+
+        0.0 unless every asked term is in the saved question: "crime rate in Pune"
+        must never reuse the answer for "crime rate in Delhi".
+        """
+        asked = set(normalize(query))
+        saved = set(normalize(entry['query']))
+        if not asked or not saved or not asked <= saved:
+            return 0.0
+        return len(asked) / len(saved)
+
+    def lookup(self, query, query_type='search', owner=None):
+        """Answer of a fresh, high-confidence match for query, or None
+
+        owner also sees the answers saved for it, ahead of shared ones.
+        """
+        now = time.time()
+        with self._lock:
+            match = shared = None
+            for score, key in self.search(query, owner=owner):
+                if score < self.min_score:
+                    break
+                entry = self.entries[key]
+                if now >= entry['expires']:
+                    self._expire(key)
+                    continue
+                # Answers are only reused for the kind of question they were made for
+                if entry['query_type'] == query_type and self.coverage(query, entry) >= self.min_coverage:
+                    if entry.get('owner') is None and owner is not None:
+                        shared = shared or entry  # Unless one saved for owner ranks lower
+                        continue
+                    match = entry
+                    break
+            match = match or shared
+            if match is not None:
+                try:
+                    answer = self._read(match['offset'])['answer']
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"Knowledge log read failed: {e}")
+                else:
+                    self.hits += 1
+                    return answer
+            self.misses += 1
+            return None
+
+    def _apply(self, record, offset, now):
+        """Index one log record read at startup"""
+        key = record['key']
+        if record.get('deleted'):
+            if key in self.entries:
+                self._unindex(key)
+                self.dead += 1
+            self.dead += 1
+            return
+        entry = {field: record[field] for field in ('key', 'query', 'query_type', 'timestamp', 'expires')}
+        entry['owner'] = record.get('owner')  # Logs written before owners were shared
+        entry['terms'] = Counter(record['terms'])
+        entry['offset'] = offset
+        if entry['expires'] > now:
+            self._index(key, entry)
+        else:
+            self.dead += 1
+
+    def _load_snapshot(self, now):
+        """Index from the snapshot, returns the log size it covers (0 without a usable snapshot)"""
+        try:
+            with open(self.snapshot_path, 'r') as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return 0
+        if snapshot.get('log_size', 0) > os.path.getsize(self.path):
+            return 0  # Log was replaced after the snapshot was taken
+        for key, entry in snapshot['entries'].items():
+            entry = dict(entry, key=key, terms=Counter(entry['terms']))
+            if entry['expires'] > now:
+                self._index(key, entry)
+            else:
+                self.dead += 1
+        self.dead += snapshot.get('dead', 0)
+        return snapshot['log_size']
+
+    def load(self):
+        """Index the snapshot and the log records after it - answers stay on disk"""
+        now = time.time()
+        with self._lock:
+            if not os.path.exists(self.path):
+                self._import_legacy()
+                return
+
+            start = self._load_snapshot(now)
+            with open(self.path, 'r+b') as f:
+                f.seek(start)
+                offset = start
+                torn = None  # Offset of an unreadable last line
+                for line in f:
+                    torn = None
+                    try:
+                        if not line.endswith(b"\n"):
+                            raise ValueError("no newline")
+                        self._apply(json.loads(line), offset, now)
+                        self.since_snapshot += 1
+                    except (ValueError, KeyError, TypeError):
+                        torn = offset
+                    offset += len(line)
+                if torn is not None:
+                    # Torn last line from a crash: cut it off, or records appended
+                    # after it would be unreadable on the next load
+                    f.truncate(torn)
+
+    def _import_legacy(self):
+        """Move answers from the old whole-file JSON into the log (the old file is left alone)"""
+        if not self.legacy_path:
+            return
+        try:
+            with open(self.legacy_path, 'r') as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        now = time.time()
+        for query, entry in saved.items():
+            try:
+                created = datetime.fromisoformat(entry['timestamp']).timestamp()
+                query = entry.get('query', query)
+                expires = entry.get('expires', created + self._ttl(query))
+                answer = entry['answer']
+            except (KeyError, TypeError, ValueError):
+                continue
+            if expires <= now:
+                continue
+            key = self._key(query)
+            record = {
+                'key': key,
+                'query': query,
+                'query_type': entry.get('query_type', 'search'),
+                'timestamp': entry['timestamp'],
+                'expires': expires,
+                'terms': Counter(normalize(query) * QUERY_WEIGHT + normalize(answer))
+            }
+            record['offset'] = self._append(dict(record, answer=answer))
+            self._index(key, record)
+
+    def delete(self, query, owner=None):
+        """Forget the answer to a question"""
+        key = self._key(query, owner)
+        with self._lock:
+            if key in self.entries:
+                self._append({'key': key, 'deleted': True})
+                self._unindex(key)
+                self.dead += 2
+
+    def needs_compaction(self):
+        """True when dead records outnumber live ones
+
+        A rewrite then costs no more than the appends that made those records dead.
+        """
+        return self.dead > max(len(self.entries), self.compact_after // 4)
+
+    def needs_snapshot(self):
+        """True when a load would replay a long log tail
+
+        The tail has to be as long as the index too, so writing the index stays O(1) per append.
+        """
+        return self.since_snapshot >= max(self.compact_after, len(self.entries))
+
+    def maintain(self):
+        """Compact when many records are dead, else snapshot when the log tail is long"""
+        if self.needs_compaction():
+            self.compact()
+        elif self.needs_snapshot():
+            self.snapshot()
+
+    def compact(self):
+        """Rewrite the log with live entries only and take a snapshot
+
+        Both files are written next to the originals and renamed over them, so a
+        crash leaves either the old or the new version, never a partial one.
+        Live records are copied without the index lock (the log is append-only, so
+        their offsets stay valid); lookups only wait while the files are swapped.
+        """
+        with self._maintenance_lock:
+            with self._lock:
+                now = time.time()
+                for key in [key for key, entry in self.entries.items() if entry['expires'] <= now]:
+                    self._expire(key)
+                if self._log is not None:
+                    self._log.flush()
+                if not os.path.exists(self.path):
+                    return False
+                copied_size = os.path.getsize(self.path)
+                live = [entry['offset'] for entry in self.entries.values()]
+
+            temp_path = self.path + ".tmp"
+            offsets = {}  # Offset in the old log -> offset in the new one
+            try:
+                with open(self.path, 'rb') as log, open(temp_path, 'wb') as out:
+                    for offset in live:
+                        log.seek(offset)
+                        offsets[offset] = out.tell()
+                        out.write(log.readline())
+
+                    with self._lock:
+                        # Records appended while copying are kept as they are
+                        if self._log is not None:
+                            self._log.flush()
+                        log.seek(copied_size)
+                        tail = log.read()
+                        tail_start = out.tell()
+                        out.write(tail)
+                        out.flush()
+                        os.fsync(out.fileno())
+
+                        self._close_files()
+                        # The old snapshot's offsets don't match the new log
+                        if os.path.exists(self.snapshot_path):
+                            os.remove(self.snapshot_path)
+                        os.replace(temp_path, self.path)
+                        for entry in self.entries.values():
+                            if entry['offset'] >= copied_size:
+                                entry['offset'] = tail_start + entry['offset'] - copied_size
+                            else:
+                                entry['offset'] = offsets[entry['offset']]
+                        # Entries replaced or deleted while copying are dead in the new log
+                        records = len(live) + tail.count(b"\n")
+                        self.dead = records - len(self.entries)
+                        self.since_snapshot = records
+                        self.compactions += 1
+            except (OSError, ValueError) as e:
+                print(f"Knowledge compaction failed: {e}")
+                return False
+            self._snapshot()
+            return True
+
+    def snapshot(self):
+        """Atomically write the index (no answers) and the log size it covers"""
+        with self._maintenance_lock:
+            self._snapshot()
+
+    def _snapshot(self):
+        """snapshot() for a caller holding the maintenance lock - the file is written without the index lock"""
+        with self._lock:
+            if self._log is not None:
+                self._log.flush()
+            covered = self.since_snapshot
+            snapshot = {
+                'log_size': os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+                'dead': self.dead,
+                'entries': {key: {field: value for field, value in entry.items() if field != 'key'}
+                            for key, entry in self.entries.items()}
+            }
+        temp_path = self.snapshot_path + ".tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(snapshot, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.snapshot_path)
+        with self._lock:
+            # Records appended meanwhile are still only in the log
+            self.since_snapshot -= covered
+
+    def close(self):
+        """Snapshot and close the log"""
+        with self._maintenance_lock:
+            if self.since_snapshot:
+                self._snapshot()
+            with self._lock:
+                self._close_files()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def stats(self):
+        """Hit/miss counters, in the same shape as the cache stats"""
+        lookups = self.hits + self.misses
+        return {
+            'name': 'knowledge',
+            'entries': len(self.entries),
+            'max_entries': None,
+            'terms': len(self.postings),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': 0,
+            'expirations': self.expired,
+            'dead_records': self.dead,
+            'compactions': self.compactions
+        }
@@ -0,0 +1,160 @@
+"""
+Memory Namespaces
+Per-user memory for a process serving many users: each user id gets its own
+directory of memory files, opened on first use. At most max_loaded users stay
+open; opening one more flushes and closes the least recently used, so memory
+use stays bounded however many users there are. A user's chat session lives
+with their memory and is dropped on eviction; its turns are in the memory by then.
+"""
+
+import threading
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+
+import performance_config
+from memory_storage import namespace_directory
+from memory_system import AdvancedMemorySystem
+
+
+class Namespace:
+    """One user's memory system and chat session"""
+
+    def __init__(self, user_id, memory, session=None):
+        self.user_id = user_id
+        self.memory = memory
+        self.session = session
+
+
+class MemoryNamespaces:
+    """LRU of per-user namespaces keyed by user id"""
+
+    def __init__(self, root=None, max_loaded=None, factory=None, session_factory=None):
+        self.root = root or performance_config.MEMORY_NAMESPACE_DIR
+        self.max_loaded = max_loaded or performance_config.MAX_LOADED_NAMESPACES
+        # Builds a user's memory system from its directory
+        self.factory = factory or (lambda directory: AdvancedMemorySystem(directory=directory))
+        # Builds a user's chat session (None = memory only)
+        self.session_factory = session_factory
+        self._loaded = OrderedDict()  # user id -> Namespace, least recently used first
+        self._in_use = Counter()  # user id -> callers between acquire() and release()
+        # user id -> Event set once the namespace is built, or once an evicted one is closed;
+        # files are opened and closed outside the lock so one user never blocks the others
+        self._loading = {}
+        self._closing = {}
+        self._lock = threading.Lock()
+
+        # Counters
+        self.loads = 0
+        self.evictions = 0
+
+    def acquire(self, user_id):
+        """The user's Namespace, kept open until the matching release()"""
+        while True:
+            with self._lock:
+                namespace = self._loaded.get(user_id)
+                if namespace is not None:
+                    self._loaded.move_to_end(user_id)
+                    self._in_use[user_id] += 1
+                    evicted = self._evict()
+                    break
+                # Being built by another caller, or its evicted files are still being flushed
+                pending = self._loading.get(user_id) or self._closing.get(user_id)
+                if pending is None:
+                    self._loading[user_id] = loaded = threading.Event()
+            if pending is not None:
+                pending.wait()
+                continue
+
+            try:
+                memory = self.factory(namespace_directory(user_id, self.root))
+                session = self.session_factory() if self.session_factory else None
+            except BaseException:
+                with self._lock:
+                    del self._loading[user_id]
+                loaded.set()  # A waiting caller tries again
+                raise
+            namespace = Namespace(user_id, memory, session)
+            with self._lock:
+                del self._loading[user_id]
+                self._loaded[user_id] = namespace
+                self.loads += 1
+                self._in_use[user_id] += 1
+                evicted = self._evict()
+            loaded.set()
+            break
+        self._close(evicted)
+        return namespace
+
+    def release(self, user_id):
+        """Let an acquired namespace be evicted again"""
+        with self._lock:
+            self._in_use[user_id] -= 1
+            if not self._in_use[user_id]:
+                del self._in_use[user_id]
+            evicted = self._evict()
+        self._close(evicted)
+
+    @contextmanager
+    def use(self, user_id):
+        """The user's Namespace, never closed while the block runs"""
+        namespace = self.acquire(user_id)
+        try:
+            yield namespace
+        finally:
+            self.release(user_id)
+
+    def _evict(self):
+        """Remove least recently used namespaces past max_loaded (caller holds the lock)
+
+        Namespaces in use are skipped, so the cap can be exceeded until they are released.
+        Returns the removed namespaces - the caller closes them with _close() after
+        releasing the lock.
+        """
+        evicted = []
+        for user_id in list(self._loaded):
+            if len(self._loaded) <= self.max_loaded:
+                break
+            if user_id in self._in_use:
+                continue
+            evicted.append(self._loaded.pop(user_id))
+            # A reopen waits until the files are flushed
+            self._closing[user_id] = threading.Event()
+            self.evictions += 1
+        return evicted
+
+    def _close(self, evicted):
+        """Flush and close namespaces removed by _evict() (caller does not hold the lock)"""
+        for namespace in evicted:
+            try:
+                namespace.memory.close()
+            except Exception as e:
+                print(f"Could not close memory for {namespace.user_id}: {e}")
+            finally:
+                with self._lock:
+                    closed = self._closing.pop(namespace.user_id)
+                closed.set()
+
+    def loaded(self):
+        """User ids currently open, least recently used first"""
+        with self._lock:
+            return list(self._loaded)
+
+    def close(self):
+        """Flush and close every open namespace"""
+        with self._lock:
+            evicted = list(self._loaded.values())
+            self._loaded.clear()
+            for namespace in evicted:
+                self._closing[namespace.user_id] = threading.Event()
+        self._close(evicted)
+
+    def stats(self):
+        """Load counters"""
+        with self._lock:
+            return {
+                'loaded': len(self._loaded),
+                'max_loaded': self.max_loaded,
+                'in_use': len(self._in_use),
+                'loads': self.loads,
+                'evictions': self.evictions
+            }
@@ -0,0 +1,661 @@
+"""
+Memory Storage
+Storage backends for AdvancedMemorySystem. The JSON backend keeps everything in
+memory and rewrites two JSON files; the SQLite backend keeps the full history on
+disk in indexed tables with an FTS5 index for searching conversations.
+Both also keep one digest per topic: older conversations folded into a short summary.
+Both search with AND over the query words, match every word as a word prefix and
+rank by BM25 (SQLite builds without FTS5 match substrings instead, newest first).
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+from collections import deque
+from itertools import islice
+from threading import Timer
+
+import performance_config
+from text_index import InvertedIndex, tokenize
+
+
+class MemoryStorage:
+    """Interface every memory backend implements"""
+
+    def add_conversation(self, conversation):
+        """Store a conversation (without an id), returns its new id"""
+        raise NotImplementedError
+
+    def recent_conversations(self, limit):
+        """Latest conversations, oldest first"""
+        raise NotImplementedError
+
+    def get_conversations(self, ids):
+        """Conversations with these ids that are still stored, oldest first"""
+        raise NotImplementedError
+
+    def topic_conversations(self, topic, limit):
+        """Latest conversations on a topic, oldest first"""
+        raise NotImplementedError
+
+    def topic_conversations_after(self, topic, after_id, limit):
+        """Oldest conversations on a topic with ids above after_id, oldest first"""
+        raise NotImplementedError
+
+    def search_conversations(self, term, limit):
+        """Conversations containing every word of term (as a word prefix), best match first"""
+        raise NotImplementedError
+
+    def iter_conversations(self):
+        """Every conversation, oldest first"""
+        raise NotImplementedError
+
+    def count_conversations(self):
+        raise NotImplementedError
+
+    def topic_counts(self):
+        """{topic: number of conversations}"""
+        raise NotImplementedError
+
+    def get_digest(self, topic):
+        """{'digest', 'through_id', 'updated'} or None"""
+        raise NotImplementedError
+
+    def set_digest(self, topic, digest, through_id, updated):
+        """Replace a topic's digest, which covers its conversations up to through_id"""
+        raise NotImplementedError
+
+    def get_preference(self, key):
+        """{'value', 'learned_at'} or None"""
+        raise NotImplementedError
+
+    def set_preference(self, key, value, learned_at):
+        raise NotImplementedError
+
+    def count_preferences(self):
+        raise NotImplementedError
+
+    def add_correction(self, correction):
+        """Store a correction, returns its id"""
+        raise NotImplementedError
+
+    def count_corrections(self):
+        raise NotImplementedError
+
+    def clear(self):
+        """Delete everything"""
+        raise NotImplementedError
+
+    def flush(self):
+        """Write pending changes"""
+
+    def close(self):
+        self.flush()
+
+
+def write_json_atomic(path, data):
+    """Write JSON next to path and rename it over path, so readers never see half a file"""
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w') as f:
+        json.dump(data, f, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+class JSONMemoryStorage(MemoryStorage):
+    """Everything in memory, persisted as JSON snapshots plus a write-ahead journal
+
+    Each change is one line appended to the journal; fsyncs are batched (every
+    fsync_batch events or fsync_delay seconds). Every snapshot_every events a
+    background snapshot is written with an atomic rename and the journal restarts.
+    Startup loads the snapshot and replays the journal events newer than it.
+
+    Conversations live in a ring buffer of max_conversations: adding one past
+    capacity evicts the oldest from the buffer, the id map, its topic and the
+    search index together.
+    """
+
+    def __init__(self, memory_file=None, preferences_file=None, max_conversations=None,
+                 fsync_delay=None, fsync_batch=None, snapshot_every=None):
+        self.memory_file = memory_file or performance_config.MEMORY_FILE
+        self.preferences_file = preferences_file or performance_config.PREFERENCES_FILE
+        self.journal_file = self.memory_file + ".journal"
+        self.max_conversations = max_conversations or performance_config.MAX_CONVERSATION_HISTORY
+        self.fsync_delay = performance_config.MEMORY_FSYNC_DELAY if fsync_delay is None else fsync_delay
+        self.fsync_batch = fsync_batch or performance_config.MEMORY_BATCH_SIZE
+        self.snapshot_every = snapshot_every or performance_config.MEMORY_SNAPSHOT_EVERY
+        self.conversations = deque()  # Oldest first, at most max_conversations
+        self.topics = {}  # topic -> deque of conversation ids, oldest first
+        self.corrections = {}
+        self.user_preferences = {}
+        self.digests = {}  # topic -> {'digest', 'through_id', 'updated'}
+        self.by_id = {}  # conversation id -> conversation
+        self.next_id = 1  # Never reused, even after eviction
+        self.index = InvertedIndex()  # Queries and responses, for search_conversations
+        self._lock = threading.RLock()
+
+        # Journal state
+        self.seq = 0  # Sequence number of the last event
+        self._journal = None
+        self.journal_events = 0  # Events since the last snapshot
+        self.unsynced = 0  # Events written but not fsynced
+        self.sync_timer = None
+        self.snapshot_pending = False
+        self.syncs = 0
+        self.snapshots = 0
+
+        self.load()
+
+    def load(self):
+        """Load the snapshot, then replay the journal events written after it"""
+        try:
+            with open(self.memory_file, 'r') as f:
+                data = json.load(f)
+                conversations = data.get('conversations', [])
+                self.corrections = data.get('corrections', {})
+                self.digests = data.get('digests', {})
+                self.next_id = data.get('next_id', 1)
+                self.seq = data.get('seq', 0)
+        except (OSError, ValueError):
+            conversations = []
+
+        try:
+            with open(self.preferences_file, 'r') as f:
+                self.user_preferences = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+        # Files written before ids were monotonic can repeat ids - number them again
+        ids = [conversation['id'] for conversation in conversations]
+        if any(later <= earlier for earlier, later in zip(ids, ids[1:])):
+            conversations = [dict(conversation, id=number) for number, conversation in enumerate(conversations, 1)]
+        for conversation in conversations[-self.max_conversations:]:
+            self._append(conversation)
+        if self.conversations:
+            self.next_id = max(self.next_id, self.conversations[-1]['id'] + 1)
+
+        self._replay()
+
+    def _replay(self):
+        try:
+            with open(self.journal_file, 'r+b') as f:
+                valid = 0  # Bytes of complete events
+                for line in f:
+                    try:
+                        event = json.loads(line) if line.endswith(b"\n") else None
+                    except ValueError:
+                        event = None
+                    if event is None:
+                        # Torn last line from a crash: cut it off, or events appended
+                        # after it would be unreadable on the next start
+                        f.truncate(valid)
+                        break
+                    valid += len(line)
+                    # Events already in the snapshot (crash before the journal restarted)
+                    if event['seq'] <= self.seq:
+                        continue
+                    self._apply(event)
+                    self.seq = event['seq']
+                    self.journal_events += 1
+        except OSError:
+            pass
+
+    def _apply(self, event):
+        """Apply one journal event to the in-memory state"""
+        op = event['op']
+        if op == 'conversation':
+            self._append(event['conversation'])
+            self.next_id = max(self.next_id, event['conversation']['id'] + 1)
+        elif op == 'preference':
+            self.user_preferences[event['key']] = {'value': event['value'], 'learned_at': event['learned_at']}
+        elif op == 'correction':
+            self.corrections[str(event['id'])] = event['correction']
+        elif op == 'digest':
+            self.digests[event['topic']] = {'digest': event['digest'], 'through_id': event['through_id'],
+                                            'updated': event['updated']}
+        elif op == 'clear':
+            self.conversations = deque()
+            self.topics = {}
+            self.corrections = {}
+            self.user_preferences = {}
+            self.digests = {}
+            self.by_id = {}
+            self.index.clear()
+
+    def _log(self, event):
+        """Apply an event and append it to the journal (caller holds the lock)"""
+        self.seq += 1
+        event = dict(event, seq=self.seq)
+        self._apply(event)
+        try:
+            if self._journal is None:
+                self._journal = open(self.journal_file, 'ab')
+            self._journal.write(json.dumps(event, ensure_ascii=False).encode('utf-8') + b"\n")
+            self._journal.flush()
+        except (OSError, TypeError) as e:
+            print(f"Memory journal write failed: {e}")
+            return
+
+        self.journal_events += 1
+        self.unsynced += 1
+        if self.unsynced >= self.fsync_batch:
+            self._sync()
+        elif self.sync_timer is None:
+            self.sync_timer = Timer(self.fsync_delay, self._timed_sync)
+            self.sync_timer.daemon = True
+            self.sync_timer.start()
+
+        if self.journal_events >= self.snapshot_every and not self.snapshot_pending:
+            self.snapshot_pending = True
+            threading.Thread(target=self.snapshot, daemon=True).start()
+
+    def _sync(self):
+        """fsync the journal (caller holds the lock)"""
+        if self._journal is not None and self.unsynced:
+            os.fsync(self._journal.fileno())
+            self.unsynced = 0
+            self.syncs += 1
+
+    def _timed_sync(self):
+        with self._lock:
+            self.sync_timer = None
+            self._sync()
+
+    def snapshot(self):
+        """Write all state atomically and start a new journal"""
+        with self._lock:
+            memory_data = {
+                'conversations': list(self.conversations),
+                'topics': {topic: list(ids) for topic, ids in self.topics.items()},
+                'corrections': self.corrections,
+                'digests': self.digests,
+                'next_id': self.next_id,
+                'seq': self.seq  # Journal events up to here are in this snapshot
+            }
+            try:
+                write_json_atomic(self.preferences_file, self.user_preferences)
+                write_json_atomic(self.memory_file, memory_data)
+                if self._journal is not None:
+                    self._journal.close()
+                    self._journal = None
+                open(self.journal_file, 'wb').close()
+                self.journal_events = 0
+                self.unsynced = 0
+                self.snapshots += 1
+            except (OSError, TypeError) as e:
+                print(f"Memory snapshot failed: {e}")
+            finally:
+                self.snapshot_pending = False
+
+    def _text(self, conversation):
+        return f"{conversation['query']} {conversation['response']}"
+
+    def _append(self, conversation):
+        """Add to the buffer, id map, topic and index, evicting the oldest when full"""
+        if len(self.conversations) >= self.max_conversations:
+            self._evict()
+        self.conversations.append(conversation)
+        self.by_id[conversation['id']] = conversation
+        self.topics.setdefault(conversation['topic'], deque()).append(conversation['id'])
+        self.index.add(conversation['id'], self._text(conversation))
+
+    def _evict(self):
+        oldest = self.conversations.popleft()
+        del self.by_id[oldest['id']]
+        # The oldest conversation overall is also the oldest of its topic
+        topic_ids = self.topics[oldest['topic']]
+        topic_ids.popleft()
+        if not topic_ids:
+            del self.topics[oldest['topic']]
+        self.index.remove(oldest['id'], self._text(oldest))
+
+    def add_conversation(self, conversation):
+        with self._lock:
+            conversation_id = self.next_id
+            self._log({'op': 'conversation', 'conversation': dict(conversation, id=conversation_id)})
+        return conversation_id
+
+    def recent_conversations(self, limit):
+        with self._lock:
+            return list(islice(reversed(self.conversations), limit))[::-1]
+
+    def get_conversations(self, ids):
+        with self._lock:
+            return [self.by_id[conversation_id] for conversation_id in sorted(ids) if conversation_id in self.by_id]
+
+    def topic_conversations(self, topic, limit):
+        with self._lock:
+            ids = list(islice(reversed(self.topics.get(topic, ())), limit))
+            return [self.by_id[conversation_id] for conversation_id in reversed(ids)]
+
+    def topic_conversations_after(self, topic, after_id, limit):
+        with self._lock:
+            ids = (conversation_id for conversation_id in self.topics.get(topic, ()) if conversation_id > after_id)
+            return [self.by_id[conversation_id] for conversation_id in islice(ids, limit)]
+
+    def search_conversations(self, term, limit):
+        with self._lock:
+            return [self.by_id[conversation_id] for conversation_id in self.index.search(term, limit)]
+
+    def iter_conversations(self):
+        with self._lock:
+            return iter(list(self.conversations))
+
+    def count_conversations(self):
+        return len(self.conversations)
+
+    def topic_counts(self):
+        with self._lock:
+            return {topic: len(ids) for topic, ids in self.topics.items()}
+
+    def get_digest(self, topic):
+        return self.digests.get(topic)
+
+    def set_digest(self, topic, digest, through_id, updated):
+        with self._lock:
+            self._log({'op': 'digest', 'topic': topic, 'digest': digest, 'through_id': through_id,
+                       'updated': updated})
+
+    def get_preference(self, key):
+        return self.user_preferences.get(key)
+
+    def set_preference(self, key, value, learned_at):
+        with self._lock:
+            self._log({'op': 'preference', 'key': key, 'value': value, 'learned_at': learned_at})
+
+    def count_preferences(self):
+        return len(self.user_preferences)
+
+    def add_correction(self, correction):
+        with self._lock:
+            correction_id = len(self.corrections) + 1
+            self._log({'op': 'correction', 'id': correction_id, 'correction': correction})
+        return correction_id
+
+    def count_corrections(self):
+        return len(self.corrections)
+
+    def clear(self):
+        with self._lock:
+            self._log({'op': 'clear'})
+            self.snapshot()  # Cleared data shouldn't linger in the old snapshot
+
+    def flush(self):
+        """fsync pending journal events and fold them into a snapshot"""
+        with self._lock:
+            if self.sync_timer is not None:
+                self.sync_timer.cancel()
+                self.sync_timer = None
+            self._sync()
+            if self.journal_events:
+                self.snapshot()
+
+    def stats(self):
+        """Journal counters"""
+        return {
+            'journal_events': self.journal_events,
+            'unsynced': self.unsynced,
+            'syncs': self.syncs,
+            'snapshots': self.snapshots
+        }
+
+
+class SQLiteMemoryStorage(MemoryStorage):
+    """Full history on disk in indexed tables, searched through FTS5"""
+
+    def __init__(self, db_file=None, import_files=None):
+        self.db_file = db_file or performance_config.MEMORY_DB_FILE
+        self.fts = False
+        self._lock = threading.Lock()
+
+        self.conn = sqlite3.connect(self.db_file, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        # Off by default in SQLite - without it ON DELETE CASCADE leaves entity rows behind
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS conversations (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TEXT NOT NULL,
+                query TEXT NOT NULL,
+                response TEXT NOT NULL,
+                topic TEXT NOT NULL,
+                entities TEXT NOT NULL DEFAULT '{}'
+            );
+            CREATE INDEX IF NOT EXISTS idx_conversations_topic ON conversations(topic, id);
+            CREATE TABLE IF NOT EXISTS entities (
+                conversation_id INTEGER NOT NULL REFERENCES conversations(id) ON DELETE CASCADE,
+                kind TEXT NOT NULL,
+                value TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_entities_value ON entities(kind, value);
+            CREATE INDEX IF NOT EXISTS idx_entities_conversation ON entities(conversation_id);
+            CREATE TABLE IF NOT EXISTS preferences (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                learned_at TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS corrections (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                original TEXT NOT NULL,
+                correction TEXT NOT NULL,
+                timestamp TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS digests (
+                topic TEXT PRIMARY KEY,
+                digest TEXT NOT NULL,
+                through_id INTEGER NOT NULL,
+                updated TEXT NOT NULL
+            );
+        """)
+        try:
+            # External content table: the text lives once, in conversations
+            self.conn.executescript("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS conversations_fts
+                    USING fts5(query, response, content='conversations', content_rowid='id');
+                CREATE TRIGGER IF NOT EXISTS conversations_fts_insert AFTER INSERT ON conversations BEGIN
+                    INSERT INTO conversations_fts(rowid, query, response)
+                    VALUES (new.id, new.query, new.response);
+                END;
+                CREATE TRIGGER IF NOT EXISTS conversations_fts_delete AFTER DELETE ON conversations BEGIN
+                    INSERT INTO conversations_fts(conversations_fts, rowid, query, response)
+                    VALUES ('delete', old.id, old.query, old.response);
+                END;
+            """)
+            self.fts = True
+        except sqlite3.OperationalError as e:
+            print(f"FTS5 unavailable, memory search falls back to LIKE: {e}")
+        # Rows orphaned while the pragma was off (databases from earlier versions)
+        self.conn.execute("DELETE FROM entities WHERE conversation_id NOT IN (SELECT id FROM conversations)")
+        self.conn.commit()
+
+        if import_files and self.count_conversations() == 0 and self.count_preferences() == 0:
+            self.import_json(*import_files)
+
+    def import_json(self, memory_file, preferences_file):
+        """Copy memory saved by the JSON backend (the files are left alone)"""
+        old = JSONMemoryStorage(memory_file, preferences_file)
+        for conversation in old.conversations:
+            conversation = {field: value for field, value in conversation.items() if field != 'id'}
+            self.add_conversation(conversation)
+        for key, preference in old.user_preferences.items():
+            self.set_preference(key, preference.get('value'), preference.get('learned_at', ''))
+        for correction in old.corrections.values():
+            self.add_correction(correction)
+
+    def _conversation(self, row):
+        conversation = dict(row)
+        conversation['entities'] = json.loads(conversation['entities'])
+        return conversation
+
+    def _select(self, sql, params=(), oldest_first=True):
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        if oldest_first:
+            rows.reverse()
+        return [self._conversation(row) for row in rows]
+
+    def add_conversation(self, conversation):
+        entities = conversation.get('entities') or {}
+        with self._lock:
+            cursor = self.conn.execute(
+                "INSERT INTO conversations (timestamp, query, response, topic, entities) VALUES (?, ?, ?, ?, ?)",
+                (conversation['timestamp'], conversation['query'], conversation['response'],
+                 conversation['topic'], json.dumps(entities))
+            )
+            conversation_id = cursor.lastrowid
+            self.conn.executemany(
+                "INSERT INTO entities (conversation_id, kind, value) VALUES (?, ?, ?)",
+                [(conversation_id, kind, value) for kind, values in entities.items() for value in values]
+            )
+            self.conn.commit()
+        return conversation_id
+
+    def recent_conversations(self, limit):
+        return self._select("SELECT * FROM conversations ORDER BY id DESC LIMIT ?", (limit,))
+
+    def get_conversations(self, ids):
+        ids = list(ids)
+        if not ids:
+            return []
+        placeholders = ", ".join("?" * len(ids))
+        return self._select(f"SELECT * FROM conversations WHERE id IN ({placeholders}) ORDER BY id",
+                            ids, oldest_first=False)
+
+    def topic_conversations(self, topic, limit):
+        return self._select("SELECT * FROM conversations WHERE topic = ? ORDER BY id DESC LIMIT ?",
+                            (topic, limit))
+
+    def topic_conversations_after(self, topic, after_id, limit):
+        return self._select("SELECT * FROM conversations WHERE topic = ? AND id > ? ORDER BY id LIMIT ?",
+                            (topic, after_id, limit), oldest_first=False)
+
+    def search_conversations(self, term, limit):
+        words = list(dict.fromkeys(tokenize(term)))
+        if not words:
+            return []
+        if self.fts:
+            # Quoted prefix terms, so the user's text is never parsed as FTS syntax
+            match = " AND ".join(f'"{word}"*' for word in words)
+            return self._select("""
+                SELECT c.* FROM conversations_fts JOIN conversations c ON c.id = conversations_fts.rowid
+                WHERE conversations_fts MATCH ? ORDER BY bm25(conversations_fts), c.id DESC LIMIT ?
+            """, (match, limit), oldest_first=False)
+        # Without FTS5: every word must appear somewhere, newest first
+        where = " AND ".join("(query LIKE ? OR response LIKE ?)" for _ in words)
+        params = [f"%{word}%" for word in words for _ in range(2)]
+        return self._select(f"SELECT * FROM conversations WHERE {where} ORDER BY id DESC LIMIT ?",
+                            (*params, limit), oldest_first=False)
+
+    def iter_conversations(self, page_size=500):
+        """Pages through the table, so the full history is never in memory at once"""
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self.conn.execute("SELECT * FROM conversations WHERE id > ? ORDER BY id LIMIT ?",
+                                         (last_id, page_size)).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield self._conversation(row)
+            last_id = rows[-1]['id']
+
+    def _count(self, table):
+        with self._lock:
+            return self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def count_conversations(self):
+        return self._count("conversations")
+
+    def topic_counts(self):
+        with self._lock:
+            rows = self.conn.execute("SELECT topic, COUNT(*) FROM conversations GROUP BY topic").fetchall()
+        return {topic: count for topic, count in rows}
+
+    def get_digest(self, topic):
+        with self._lock:
+            row = self.conn.execute("SELECT digest, through_id, updated FROM digests WHERE topic = ?",
+                                    (topic,)).fetchone()
+        return None if row is None else dict(row)
+
+    def set_digest(self, topic, digest, through_id, updated):
+        with self._lock:
+            self.conn.execute("INSERT OR REPLACE INTO digests (topic, digest, through_id, updated) VALUES (?, ?, ?, ?)",
+                              (topic, digest, through_id, updated))
+            self.conn.commit()
+
+    def get_preference(self, key):
+        with self._lock:
+            row = self.conn.execute("SELECT value, learned_at FROM preferences WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return {'value': json.loads(row['value']), 'learned_at': row['learned_at']}
+
+    def set_preference(self, key, value, learned_at):
+        with self._lock:
+            self.conn.execute("INSERT OR REPLACE INTO preferences (key, value, learned_at) VALUES (?, ?, ?)",
+                              (key, json.dumps(value), learned_at))
+            self.conn.commit()
+
+    def count_preferences(self):
+        return self._count("preferences")
+
+    def add_correction(self, correction):
+        with self._lock:
+            cursor = self.conn.execute(
+                "INSERT INTO corrections (original, correction, timestamp) VALUES (?, ?, ?)",
+                (correction['original'], correction['correction'], correction['timestamp'])
+            )
+            self.conn.commit()
+        return cursor.lastrowid
+
+    def count_corrections(self):
+        return self._count("corrections")
+
+    def clear(self):
+        with self._lock:
+            for table in ("entities", "conversations", "preferences", "corrections", "digests"):
+                self.conn.execute(f"DELETE FROM {table}")
+            self.conn.commit()
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+def namespace_directory(user_id, root=None):
+    """Directory for one user's memory files under MEMORY_NAMESPACE_DIR
+
+    Ids that aren't plain file names are hashed, so any id is a safe path.
+    """
+    root = root or performance_config.MEMORY_NAMESPACE_DIR
+    if not re.fullmatch(r"[A-Za-z0-9][\w.-]{0,63}", user_id):
+        user_id = "id-" + hashlib.sha1(user_id.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(root, user_id)
+
+
+def open_storage(backend=None, directory=None):
+    """Storage backend named in MEMORY_BACKEND ('sqlite' or 'json')
+
+    directory keeps the files apart from other users' (None = the working directory).
+    """
+    backend = backend or performance_config.MEMORY_BACKEND
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    def path(name):
+        return os.path.join(directory, name) if directory else name
+
+    if backend == 'sqlite':
+        # Only the shared files predate SQLite - a user's namespace starts empty
+        import_files = None if directory else (performance_config.MEMORY_FILE, performance_config.PREFERENCES_FILE)
+        try:
+            return SQLiteMemoryStorage(path(performance_config.MEMORY_DB_FILE), import_files=import_files)
+        except sqlite3.Error as e:
+            print(f"SQLite memory unavailable, using JSON: {e}")
+    return JSONMemoryStorage(path(performance_config.MEMORY_FILE), path(performance_config.PREFERENCES_FILE))
@@ -1,113 +1,49 @@
-import json
-import os
 from datetime import datetime
+import os
 import re
-from threading import Timer
+from intent_matcher import TOPIC_MATCHER
+from prompt_budget import TOKEN_COUNTER
+from memory_storage import open_storage
+from episodic_memory import EpisodicMemory
+from knowledge_store import normalize
+import performance_config
 
 class AdvancedMemorySystem:
-    def __init__(self):
-        self.memory_file = "ai_memory.json"
-        self.preferences_file = "user_preferences.json"
-        self.conversations = []
-        self.user_preferences = {}
-        self.topics = {}
-        self.corrections = {}
+    def __init__(self, storage=None, episodic=None, directory=None):
+        # Backend from MEMORY_BACKEND unless one is passed in; directory holds one user's files
+        self.storage = storage or open_storage(directory=directory)
+        # Embedding recall of older relevant turns (None = recency and topic only)
+        if episodic is None and performance_config.EPISODIC_MEMORY_ENABLED:
+            episodic = EpisodicMemory(os.path.join(directory, performance_config.EPISODIC_MEMORY_FILE)
+                                      if directory else None)
+        self.episodic = episodic if episodic is not None and episodic.enabled else None
 
-        # Batch save optimization
-        self.pending_save = False
-        self.save_timer = None
-        self.save_delay = 5  # Batch saves every 5 seconds
+    @property
+    def topics(self):
+        """Number of conversations per topic"""
+        return self.storage.topic_counts()
 
-        self.load_memory()
-        
-    def load_memory(self):
-        """Load all memory data"""
-        try:
-            with open(self.memory_file, 'r') as f:
-                data = json.load(f)
-                self.conversations = data.get('conversations', [])
-                self.topics = data.get('topics', {})
-                self.corrections = data.get('corrections', {})
-        except:
-            pass
-            
-        try:
-            with open(self.preferences_file, 'r') as f:
-                self.user_preferences = json.load(f)
-        except:
-            pass
-    
     def save_memory(self):
-        """Save all memory data (batched)"""
-        memory_data = {
-            'conversations': self.conversations[-100:],  # Keep last 100
-            'topics': self.topics,
-            'corrections': self.corrections
-        }
-
-        try:
-            with open(self.memory_file, 'w') as f:
-                json.dump(memory_data, f, indent=2)
-
-            with open(self.preferences_file, 'w') as f:
-                json.dump(self.user_preferences, f, indent=2)
-        except:
-            pass
-
-        self.pending_save = False
-
-    def schedule_save(self):
-        """Schedule a batched save operation"""
-        if self.pending_save:
-            return  # Already scheduled
-
-        self.pending_save = True
-
-        # Cancel previous timer if exists
-        if self.save_timer:
-            self.save_timer.cancel()
-
-        # Schedule save after delay
-        self.save_timer = Timer(self.save_delay, self.save_memory)
-        self.save_timer.daemon = True
-        self.save_timer.start()
+        """Write pending changes"""
+        self.storage.flush()
 
     def add_conversation(self, query, response):
         """Add conversation with topic detection (batched save)"""
         conversation = {
-            'id': len(self.conversations) + 1,
             'timestamp': datetime.now().isoformat(),
             'query': query,
             'response': response,
             'topic': self.detect_topic(query),
             'entities': self.extract_entities(query)
         }
-
-        self.conversations.append(conversation)
-        self.update_topics(conversation['topic'], conversation)
-
-        # Schedule save instead of immediate save
-        self.schedule_save()
+        conversation_id = self.storage.add_conversation(conversation)
+        if self.episodic is not None:
+            self.episodic.add(conversation_id, f"{query}\n{response}")  # Embedded in the background
+        return conversation_id
     
     def detect_topic(self, query):
         """Detect conversation topic"""
-        topics_map = {
-            'weather': ['weather', 'temperature', 'forecast', 'rain', 'sunny'],
-            'health': ['bones', 'body', 'disease', 'medicine', 'doctor'],
-            'education': ['college', 'school', 'university', 'study'],
-            'technology': ['AI', 'computer', 'software', 'internet'],
-            'location': ['pincode', 'address', 'city', 'place'],
-            'news': ['news', 'current', 'latest', 'today'],
-            'crime': ['crime', 'police', 'murder', 'theft'],
-            'population': ['population', 'people', 'demographics'],
-            'stories': ['story', 'ghost', 'horror', 'adventure', 'romance', 'tale']
-        }
-        
-        query_lower = query.lower()
-        for topic, keywords in topics_map.items():
-            if any(keyword in query_lower for keyword in keywords):
-                return topic
-        return 'general'
+        return TOPIC_MATCHER.first(query, 'general')
     
     def extract_entities(self, query):
         """Extract entities like numbers, places, dates"""
@@ -130,87 +66,166 @@ class AdvancedMemorySystem:
             
         return entities
     
-    def update_topics(self, topic, conversation):
-        """Update topic tracking"""
-        if topic not in self.topics:
-            self.topics[topic] = []
-        self.topics[topic].append(conversation['id'])
-    
-    def get_context_for_query(self, query):
-        """Get relevant context for current query"""
+    def get_context_for_query(self, query, max_tokens=None, exclude=(), known=""):
+        """Get relevant context for current query, within max_tokens
+
+        A digest of the query's topic leads the context; turns already folded
+        into it are left out, so the context stays the same size as history grows.
+        Conversations whose query is in exclude and a digest that known (the chat
+        summary) already covers are skipped, since the chat holds them already.
+        """
         context = []
+        topic = self.detect_topic(query)
+        digest = self.storage.get_digest(topic)
+        folded_through = digest['through_id'] if digest else 0
+        if digest and self._covered(digest['digest'], known):
+            digest = None
         
         # Get recent conversations (last 3)
-        recent = self.conversations[-3:] if self.conversations else []
+        recent = self.storage.recent_conversations(3)
         
-        # Get topic-related conversations
-        current_topic = self.detect_topic(query)
-        topic_conversations = []
-        
-        if current_topic in self.topics:
-            topic_ids = self.topics[current_topic][-2:]  # Last 2 from topic
-            topic_conversations = [c for c in self.conversations if c['id'] in topic_ids]
+        # Get topic-related conversations (last 2 from topic)
+        topic_conversations = self.storage.topic_conversations(topic, 2)
         
         # Combine contexts
         all_context = recent + topic_conversations
         
-        # Remove duplicates and format
+        # Remove duplicates
         seen_ids = set()
         for conv in all_context:
-            if conv['id'] not in seen_ids:
-                context.append(f"Q: {conv['query'][:50]} A: {conv['response'][:100]}")
+            if conv['id'] not in seen_ids and conv['query'] not in exclude:
+                context.append(conv)
                 seen_ids.add(conv['id'])
-        
-        return " | ".join(context[-4:])  # Last 4 relevant contexts
+
+        if self.episodic is not None:
+            context = self._recall(query, context, exclude)
+        context = [conv for conv in context if conv['topic'] != topic or conv['id'] > folded_through]
+        context = context[-performance_config.MEMORY_CONTEXT_TURNS:]  # Last relevant contexts
+        if not context and not digest:
+            return ""
+
+        if max_tokens is None:
+            max_tokens = performance_config.CONTEXT_BUDGET['memory']
+        formatted = []
+        if digest:
+            # The digest gets at most half the budget while there are turns to share it with
+            summary = TOKEN_COUNTER.truncate(digest['digest'], max_tokens // 2 if context else max_tokens - 6)
+            formatted.append(f"Earlier on {topic}: {summary}")
+            max_tokens -= TOKEN_COUNTER.count(formatted[0]) + 1
+        if not context:
+            return formatted[0]
+
+        # Split the token budget evenly across turns; the question takes at most
+        # a third of its share and the answer gets the rest
+        per_turn = max_tokens // len(context) - 4  # "Q: ", " A: " and the separator
+        for conv in context:
+            question = TOKEN_COUNTER.truncate(conv['query'], per_turn // 3)
+            answer = TOKEN_COUNTER.truncate(conv['response'], per_turn - TOKEN_COUNTER.count(question))
+            formatted.append(f"Q: {question} A: {answer}")
+
+        return " | ".join(formatted)
     
+    def _covered(self, text, known):
+        """True when most content words of text are already in known"""
+        words = set(normalize(text))
+        if not words or not known:
+            return False
+        return len(words & set(normalize(known))) / len(words) >= performance_config.MEMORY_DIGEST_MAX_OVERLAP
+
+    def _recall(self, query, context, exclude=()):
+        """Blend similar older turns with the recent and topic ones, best MEMORY_CONTEXT_TURNS in order"""
+        similar = {conversation_id: similarity
+                   for conversation_id, similarity in self.episodic.search(query, performance_config.EPISODIC_TOP_K)
+                   if similarity >= performance_config.EPISODIC_MIN_SIMILARITY}
+        candidates = {conv['id']: conv for conv in context}
+        for conv in self.storage.get_conversations(similar.keys() - candidates.keys()):
+            if conv['query'] not in exclude:
+                candidates[conv['id']] = conv
+        if not candidates:
+            return []
+
+        newest = max(candidates)
+        weight = performance_config.EPISODIC_RECENCY_WEIGHT
+
+        def score(conv):
+            recency = 0.5 ** ((newest - conv['id']) / performance_config.EPISODIC_RECENCY_HALF_LIFE)
+            return (1 - weight) * similar.get(conv['id'], 0.0) + weight * recency
+
+        best = sorted(candidates.values(), key=score, reverse=True)[:performance_config.MEMORY_CONTEXT_TURNS]
+        return sorted(best, key=lambda conv: conv['id'])
+
+    def next_digest(self):
+        """(topic, prompt, through_id) for the next topic digest to write, or None
+
+        A topic is due once MEMORY_DIGEST_MIN_TURNS of its conversations are not
+        in its digest yet, not counting its newest MEMORY_DIGEST_KEEP_RECENT.
+        """
+        keep = performance_config.MEMORY_DIGEST_KEEP_RECENT
+        batch = performance_config.MEMORY_DIGEST_BATCH
+        minimum = performance_config.MEMORY_DIGEST_MIN_TURNS
+        for topic, count in sorted(self.topics.items(), key=lambda x: x[1], reverse=True):
+            if count - keep < minimum:
+                continue
+            digest = self.storage.get_digest(topic)
+            pending = self.storage.topic_conversations_after(topic, digest['through_id'] if digest else 0,
+                                                             batch + keep)
+            older = pending[:max(0, len(pending) - keep)][:batch]
+            if len(older) >= minimum:
+                return topic, self.digest_prompt(topic, digest, older), older[-1]['id']
+        return None
+
+    def digest_prompt(self, topic, digest, conversations):
+        """Ask the model to fold conversations into the topic's digest"""
+        transcript = "\n".join(f"User: {TOKEN_COUNTER.truncate(conv['query'], 40)}\n"
+                               f"Assistant: {TOKEN_COUNTER.truncate(conv['response'], 60)}"
+                               for conv in conversations)
+        words = performance_config.MEMORY_DIGEST_MAX_TOKENS * 3 // 4
+        return (f"Update the notes on what the user discussed about {topic} with these conversations. "
+                f"Keep names, places, preferences and facts, drop small talk, at most {words} words.\n"
+                f"Notes so far: {digest['digest'] if digest else 'none'}\n"
+                f"Conversations:\n{transcript}")
+
+    def apply_digest(self, topic, digest, through_id):
+        """Store a digest written from next_digest's prompt"""
+        digest = TOKEN_COUNTER.truncate(digest.strip(), performance_config.MEMORY_DIGEST_MAX_TOKENS)
+        self.storage.set_digest(topic, digest, through_id, datetime.now().isoformat())
+
     def search_conversations(self, search_term):
         """Search through conversation history"""
-        results = []
-        search_lower = search_term.lower()
-        
-        for conv in self.conversations:
-            if (search_lower in conv['query'].lower() or 
-                search_lower in conv['response'].lower()):
-                results.append(conv)
-        
-        return results[-10:]  # Return last 10 matches
+        return self.storage.search_conversations(search_term, 10)  # Best 10 matches
     
     def get_topic_summary(self, topic):
         """Get summary of conversations on a topic"""
-        if topic not in self.topics:
+        count = self.topics.get(topic)
+        if not count:
             return f"No conversations found on {topic}"
         
-        topic_convs = [c for c in self.conversations if c['id'] in self.topics[topic]]
-        
         summary = f"Topic: {topic.title()}\n"
-        summary += f"Conversations: {len(topic_convs)}\n"
+        summary += f"Conversations: {count}\n"
+        digest = self.storage.get_digest(topic)
+        if digest:
+            summary += f"Digest: {digest['digest']}\n"
         
-        for conv in topic_convs[-3:]:  # Last 3
+        for conv in self.storage.topic_conversations(topic, 3):  # Last 3
             summary += f"- {conv['query'][:60]}...\n"
         
         return summary
     
     def learn_preference(self, key, value):
         """Learn user preferences"""
-        self.user_preferences[key] = {
-            'value': value,
-            'learned_at': datetime.now().isoformat()
-        }
-        self.save_memory()
+        self.storage.set_preference(key, value, datetime.now().isoformat())
     
     def get_preference(self, key):
         """Get user preference"""
-        return self.user_preferences.get(key, {}).get('value')
+        return (self.storage.get_preference(key) or {}).get('value')
     
     def add_correction(self, original_response, corrected_info):
         """Learn from user corrections"""
-        correction_id = len(self.corrections) + 1
-        self.corrections[correction_id] = {
+        return self.storage.add_correction({
             'original': original_response,
             'correction': corrected_info,
             'timestamp': datetime.now().isoformat()
-        }
-        self.save_memory()
+        })
     
     def export_conversations(self, filename=None):
         """Export conversations to file"""
@@ -221,7 +236,7 @@ class AdvancedMemorySystem:
             f.write("AI Conversation History\n")
             f.write("=" * 50 + "\n\n")
             
-            for conv in self.conversations:
+            for conv in self.storage.iter_conversations():
                 f.write(f"Time: {conv['timestamp']}\n")
                 f.write(f"Topic: {conv['topic']}\n")
                 f.write(f"Q: {conv['query']}\n")
@@ -232,12 +247,13 @@ class AdvancedMemorySystem:
     
     def get_memory_stats(self):
         """Get memory system statistics"""
+        topics = self.topics
         stats = {
-            'total_conversations': len(self.conversations),
-            'topics_discussed': len(self.topics),
-            'preferences_learned': len(self.user_preferences),
-            'corrections_made': len(self.corrections),
-            'most_discussed_topic': max(self.topics.items(), key=lambda x: len(x[1]))[0] if self.topics else 'None'
+            'total_conversations': self.storage.count_conversations(),
+            'topics_discussed': len(topics),
+            'preferences_learned': self.storage.count_preferences(),
+            'corrections_made': self.storage.count_corrections(),
+            'most_discussed_topic': max(topics.items(), key=lambda x: x[1])[0] if topics else 'None'
         }
         return stats
     
@@ -269,7 +285,20 @@ class AdvancedMemorySystem:
     def get_personalized_suggestions(self):
         """Get personalized suggestions based on patterns"""
         suggestions = []
-        if self.topics:
-            popular_topic = max(self.topics.items(), key=lambda x: len(x[1]))[0]
+        topics = self.topics
+        if topics:
+            popular_topic = max(topics.items(), key=lambda x: x[1])[0]
             suggestions.append(f"You often ask about {popular_topic}")
-        return suggestions
\ No newline at end of file
+        return suggestions
+
+    def clear(self):
+        """Forget every conversation, preference and correction"""
+        self.storage.clear()
+        if self.episodic is not None:
+            self.episodic.clear()
+
+    def close(self):
+        """Write pending changes and release the storage"""
+        self.storage.close()
+        if self.episodic is not None:
+            self.episodic.close()
@@ -0,0 +1,117 @@
+"""
+Model Manager
+Loads the Ollama models in the background at startup and keeps them resident with
+keep-alive pings while the session is active, so the first answer costs the same
+as every later one.
+"""
+
+import asyncio
+import time
+from datetime import datetime
+
+
+class ModelManager:
+    """Background warm-up and keep-alive for Ollama models"""
+
+    def __init__(self, client_getter, models, keep_alive, options=None, ping_interval=240, idle_timeout=3600,
+                 on_error=None):
+        self.client_getter = client_getter  # Returns the shared async Ollama client
+        # A list, or a callable returning the models currently in use (e.g. ModelRouter.models)
+        self._models = models if callable(models) else (lambda: models)
+        self.keep_alive = keep_alive
+        self.options = options or {}
+        self.ping_interval = ping_interval
+        self.idle_timeout = idle_timeout  # Stop pinging once the user has been away this long
+        self.on_error = on_error  # Called with (model, error) when a load fails
+        self.states = {model: self._new_state() for model in self.models}
+        self.pings = 0
+        self.last_activity = time.monotonic()
+        self.last_model_call = 0.0
+        self._runtime = None
+        self._task = None
+
+    @property
+    def models(self):
+        """Models to warm up and ping, unique and in order, evaluated on every use"""
+        return list(dict.fromkeys(self._models()))
+
+    @staticmethod
+    def _new_state():
+        return {'state': 'cold', 'load_seconds': None, 'last_ping': None, 'error': None}
+
+    def touch(self):
+        """Record user activity (keeps the pings going)"""
+        now = time.monotonic()
+        returning = now - self.last_activity > self.idle_timeout
+        self.last_activity = now
+        if returning and self._runtime is not None:
+            # The model may have been unloaded - reload it while the question is being prepared
+            for model in self.models:
+                self._runtime.submit(self._load(model))
+
+    def model_used(self):
+        """Record a real model call - it resets Ollama's idle timer by itself"""
+        self.last_model_call = time.monotonic()
+        self.touch()
+
+    async def _load(self, model):
+        """An empty prompt loads the model without generating anything"""
+        state = self.states.setdefault(model, self._new_state())
+        if state['state'] == 'cold':
+            state['state'] = 'loading'
+        start = time.perf_counter()
+        try:
+            await self.client_getter().generate(model=model, prompt='', keep_alive=self.keep_alive,
+                                                options=self.options)
+            state.update(state='ready', error=None, last_ping=datetime.now())
+            if state['load_seconds'] is None:
+                state['load_seconds'] = time.perf_counter() - start
+        except Exception as e:
+            state.update(state='error', error=str(e))
+            if self.on_error:
+                self.on_error(model, str(e))
+
+    async def run(self):
+        """Warm up every model, then ping while the session is active"""
+        for model in self.models:
+            await self._load(model)
+
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            now = time.monotonic()
+            if now - self.last_activity > self.idle_timeout:
+                continue  # Let Ollama unload the model while nobody is using it
+            if now - self.last_model_call < self.ping_interval:
+                continue  # A real call already refreshed keep_alive
+            for model in self.models:
+                await self._load(model)
+                self.pings += 1
+
+    def start(self, runtime):
+        """Start warm-up and pings on the runtime's event loop"""
+        if self._task is None:
+            self._runtime = runtime
+            self._task = runtime.submit(self.run())
+        return self._task
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def loaded_models(self):
+        """What Ollama currently has in memory: {model: {'expires_at', 'size_vram'}}"""
+        response = await self.client_getter().ps()
+        loaded = {}
+        for entry in response.get('models') or []:
+            name = entry.get('model') or entry.get('name')
+            loaded[name] = {'expires_at': entry.get('expires_at'), 'size_vram': entry.get('size_vram')}
+        return loaded
+
+    def stats(self):
+        """Per-model load state"""
+        return {
+            'models': {model: dict(state) for model, state in self.states.items()},
+            'pings': self.pings,
+            'idle_seconds': time.monotonic() - self.last_activity
+        }
@@ -0,0 +1,137 @@
+"""
+Model Router
+Picks a model tier for each call - a small fast model for conversation, the main
+model for grounded (search-backed) answers - and records per-tier latency and
+token metrics so the split can be tuned.
+"""
+
+import threading
+from collections import deque
+import performance_config
+
+FAST = 'fast'
+MAIN = 'main'
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of values (None when empty)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class TierMetrics:
+    """Rolling latency and token counters for one tier"""
+
+    def __init__(self, window=100):
+        self.calls = 0
+        self.fallbacks = 0
+        self.length_stops = 0  # Answers cut off by num_predict
+        self.latencies = deque(maxlen=window)
+        self.first_token = deque(maxlen=window)
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.prompt_seconds = 0.0
+        self.decode_seconds = 0.0
+
+    def record(self, seconds, usage, first_token_seconds=None):
+        self.calls += 1
+        self.latencies.append(seconds)
+        if first_token_seconds is not None:
+            self.first_token.append(first_token_seconds)
+        # Ollama reports durations in nanoseconds
+        self.prompt_tokens += usage.get('prompt_eval_count') or 0
+        self.completion_tokens += usage.get('eval_count') or 0
+        self.prompt_seconds += (usage.get('prompt_eval_duration') or 0) / 1e9
+        self.decode_seconds += (usage.get('eval_duration') or 0) / 1e9
+        if usage.get('done_reason') == 'length':
+            self.length_stops += 1
+
+    def stats(self):
+        return {
+            'calls': self.calls,
+            'fallbacks': self.fallbacks,
+            'length_stops': self.length_stops,
+            'avg_completion_tokens': self.completion_tokens / self.calls if self.calls else 0,
+            'avg_decode_seconds': self.decode_seconds / self.calls if self.calls else 0,
+            'p50_seconds': percentile(self.latencies, 0.5),
+            'p95_seconds': percentile(self.latencies, 0.95),
+            'p50_first_token_seconds': percentile(self.first_token, 0.5),
+            'prompt_tokens': self.prompt_tokens,
+            'completion_tokens': self.completion_tokens,
+            'prompt_tokens_per_second': self.prompt_tokens / self.prompt_seconds if self.prompt_seconds else None,
+            'decode_tokens_per_second': self.completion_tokens / self.decode_seconds if self.decode_seconds else None
+        }
+
+
+class ModelRouter:
+    """Chooses a model tier from the query type, prompt size and latency budget"""
+
+    def __init__(self, tiers=None, latency_budget=None):
+        self.tiers = tiers or performance_config.MODEL_TIERS
+        self.latency_budget = latency_budget or performance_config.LATENCY_BUDGET
+        self.metrics = {tier: TierMetrics() for tier in self.tiers}
+        self.answer_metrics = {}  # answer type -> TierMetrics, to tune GENERATION_LIMITS
+        self.disabled = {}  # tier -> reason
+        self._lock = threading.Lock()
+
+    def model(self, tier):
+        return self.tiers[tier]['model']
+
+    def models(self):
+        """Every model in use, main first"""
+        models = [self.model(MAIN)] + [self.model(tier) for tier in self.tiers if tier not in self.disabled]
+        return list(dict.fromkeys(models))
+
+    def _fits(self, tier, prompt_tokens):
+        limit = self.tiers[tier].get('max_prompt_tokens')
+        return tier not in self.disabled and (limit is None or prompt_tokens <= limit)
+
+    def route(self, query_type, prompt_tokens):
+        """Tier for a call: conversation goes to the fast tier, grounded answers to the main tier"""
+        if FAST not in self.tiers:
+            return MAIN
+
+        if query_type == 'chat':
+            # Small models lose track in long prompts
+            return FAST if self._fits(FAST, prompt_tokens) else MAIN
+
+        # Grounded answer: degrade to the fast tier only if the main tier keeps missing the budget
+        budget = self.latency_budget.get(query_type)
+        p50 = percentile(self.metrics[MAIN].latencies, 0.5)
+        if budget and p50 and p50 > budget and self._fits(FAST, prompt_tokens):
+            return FAST
+        return MAIN
+
+    def disable(self, tier, reason):
+        """Stop routing to a tier whose model failed (e.g. not pulled)"""
+        if tier != MAIN:
+            with self._lock:
+                self.disabled[tier] = reason
+                self.metrics[tier].fallbacks += 1
+
+    def disable_model(self, model, reason):
+        """Disable every tier served by a model that failed to load"""
+        if model == self.model(MAIN):
+            return
+        for tier in self.tiers:
+            if self.model(tier) == model and tier not in self.disabled:
+                self.disable(tier, reason)
+
+    def record(self, tier, seconds, usage, first_token_seconds=None, answer_type=None):
+        with self._lock:
+            self.metrics[tier].record(seconds, usage, first_token_seconds)
+            if answer_type:
+                metrics = self.answer_metrics.setdefault(answer_type, TierMetrics())
+                metrics.record(seconds, usage, first_token_seconds)
+
+    def answer_stats(self):
+        """Per answer type metrics"""
+        return {answer_type: metrics.stats() for answer_type, metrics in self.answer_metrics.items()}
+
+    def stats(self):
+        """Per-tier metrics"""
+        return {tier: dict(self.metrics[tier].stats(), model=self.model(tier),
+                           disabled=self.disabled.get(tier))
+                for tier in self.tiers}
@@ -7,6 +7,33 @@ Centralized settings for AI Assistant performance tuning
 CACHE_ENABLED = True
 CACHE_TTL = 3600  # Cache time-to-live in seconds (1 hour)
 MAX_CACHE_SIZE = 1000  # Maximum number of cached items
+MAX_CACHE_BYTES = None  # Optional per-cache memory budget in bytes (None = entry limit only)
+RESPONSE_CACHE_FILE = "ai_response_cache.db"  # On-disk LLM response cache (survives restarts)
+PERSISTENT_CACHE_TTL = 86400  # On-disk response cache time-to-live in seconds (24 hours)
+
+# Semantic Cache Settings (answers rephrased questions from cache)
+SEMANTIC_CACHE_ENABLED = False  # Requires numpy and a local Ollama embedding model
+EMBEDDING_MODEL = "nomic-embed-text"  # Pull with: ollama pull nomic-embed-text
+SEMANTIC_CACHE_THRESHOLD = 0.92  # Minimum cosine similarity to reuse an answer
+SEMANTIC_CACHE_TTL = {  # Per query type time-to-live in seconds
+    'search': 900,  # Search-backed answers go stale quickly
+    'chat': 3600
+}
+
+# Knowledge Base Settings (saved search-backed answers, checked before searching)
+KNOWLEDGE_FILE = "ai_knowledge.json"  # Whole-file format of older versions, imported into the log once
+KNOWLEDGE_LOG_FILE = "ai_knowledge.jsonl"  # Append-only answer log (+ ".snapshot" index)
+KNOWLEDGE_COMPACT_AFTER = 200  # Minimum log records between snapshots, and between compactions (dead records)
+KNOWLEDGE_MIN_SCORE = 0.5  # Minimum BM25 score for a saved answer to be considered
+KNOWLEDGE_MIN_COVERAGE = 0.75  # Minimum share of the saved question's terms asked (every asked term must match)
+KNOWLEDGE_TTL = {  # Per search type time-to-live in seconds (the shortest matching type wins)
+    'news': 1800,
+    'weather': 1800,
+    'products': 86400,
+    'jobs': 86400,
+    'local': 7 * 86400,
+    'default': 30 * 86400
+}
 
 # Search Settings
 SEARCH_CACHE_ENABLED = True
@@ -21,16 +48,71 @@ BATCH_SAVE_DELAY = 5  # Delay for batching memory saves (seconds)
 LAZY_LOAD_MODELS = True  # Load models only when needed
 WHISPER_MODEL = "base"  # Whisper model size (base, small, medium, large)
 OLLAMA_MODEL = "llama3.2"  # Ollama model to use
+OLLAMA_KEEP_ALIVE = "30m"  # Keep the model (and its prompt cache) loaded between turns
+OLLAMA_NUM_CTX = 4096  # Context window - must hold the session history plus the prompt and answer
+MODEL_TIERS = {  # Model per tier - conversation goes to 'fast', search-grounded answers to 'main'
+    # No prompt cap for 'fast': the history is already capped by CONTEXT_BUDGET, and switching
+    # tiers as it grows would throw away the session's prompt cache
+    'fast': {'model': "llama3.2:1b", 'max_prompt_tokens': None},  # Pull with: ollama pull llama3.2:1b
+    'main': {'model': OLLAMA_MODEL, 'max_prompt_tokens': None}
+}
+LATENCY_BUDGET = {'search': 12.0}  # Seconds; if the main tier's p50 exceeds this, fitting prompts use 'fast'
+MODEL_WARMUP = True  # Load the model in the background at startup
+MODEL_PING_INTERVAL = 240  # Seconds between keep-alive pings while the session is active
+MODEL_IDLE_TIMEOUT = 3600  # Stop pinging after this many seconds without user input
+HEADLESS = False  # No speech and no audio imports (same as --headless / --no-audio)
+PRELOAD_SUBSYSTEMS = ['memory_system', 'translation_service', 'search_engine']  # Built in the background after the first prompt
 
 # Response Settings
 SHOW_THINKING_PROCESS = False  # Disable thinking process by default (saves 1 API call)
-RESPONSE_STREAMING = False  # Enable streaming responses (requires UI support)
-MAX_RESPONSE_LENGTH = 500  # Maximum response length in characters
+RESPONSE_STREAMING = None  # Stream tokens as they arrive (None = auto, on when stdout is a TTY)
+MAX_RESPONSE_LENGTH = 500  # Maximum response length in characters (~4 characters per token)
+GENERATION_LIMITS = {  # Per answer type: num_predict (max tokens decoded) and extra stop sequences
+    'greeting': {'num_predict': 40, 'stop': ["\n\n"]},
+    'chat': {'num_predict': MAX_RESPONSE_LENGTH // 4},  # Spoken answers
+    'search': {'num_predict': MAX_RESPONSE_LENGTH // 4},  # "2-3 sentences" grounded answers
+    'summary': {'num_predict': MAX_RESPONSE_LENGTH // 2},
+    'session_summary': {'num_predict': 120},
+    'memory_digest': {'num_predict': 120}
+}
+STOP_SEQUENCES = ["\nUser:", "\nQuestion:"]  # Never let the model write the next turn
 
 # Memory Settings
-MAX_CONVERSATION_HISTORY = 100  # Keep last N conversations
-MAX_CONTEXT_LENGTH = 1200  # Maximum context length for AI
-MEMORY_BATCH_SIZE = 10  # Batch memory operations
+MEMORY_BACKEND = "sqlite"  # "sqlite" keeps the full history on disk, "json" keeps it in memory
+MEMORY_DB_FILE = "ai_memory.db"
+MEMORY_FILE = "ai_memory.json"  # JSON backend (imported into SQLite on first run)
+PREFERENCES_FILE = "user_preferences.json"
+MAX_CONVERSATION_HISTORY = 100  # JSON backend: keep last N conversations
+MAX_CONTEXT_LENGTH = 1200  # Maximum prompt tokens per model call (system prompt + question + context), history aside
+CONTEXT_BUDGET = {  # Per-section token caps inside MAX_CONTEXT_LENGTH, filled in this priority order
+    'location': 40,
+    'memory': 200,
+    'search': 700,
+    'history': 800  # Chat session summary + earlier turns (sent on top of the prompt, outside MAX_CONTEXT_LENGTH)
+}
+SESSION_KEEP_TURNS = 2  # Most recent turns never rolled into the session summary
+MEMORY_CONTEXT_TURNS = 4  # Past conversations in the memory context
+EPISODIC_MEMORY_ENABLED = False  # Embedding recall of older turns; requires numpy and EMBEDDING_MODEL
+EPISODIC_MEMORY_FILE = "ai_memory_vectors.f32"  # Memory-mapped float32 vectors (+ ".ids", ".json")
+EPISODIC_MEMORY_CAPACITY = 10000  # Vectors kept (ring buffer)
+EPISODIC_TOP_K = 4  # Similar past turns considered per query
+EPISODIC_MIN_SIMILARITY = 0.5  # Minimum cosine similarity for a past turn to be recalled
+EPISODIC_RECENCY_WEIGHT = 0.3  # Context score = (1 - w) * similarity + w * recency
+EPISODIC_RECENCY_HALF_LIFE = 10  # Conversations until recency counts half
+MEMORY_BATCH_SIZE = 10  # JSON backend: journal events per fsync
+MEMORY_FSYNC_DELAY = 1.0  # JSON backend: seconds before a partial batch is fsynced
+MEMORY_SNAPSHOT_EVERY = 100  # JSON backend: journal events between background snapshots
+MEMORY_DIGEST_ENABLED = True  # Fold older conversations into one short digest per topic while idle
+MEMORY_DIGEST_IDLE_SECONDS = 60  # Seconds without user input before digests are written
+MEMORY_DIGEST_INTERVAL = 30  # Seconds between idle checks (one topic is digested per check)
+MEMORY_DIGEST_KEEP_RECENT = 2  # Newest conversations per topic left out of the digest
+MEMORY_DIGEST_MIN_TURNS = 5  # Older undigested conversations a topic needs before it is folded
+MEMORY_DIGEST_BATCH = 20  # Most conversations folded per digest update
+MEMORY_DIGEST_MAX_TOKENS = 100  # Digest length kept (and at most half the memory context)
+MEMORY_DIGEST_MAX_OVERLAP = 0.8  # Digest left out when this share of its words is already in the session summary
+MEMORY_USER = None  # Memory namespace for the terminal (same as --user; None = the files above)
+MEMORY_NAMESPACE_DIR = "ai_memory_users"  # One subdirectory of memory files per user id
+MAX_LOADED_NAMESPACES = 8  # Users whose memory stays open; the least recently used is flushed and closed
 
 # Optimization Flags
 ENABLE_ASYNC_OPERATIONS = True  # Run I/O operations asynchronously
@@ -41,6 +123,9 @@ ENABLE_BATCH_SAVES = True  # Batch file I/O operations
 # Performance Monitoring
 ENABLE_PERFORMANCE_LOGGING = True  # Log performance metrics
 PERFORMANCE_LOG_FILE = "performance.log"
+MODEL_METRICS_FILE = "model_metrics.jsonl"  # One line per model call: tier, latency, tokens
+STARTUP_METRICS_FILE = "startup_metrics.jsonl"  # One time-to-first-prompt record per start
+STARTUP_PROFILE_FILE = "startup_profile.json"  # Written by terminal_ai.py --profile-startup
 
 # Optimization Tips
 OPTIMIZATION_TIPS = """
@@ -0,0 +1,161 @@
+"""
+Prompt Budget
+Token counting and a fixed per-prompt token budget split across prompt sections by priority.
+Ollama has no tokenize endpoint, so tokens are estimated from word/punctuation pieces and the
+estimate is calibrated against the prompt_eval_count Ollama reports for each call.
+"""
+
+import math
+import re
+import threading
+import performance_config
+
+PIECE_PATTERN = re.compile(r"\w+|[^\w\s]")
+MESSAGE_OVERHEAD = 4  # Chat template tokens around each message
+
+
+class TokenCounter:
+    """Calibrated token estimator"""
+
+    def __init__(self, tokens_per_piece=1.25):
+        self.tokens_per_piece = tokens_per_piece
+        self.samples = 0
+        self._lock = threading.Lock()
+
+    def count(self, text):
+        """Estimated token count of text"""
+        if not text:
+            return 0
+        return math.ceil(len(PIECE_PATTERN.findall(text)) * self.tokens_per_piece)
+
+    def calibrate(self, text, actual_tokens):
+        """Move the estimate towards a token count reported by the model"""
+        pieces = len(PIECE_PATTERN.findall(text or ""))
+        if not actual_tokens or pieces < 20:
+            return
+        ratio = actual_tokens / pieces
+        # A prompt served from the model's prefix cache reports only the new tokens
+        if not 0.5 <= ratio <= 4:
+            return
+        with self._lock:
+            self.samples += 1
+            weight = max(0.1, 1 / self.samples)
+            self.tokens_per_piece += (ratio - self.tokens_per_piece) * weight
+
+    def truncate(self, text, max_tokens):
+        """Longest prefix of text within max_tokens, cut at a word boundary"""
+        if not text or max_tokens <= 0:
+            return ""
+        if self.count(text) <= max_tokens:
+            return text
+        # One piece is left for the ellipsis
+        max_pieces = int(max_tokens / self.tokens_per_piece) - 1
+        if max_pieces <= 0:
+            return ""  # Not even one word and the ellipsis fit
+        end = None
+        for index, match in enumerate(PIECE_PATTERN.finditer(text)):
+            if index == max_pieces:
+                break
+            end = match.end()
+        return text[:end].rstrip() + "…" if end else ""
+
+
+TOKEN_COUNTER = TokenCounter()  # Shared so every caller benefits from calibration
+
+
+class PromptBudget:
+    """Fixed prompt token budget, filled section by section in priority order"""
+
+    def __init__(self, limit=None, caps=None, counter=None):
+        self.limit = limit or performance_config.MAX_CONTEXT_LENGTH
+        self.caps = performance_config.CONTEXT_BUDGET if caps is None else caps
+        self.counter = counter or TOKEN_COUNTER
+        self.last_prompt_tokens = 0
+        self.truncations = 0
+
+    def reserve(self, *texts):
+        """Tokens taken by fixed text (system prompt, templates)"""
+        return sum(self.counter.count(text) + MESSAGE_OVERHEAD for text in texts if text)
+
+    def allocate(self, sections, reserved=0):
+        """Fit sections into the budget left after reserved tokens
+
+        sections is [(name, text), ...] highest priority first. Each section
+        takes what it needs up to its cap; lower priority sections get what
+        is left and are cut at a word boundary.
+        """
+        remaining = self.limit - reserved
+        fitted = {}
+        for name, text in sections:
+            needed = self.counter.count(text)
+            allowed = max(0, remaining)
+            cap = self.caps.get(name)
+            if cap is not None:
+                allowed = min(allowed, cap)
+
+            if needed > allowed:
+                text = self.counter.truncate(text, allowed)
+                self.truncations += 1
+                needed = self.counter.count(text)
+
+            fitted[name] = text
+            remaining -= needed
+        return fitted
+
+    def fit(self, system_prompt, template, prompt, context="", memory=""):
+        """Enforce the limit on one model call: memory and the question first, then the context"""
+        reserved = self.reserve(system_prompt, template, memory)
+        fitted = self.allocate([('prompt', prompt), ('search', context)], reserved)
+        self.last_prompt_tokens = (reserved + self.counter.count(fitted['prompt'])
+                                   + self.counter.count(fitted['search']))
+        return fitted['prompt'], fitted['search']
+
+    def message_tokens(self, messages):
+        return sum(self.counter.count(message['content']) + MESSAGE_OVERHEAD for message in messages)
+
+    def message_limit(self):
+        """Token limit of a whole message list: the prompt limit plus the history cap on top of it"""
+        return self.limit + (self.caps.get('history') or 0)
+
+    def fit_messages(self, messages):
+        """Enforce message_limit() on a whole message list (system prompt, history, memory, new turn)
+
+        The new turn was fitted within the prompt limit and the session keeps its
+        history within the history cap, so this only trims a history that is over
+        its cap (a roll still pending). Dropping turns changes the cached prefix,
+        so it is a last resort: the oldest user/assistant turns go first, then the
+        summary and memory system messages are cut. The system prompt and the new
+        turn are kept.
+        """
+        limit = self.message_limit()
+        total = self.message_tokens(messages)
+        if total > limit:
+            self.truncations += 1
+            head, body, last = messages[:1], list(messages[1:-1]), messages[-1:]
+            while total > limit:
+                turn = next((index for index, message in enumerate(body) if message['role'] != 'system'), None)
+                if turn is None:
+                    break
+                total -= self.message_tokens(body[turn:turn + 2])
+                del body[turn:turn + 2]
+            for index, message in enumerate(body):
+                if total <= limit:
+                    break
+                tokens = self.counter.count(message['content'])
+                content = self.counter.truncate(message['content'], tokens - (total - limit))
+                total -= tokens - self.counter.count(content)
+                body[index] = dict(message, content=content)
+            messages = head + [message for message in body if message['content']] + last
+            total = self.message_tokens(messages)
+        self.last_prompt_tokens = total
+        return messages
+
+    def stats(self):
+        """Budget counters"""
+        return {
+            'limit': self.limit,
+            'last_prompt_tokens': self.last_prompt_tokens,
+            'truncations': self.truncations,
+            'tokens_per_piece': round(self.counter.tokens_per_piece, 3),
+            'calibration_samples': self.counter.samples
+        }
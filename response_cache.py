@@ -0,0 +1,143 @@
+"""
+Persistent Response Cache
+SQLite-backed LLM response cache that survives restarts
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+
+import performance_config
+
+
+def fingerprint(model, system_prompt, prompt, context=""):
+    """Collision-free cache key over everything that shapes the answer"""
+    h = hashlib.sha256()
+    for part in (model, system_prompt, prompt, context):
+        data = (part or "").encode('utf-8')
+        # Length prefix so ("ab", "c") and ("a", "bc") never collide
+        h.update(len(data).to_bytes(8, 'big'))
+        h.update(data)
+    return h.hexdigest()
+
+
+class PersistentResponseCache:
+    """On-disk response cache with TTL expiry"""
+
+    def __init__(self, db_file=None, ttl=None):
+        self.db_file = db_file or performance_config.RESPONSE_CACHE_FILE
+        self.ttl = performance_config.PERSISTENT_CACHE_TTL if ttl is None else ttl
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self._lock = threading.Lock()
+
+        try:
+            self.conn = sqlite3.connect(self.db_file, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    model TEXT,
+                    response TEXT NOT NULL,
+                    created REAL NOT NULL,
+                    expires REAL
+                )
+            """)
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_expires ON responses(expires)")
+            self.conn.commit()
+            self.purge_expired()
+        except sqlite3.Error as e:
+            print(f"Response cache disabled: {e}")
+            self.conn = None
+
+    def get(self, key):
+        """Return a fresh cached response or None"""
+        if self.conn is None:
+            return None
+
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT response, expires FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        if row[1] is not None and row[1] <= time.time():
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return row[0]
+
+    def set(self, key, response, model=None, ttl=None):
+        """Store a response"""
+        if self.conn is None:
+            return
+
+        ttl = self.ttl if ttl is None else ttl
+        now = time.time()
+        expires = now + ttl if ttl else None
+
+        try:
+            with self._lock:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, model, response, created, expires) VALUES (?, ?, ?, ?, ?)",
+                    (key, model, response, now, expires)
+                )
+                self.conn.commit()
+        except sqlite3.Error as e:
+            print(f"Response cache write failed: {e}")
+
+    def purge_expired(self):
+        """Delete expired rows"""
+        if self.conn is None:
+            return 0
+
+        with self._lock:
+            cursor = self.conn.execute(
+                "DELETE FROM responses WHERE expires IS NOT NULL AND expires <= ?", (time.time(),)
+            )
+            self.conn.commit()
+        self.expirations += cursor.rowcount
+        return cursor.rowcount
+
+    def clear(self):
+        """Delete every cached response"""
+        if self.conn is None:
+            return
+
+        with self._lock:
+            self.conn.execute("DELETE FROM responses")
+            self.conn.commit()
+
+    def stats(self):
+        """Hit/miss counters and row count"""
+        entries = 0
+        if self.conn is not None:
+            with self._lock:
+                entries = self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+        lookups = self.hits + self.misses
+        return {
+            'name': 'persistent_responses',
+            'entries': entries,
+            'max_entries': None,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': 0,
+            'expirations': self.expirations
+        }
+
+    def close(self):
+        """Close the database connection"""
+        if self.conn is not None:
+            with self._lock:
+                self.conn.close()
+            self.conn = None
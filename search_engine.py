@@ -1,14 +1,29 @@
+import asyncio
 from ddgs import DDGS
 import wikipedia
-wikipedia.set_lang("en")
-# Fix Wikipedia parser warning
 import warnings
-warnings.filterwarnings("ignore", category=UserWarning, module='wikipedia')
 import requests
 from bs4 import BeautifulSoup
+from intent_matcher import SOURCE_MATCHER
+
+# Best sources for each query type (see intent_matcher.SOURCE_TABLES)
+SOURCES_BY_QUERY_TYPE = {
+    'current': ['news', 'web', 'wiki'],
+    'education': ['web'],  # Educational queries need web search
+    'definition': ['web', 'wiki'],
+    'statistics': ['web', 'news'],  # Focus on current data sources
+    'institute': ['web'],  # Focus on educational institution data
+    'mortality': ['web', 'news'],  # Focus on current data, avoid outdated wiki
+    'business': ['web', 'news'],
+    'science': ['web', 'wiki']
+}
 
 class MultiSearchEngine:
     def __init__(self):
+        # Configured here rather than at import time so importing the module stays cheap
+        wikipedia.set_lang("en")
+        # Fix Wikipedia parser warning
+        warnings.filterwarnings("ignore", category=UserWarning, module='wikipedia')
         self.sources = {
             'web': self._search_web,
             'news': self._search_news,
@@ -25,6 +40,14 @@ class MultiSearchEngine:
                 results[source] = self.sources[source](query)
         return self._combine_results(results)
     
+    async def asearch(self, query, sources=['web', 'wiki']):
+        """Async search - all sources are queried concurrently"""
+        selected = [source for source in sources if source in self.sources]
+        contents = await asyncio.gather(*(
+            asyncio.to_thread(self.sources[source], query) for source in selected
+        ))
+        return self._combine_results(dict(zip(selected, contents)))
+    
     def _search_web(self, query):
         """Enhanced web search with better results"""
         try:
@@ -137,32 +160,19 @@ class MultiSearchEngine:
     
     def smart_search(self, query):
         """Intelligent search based on query type"""
-        query_lower = query.lower()
-        
         # Clean and optimize query for better results
         clean_query = self._optimize_query(query)
-        
-        # Determine best sources based on query (ChatGPT-like)
-        if any(word in query_lower for word in ['news', 'latest', 'recent', 'today', 'current']):
-            sources = ['news', 'web', 'wiki']
-        elif any(word in query_lower for word in ['college', 'university', 'school', 'education']):
-            sources = ['web']  # Educational queries need web search
-        elif any(word in query_lower for word in ['what is', 'define', 'meaning', 'explain']):
-            sources = ['web', 'wiki']
-        elif any(word in query_lower for word in ['population', 'statistics', 'data', 'demographics']):
-            sources = ['web', 'news']  # Focus on current data sources
-        elif any(word in query_lower for word in ['college', 'university', 'school', 'education', 'institute']):
-            sources = ['web']  # Focus on educational institution data
-        elif any(word in query_lower for word in ['deaths', 'mortality', 'crime', 'crime rate']):
-            sources = ['web', 'news']  # Focus on current data, avoid outdated wiki
-        elif any(word in query_lower for word in ['company', 'business', 'stock', 'economy']):
-            sources = ['web', 'news']
-        elif any(word in query_lower for word in ['technology', 'science', 'research']):
-            sources = ['web', 'wiki']
-        else:
-            sources = ['web']
-        
-        return self.search(clean_query, sources)
+        return self.search(clean_query, self._select_sources(query))
+    
+    async def asmart_search(self, query):
+        """Async smart search - sources run concurrently instead of one by one"""
+        clean_query = self._optimize_query(query)
+        return await self.asearch(clean_query, self._select_sources(query))
+    
+    def _select_sources(self, query):
+        """Determine best sources based on query (ChatGPT-like)"""
+        query_type = SOURCE_MATCHER.first(query)
+        return list(SOURCES_BY_QUERY_TYPE.get(query_type, ['web']))
     
     def _optimize_query(self, query):
         """Optimize query for better search results"""
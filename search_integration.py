@@ -5,6 +5,7 @@ Unified interface for all search functionality
 
 from advanced_search_engine import AdvancedSearchEngine
 from specialized_search import SpecializedSearch
+from intent_matcher import SEARCH_TYPE_MATCHER
 from typing import List, Dict, Union
 import json
 
@@ -70,53 +71,7 @@ class UnifiedSearchEngine:
     
     def _detect_search_type(self, query: str) -> str:
         """Auto-detect search type from query"""
-        query_lower = query.lower()
-        
-        # News indicators
-        if any(word in query_lower for word in ['news', 'latest', 'recent', 'today', 'breaking', 'current']):
-            return 'news'
-        
-        # Academic indicators
-        if any(word in query_lower for word in ['research', 'paper', 'study', 'academic', 'journal', 'thesis']):
-            return 'academic'
-        
-        # Statistics indicators
-        if any(word in query_lower for word in ['statistics', 'data', 'percent', 'average', 'rate', 'number']):
-            return 'statistics'
-        
-        # Definition indicators
-        if any(word in query_lower for word in ['define', 'meaning', 'what is', 'definition', 'explain']):
-            return 'definition'
-        
-        # Image indicators
-        if any(word in query_lower for word in ['image', 'picture', 'photo', 'show me', 'look like']):
-            return 'images'
-        
-        # Video indicators
-        if any(word in query_lower for word in ['video', 'youtube', 'watch', 'tutorial', 'how to']):
-            return 'videos'
-        
-        # Local indicators
-        if any(word in query_lower for word in ['near me', 'nearby', 'local', 'in my area', 'around']):
-            return 'local'
-        
-        # Weather indicators
-        if any(word in query_lower for word in ['weather', 'temperature', 'forecast', 'rain', 'sunny']):
-            return 'weather'
-        
-        # Product indicators
-        if any(word in query_lower for word in ['buy', 'price', 'product', 'shop', 'store', 'cost']):
-            return 'products'
-        
-        # Job indicators
-        if any(word in query_lower for word in ['job', 'hiring', 'career', 'position', 'employment']):
-            return 'jobs'
-        
-        # Recipe indicators
-        if any(word in query_lower for word in ['recipe', 'cook', 'ingredients', 'prepare', 'make']):
-            return 'recipes'
-        
-        return 'general'
+        return SEARCH_TYPE_MATCHER.first(query, 'general')
     
     def smart_search(self, query: str, **kwargs) -> Dict:
         """
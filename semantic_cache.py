@@ -0,0 +1,145 @@
+"""
+Semantic Response Cache
+Returns cached answers for rephrased questions using local Ollama embeddings
+"""
+
+import threading
+import time
+
+import performance_config
+from cache_engine import LRUCache
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, the cache simply stays disabled
+    np = None
+
+
+class SemanticCache:
+    """Near-duplicate answer cache with vectorized cosine top-1 lookup"""
+
+    def __init__(self, model=None, threshold=None, capacity=None, ttls=None, embed_fn=None):
+        self.model = model or performance_config.EMBEDDING_MODEL
+        self.threshold = performance_config.SEMANTIC_CACHE_THRESHOLD if threshold is None else threshold
+        self.capacity = capacity or performance_config.MAX_CACHE_SIZE
+        self.ttls = ttls or performance_config.SEMANTIC_CACHE_TTL
+        self.embed_fn = embed_fn or self._ollama_embed
+        self.enabled = np is not None
+
+        # Recent query embeddings, so add() after lookup() doesn't embed twice
+        self.embedding_cache = LRUCache(max_entries=256, ttl=0, max_bytes=0, name="embeddings")
+
+        self.vectors = None  # (capacity, dim) float32, rows are unit length
+        self.expires = None  # (capacity,) expiry timestamps
+        self.type_codes = None  # (capacity,) ids of (query type, owner)
+        self.entries = [None] * self.capacity  # (query, answer) per row
+        self.count = 0
+        self.next_slot = 0
+        self.type_ids = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _ollama_embed(self, text):
+        import ollama
+        response = ollama.embeddings(model=self.model, prompt=text)
+        return response['embedding']
+
+    def embed(self, text):
+        """Unit-length float32 embedding of a query"""
+        key = text.strip().lower()
+        vector = self.embedding_cache.get(key)
+        if vector is None:
+            vector = np.asarray(self.embed_fn(key), dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            if norm:
+                vector /= norm
+            self.embedding_cache.set(key, vector)
+        return vector
+
+    def _type_id(self, type_key):
+        if type_key not in self.type_ids:
+            self.type_ids[type_key] = len(self.type_ids)
+        return self.type_ids[type_key]
+
+    def lookup(self, query, query_type='chat', owner=None):
+        """Return a cached answer for a semantically similar query, or None
+
+        owner (a user id) also sees the answers cached for it, ahead of shared ones.
+        """
+        if not self.enabled or self.count == 0:
+            return None
+
+        try:
+            vector = self.embed(query)
+        except Exception as e:
+            print(f"Embedding failed: {e}")
+            return None
+
+        with self._lock:
+            n = self.count
+            if self.vectors is None or vector.shape[0] != self.vectors.shape[1]:
+                return None
+
+            similarities = self.vectors[:n] @ vector
+            fresh = self.expires[:n] > time.time()
+            for type_key in ([(query_type, owner)] if owner is not None else []) + [(query_type, None)]:
+                valid = fresh & (self.type_codes[:n] == self._type_id(type_key))
+                candidates = np.where(valid, similarities, -1.0)
+
+                best = int(np.argmax(candidates))
+                if candidates[best] >= self.threshold:
+                    self.hits += 1
+                    return self.entries[best][1]
+
+        self.misses += 1
+        return None
+
+    def add(self, query, answer, query_type='chat', owner=None):
+        """Cache an answer, overwriting the oldest row when full
+
+        owner keeps the answer from every other user (None = shared).
+        """
+        if not self.enabled:
+            return
+
+        try:
+            vector = self.embed(query)
+        except Exception as e:
+            print(f"Embedding failed: {e}")
+            return
+
+        ttl = self.ttls.get(query_type, performance_config.CACHE_TTL)
+
+        with self._lock:
+            if self.vectors is None:
+                self.vectors = np.zeros((self.capacity, vector.shape[0]), dtype=np.float32)
+                self.expires = np.zeros(self.capacity, dtype=np.float64)
+                self.type_codes = np.full(self.capacity, -1, dtype=np.int32)
+
+            slot = self.next_slot
+            if self.entries[slot] is not None:
+                self.evictions += 1
+            self.vectors[slot] = vector
+            self.expires[slot] = time.time() + ttl
+            self.type_codes[slot] = self._type_id((query_type, owner))
+            self.entries[slot] = (query, answer)
+
+            self.next_slot = (slot + 1) % self.capacity
+            self.count = min(self.count + 1, self.capacity)
+
+    def stats(self):
+        """Hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            'name': 'semantic',
+            'entries': self.count,
+            'max_entries': self.capacity,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': 0
+        }
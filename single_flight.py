@@ -0,0 +1,86 @@
+"""
+Single-Flight Request Coalescing
+Concurrent identical requests share one in-flight call instead of repeating the work
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """Thread-based single-flight: one caller runs fn, the others wait for its result"""
+
+    def __init__(self, name="flight"):
+        self.name = name
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) unless an identical call is already running"""
+        with self._lock:
+            self.calls += 1
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                future = Future()
+                self._inflight[key] = future
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn(*args, **kwargs)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def stats(self):
+        """Coalescing counters"""
+        return {
+            'name': self.name,
+            'calls': self.calls,
+            'executed': self.executed,
+            'coalesced': self.coalesced,
+            'in_flight': len(self._inflight)
+        }
+
+
+class AsyncSingleFlight(SingleFlight):
+    """Asyncio single-flight: identical awaits share one task"""
+
+    async def do(self, key, coro_fn, *args):
+        """Await coro_fn(*args) unless an identical call is in flight
+
+        Returns (result, coalesced) so followers know they didn't run the call.
+        """
+        self.calls += 1
+        task = self._inflight.get(key)
+        coalesced = task is not None
+
+        if coalesced:
+            self.coalesced += 1
+        else:
+            self.executed += 1
+            task = asyncio.ensure_future(coro_fn(*args))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+
+        # Shield so one cancelled caller doesn't cancel the call for everyone
+        return await asyncio.shield(task), coalesced
+
+    def _forget(self, key, task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
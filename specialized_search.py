@@ -7,12 +7,13 @@ import requests
 from datetime import datetime, timedelta
 from typing import List, Dict
 import json
+from cache_engine import LRUCache
 
 class SpecializedSearch:
     """Specialized search for different query types"""
     
     def __init__(self):
-        self.cache = {}
+        self.cache = LRUCache(name="specialized_search")
         
     def search_news(self, query: str, days: int = 7) -> List[Dict]:
         """Search for recent news"""
@@ -0,0 +1,129 @@
+"""
+Startup Profiler
+Measures where TerminalAI startup time goes: per-module import cost (from
+`python -X importtime` in a fresh interpreter) and per-subsystem constructor cost.
+Prints sorted tables and writes a JSON report for tracking regressions.
+"""
+
+import importlib
+import json
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+import performance_config
+
+IMPORT_SCRIPT = """
+import importlib, sys
+for name in sys.argv[1:]:
+    try:
+        importlib.import_module(name)
+    except Exception as e:
+        print(f"{name}: {type(e).__name__}: {e}")
+"""
+
+
+def parse_importtime(stderr):
+    """Parse `-X importtime` output into {module: (self_us, cumulative_us)}"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            modules[name.strip()] = (int(self_us), int(cumulative_us))
+        except ValueError:
+            continue
+    return modules
+
+
+class StartupProfiler:
+    """Import and constructor timings for TerminalAI startup"""
+
+    def __init__(self, headless=False):
+        self.headless = headless
+        self.imports = {}
+        self.import_errors = []
+        self.constructors = {}
+
+    def profile_imports(self, modules):
+        """Import modules in a fresh interpreter so nothing is already cached"""
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", IMPORT_SCRIPT, *modules],
+                                capture_output=True, text=True)
+        self.imports = parse_importtime(result.stderr)
+        self.import_errors = [line for line in result.stdout.splitlines() if line.strip()]
+        return self.imports
+
+    def time_constructor(self, name, build):
+        """Time build() and record it under name, returns what build() returned"""
+        start = time.perf_counter()
+        try:
+            return build()
+        except Exception as e:
+            print(f"⚠️ {name} failed: {e}")
+        finally:
+            self.constructors[name] = time.perf_counter() - start
+
+    def profile_terminal_ai(self, ai_class, subsystems, audio_subsystems=()):
+        """Time TerminalAI() and then each subsystem constructor
+
+        Subsystem modules are imported before the clock starts, so the
+        constructor column is construction only.
+        """
+        ai = self.time_constructor("TerminalAI", lambda: ai_class(headless=self.headless))
+        if ai is None:
+            return None
+
+        for name, (module_name, class_name) in subsystems.items():
+            if self.headless and name in audio_subsystems:
+                continue
+            try:
+                importlib.import_module(module_name)
+            except Exception as e:
+                print(f"⚠️ {module_name} import failed: {e}")
+                continue
+            self.time_constructor(name, lambda name=name: getattr(ai, name))
+        return ai
+
+    def top_imports(self, limit=None):
+        """Modules sorted by cumulative import time"""
+        ranked = sorted(self.imports.items(), key=lambda item: item[1][1], reverse=True)
+        return ranked[:limit] if limit else ranked
+
+    def report(self, limit=25):
+        """Print the sorted import and constructor tables"""
+        print("\n⏱️  Import cost (fresh interpreter, sorted by cumulative time)")
+        print(f"{'module':<40}{'self ms':>10}{'cumul. ms':>12}")
+        print("-" * 62)
+        for name, (self_us, cumulative_us) in self.top_imports(limit):
+            print(f"{name:<40}{self_us / 1000:>10.1f}{cumulative_us / 1000:>12.1f}")
+        for error in self.import_errors:
+            print(f"⚠️ {error}")
+
+        print("\n⏱️  Constructor cost (sorted)")
+        print(f"{'subsystem':<40}{'ms':>10}")
+        print("-" * 50)
+        for name, seconds in sorted(self.constructors.items(), key=lambda item: item[1], reverse=True):
+            print(f"{name:<40}{seconds * 1000:>10.1f}")
+        print(f"\nTotal constructors: {sum(self.constructors.values()) * 1000:.1f} ms")
+
+    def to_dict(self):
+        return {
+            'timestamp': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'headless': self.headless,
+            'imports': [{'module': name, 'self_ms': self_us / 1000, 'cumulative_ms': cumulative_us / 1000}
+                        for name, (self_us, cumulative_us) in self.top_imports()],
+            'import_errors': self.import_errors,
+            'constructors': [{'name': name, 'ms': seconds * 1000}
+                             for name, seconds in sorted(self.constructors.items(),
+                                                         key=lambda item: item[1], reverse=True)]
+        }
+
+    def save(self, path=None):
+        """Write the JSON report"""
+        path = path or performance_config.STARTUP_PROFILE_FILE
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return path
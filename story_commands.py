@@ -0,0 +1,65 @@
+"""
+Story Commands
+Terminal commands for the story finder, imported on first use
+"""
+
+
+def story(ai, args):
+    story_type = args.strip()
+    print(f"\nFinding {story_type} stories...")
+
+    stories = ai.story_finder.search_stories(story_type)
+    if stories:
+        story = stories[0]  # Get first story
+        formatted_story = ai.story_finder.format_story(story)
+        print(f"\n{formatted_story}")
+
+        # Speak story title and beginning
+        speech_text = f"Here's a {story_type} story: {story['title']}. {story['content'][:100]}..."
+        ai.speak(speech_text)
+    else:
+        print(f"No {story_type} stories found.")
+        ai.speak(f"No {story_type} stories found")
+
+
+def random_story(ai, args):
+    print("\nFinding a random story...")
+    story = ai.story_finder.get_random_story()
+
+    if story:
+        formatted_story = ai.story_finder.format_story(story)
+        print(f"\n{formatted_story}")
+
+        speech_text = f"Here's a random story: {story['title']}. {story['content'][:100]}..."
+        ai.speak(speech_text)
+    else:
+        print("No stories available.")
+        ai.speak("No stories available")
+
+
+def search_story(ai, args):
+    keyword = args.strip()
+    if not keyword:
+        # Show all available stories
+        print("\nAvailable story types:")
+        print("- ghost/horror - Scary and supernatural stories")
+        print("- adventure - Action and exploration stories")
+        print("- romance - Love and relationship stories")
+        print("- general - Sci-fi and fantasy stories")
+        print("\nTry: 'story ghost' or 'random story'")
+        ai.speak("I have ghost stories, adventure stories, romance stories, and general stories available")
+        return
+
+    print(f"\nSearching stories with keyword: {keyword}")
+
+    stories = ai.story_finder.search_by_keyword(keyword)
+    if stories:
+        print(f"\nFound {len(stories)} stories:")
+        for i, story in enumerate(stories, 1):
+            print(f"\n{i}. {story['title']} ({story['source']})")
+            print(f"   {story['content'][:100]}...")
+
+        ai.speak(f"Found {len(stories)} stories matching {keyword}")
+    else:
+        print(f"No stories found with keyword: {keyword}")
+        ai.speak(f"No stories found with keyword {keyword}")
@@ -1,115 +1,531 @@
-import ollama
+import time
+STARTUP_START = time.perf_counter()  # Time to first prompt is measured from here
+import argparse
+import asyncio
+import importlib
 import threading
 import json
 import os
+import sys
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
-from search_engine import MultiSearchEngine
-from location_finder import LocationFinder
-from weather_service import WeatherService
-from memory_system import AdvancedMemorySystem
-from translation_service import TranslationService
-from story_finder import StoryFinder
-from ai_personality import AIPersonality
-from advanced_search import AdvancedSearchEngine
-from smart_assistant import SmartAssistant
-from voice_clone import VoiceCloneSystem
+from cache_engine import LRUCache
+from response_cache import PersistentResponseCache, fingerprint
+from semantic_cache import SemanticCache
+from knowledge_store import KnowledgeStore
+from async_runtime import AsyncRuntime
+from single_flight import AsyncSingleFlight
+from intent_matcher import SEARCH_DECISION_MATCHER, is_greeting
+from command_registry import CommandRegistry
+from prompt_budget import PromptBudget, MESSAGE_OVERHEAD
+from chat_session import ChatSession
+from model_manager import ModelManager
+from model_router import ModelRouter, MAIN
+import performance_config
+
+AI_UNAVAILABLE = "AI model not available"
+TERMINAL_OWNER = ""  # Owner of the terminal user's personal answers when it runs without --user
+PRONOUNS = {'it', 'that', 'this', 'they', 'them'}
+NO_SEARCH_CATEGORIES = {'skip_search', 'basic_knowledge', 'basic_science', 'general_concepts', 'conversational'}
+SEARCH_CATEGORIES = {'search_trigger', 'search_pattern'}
+# Subsystems are built on first attribute access: attribute -> (module, class)
+SUBSYSTEMS = {
+    'search_engine': ('search_engine', 'MultiSearchEngine'),
+    'location_finder': ('location_finder', 'LocationFinder'),
+    'weather_service': ('weather_service', 'WeatherService'),
+    'memory_system': ('memory_system', 'AdvancedMemorySystem'),
+    'memory_namespaces': ('memory_namespaces', 'MemoryNamespaces'),
+    'translation_service': ('translation_service', 'TranslationService'),
+    'story_finder': ('story_finder', 'StoryFinder'),
+    'ai_personality': ('ai_personality', 'AIPersonality'),
+    'advanced_search': ('advanced_search', 'AdvancedSearchEngine'),
+    'smart_assistant': ('smart_assistant', 'SmartAssistant'),
+    'voice': ('voice_clone', 'VoiceCloneSystem'),
+}
+AUDIO_SUBSYSTEMS = {'voice'}  # Never imported in headless mode (pygame, pydub, gTTS)
+SEARCH_CONTEXT_TEMPLATE = "Based on this search data: {context}\n\nQuestion: {prompt}\n\nProvide a helpful response in 2-3 sentences."
+SYSTEM_PROMPT = "You are a helpful AI assistant. Respond naturally and conversationally. For greetings like 'hello', respond with a simple greeting. For questions, provide clear and accurate answers."
+
+
+class StreamRenderer:
+    """Print streamed tokens to the terminal as they arrive"""
+
+    def __init__(self, header="\nAI:"):
+        self.header = header
+        self.streamed = False
+
+    def __call__(self, token):
+        # Print the header lazily so status lines (searching...) come first
+        if not self.streamed:
+            print(self.header)
+            self.streamed = True
+        sys.stdout.write(token)
+        sys.stdout.flush()
+
+    def finish(self):
+        """End the streamed line"""
+        if self.streamed:
+            sys.stdout.write("\n")
+            sys.stdout.flush()
 
 
 class TerminalAI:
-    def __init__(self):
-        self.knowledge_file = "ai_knowledge.json"
+    def __init__(self, headless=None, user=None):
+        self.knowledge_file = performance_config.KNOWLEDGE_FILE
         self.conversation_context = []
         self.conversation_memory = []  # Store full conversation history
-        self.search_engine = MultiSearchEngine()
-        self.location_finder = LocationFinder()
-        self.weather_service = WeatherService()
-        self.memory_system = AdvancedMemorySystem()
-        self.translation_service = TranslationService()
-        self.story_finder = StoryFinder()
-        self.ai_personality = AIPersonality()
-        self.advanced_search = AdvancedSearchEngine()
-        self.smart_assistant = SmartAssistant()
-        self.voice = VoiceCloneSystem()
+        # Headless: no speech, the audio stack is never imported
+        self.headless = performance_config.HEADLESS if headless is None else headless
+        # Memory namespace: this user's files under MEMORY_NAMESPACE_DIR (None = the shared files)
+        self.user = performance_config.MEMORY_USER if user is None else user
+        self._subsystem_lock = threading.RLock()
+        self.time_to_first_prompt = None
 
         # Performance optimizations
         self.executor = ThreadPoolExecutor(max_workers=4)  # Thread pool for async operations
-        self.response_cache = {}  # Cache for frequently asked questions
-        self.search_cache = {}  # Cache for search results
-        self.cache_ttl = 3600  # Cache time-to-live in seconds
-        self.last_cache_clear = datetime.now()
+        # Separate pool for the pre-LLM pipeline so queued speech never delays a search
+        self.pipeline_executor = ThreadPoolExecutor(max_workers=performance_config.MAX_WORKERS)
+        # Event loop for the async core; the sync methods below are thin wrappers over it
+        self.runtime = AsyncRuntime(self.pipeline_executor)
+        self._ollama_client = None
+        self.model = performance_config.OLLAMA_MODEL
+        # Small model for conversation, main model for grounded answers
+        self.router = ModelRouter()
+        self.response_cache = LRUCache(name="responses")  # Cache for frequently asked questions
+        self.persistent_cache = PersistentResponseCache()  # On-disk cache, survives restarts
+        self.semantic_cache = SemanticCache() if performance_config.SEMANTIC_CACHE_ENABLED else None
+        self.search_cache = LRUCache(name="searches")  # Cache for search results
+        self.prompt_budget = PromptBudget()  # Enforces MAX_CONTEXT_LENGTH tokens per model call
+        # Multi-turn chat history sent as real messages so Ollama can reuse its prompt cache
+        self.session = self._new_session()
+        self._session_rolling = False
+        # Idle-time topic digests of older conversations
+        self._digest_task = None
+        self._digest_failed_at = None  # last_activity when a digest call failed - retried after the next input
+        # Loads the model in the background and keeps it resident while the session is active
+        # Pings follow the router: a tier disabled after a failure is no longer kept loaded
+        self.model_manager = ModelManager(lambda: self.ollama_client, self.router.models,
+                                          performance_config.OLLAMA_KEEP_ALIVE,
+                                          self._chat_options()['options'],
+                                          performance_config.MODEL_PING_INTERVAL,
+                                          performance_config.MODEL_IDLE_TIMEOUT,
+                                          on_error=self.router.disable_model)
+        # Coalesce concurrent identical searches and model calls
+        self.search_flight = AsyncSingleFlight(name="searches")
+        self.llm_flight = AsyncSingleFlight(name="llm")
+
+        # Stream tokens to the terminal by default when attached to a TTY
+        if performance_config.RESPONSE_STREAMING is None:
+            self.stream_responses = sys.stdout.isatty()
+        else:
+            self.stream_responses = performance_config.RESPONSE_STREAMING
 
         self.load_knowledge()
-        
 
-    
+        if not performance_config.LAZY_LOAD_MODELS:
+            self.load_subsystems()
+
+    def __getattr__(self, name):
+        """Build a subsystem the first time it is used"""
+        if name not in SUBSYSTEMS:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        if name in AUDIO_SUBSYSTEMS and self.headless:
+            raise AttributeError(f"'{name}' is not available in headless mode")
+
+        with self._subsystem_lock:
+            # Another thread may have built it while we waited
+            if name not in self.__dict__:
+                module_name, class_name = SUBSYSTEMS[name]
+                subsystem_class = getattr(importlib.import_module(module_name), class_name)
+                self.__dict__[name] = subsystem_class(**self._subsystem_args(name))
+        return self.__dict__[name]
+
+    async def _asubsystem(self, name):
+        """A subsystem, built on a worker thread the first time so the event loop never blocks"""
+        if name in self.__dict__:
+            return self.__dict__[name]
+        return await asyncio.to_thread(getattr, self, name)
+
+    def _subsystem_args(self, name):
+        """Constructor arguments for a subsystem"""
+        if name == 'memory_system' and self.user:
+            from memory_storage import namespace_directory
+            return {'directory': namespace_directory(self.user)}
+        if name == 'memory_namespaces':
+            return {'session_factory': self._new_session}
+        return {}
+
+    def _new_session(self):
+        """An empty chat session"""
+        return ChatSession(SYSTEM_PROMPT, performance_config.CONTEXT_BUDGET['history'],
+                           keep_turns=performance_config.SESSION_KEEP_TURNS)
+
+    def load_subsystems(self, names=None):
+        """Build subsystems now instead of on first use"""
+        for name in names or SUBSYSTEMS:
+            if name in AUDIO_SUBSYSTEMS and self.headless:
+                continue
+            try:
+                getattr(self, name)
+            except Exception as e:
+                print(f"⚠️ Could not load {name}: {e}")
+
+    def reset_subsystem(self, name):
+        """Drop a subsystem so the next access builds a fresh one"""
+        with self._subsystem_lock:
+            self.__dict__.pop(name, None)
+
+    def loaded_subsystems(self):
+        """Names of the subsystems built so far"""
+        return [name for name in SUBSYSTEMS if name in self.__dict__]
+
+    def mark_first_prompt(self):
+        """Record time to first prompt and preload the common subsystems in the background"""
+        if self.time_to_first_prompt is not None:
+            return
+        self.time_to_first_prompt = time.perf_counter() - STARTUP_START
+        metric = {
+            'timestamp': datetime.now().isoformat(),
+            'time_to_first_prompt': round(self.time_to_first_prompt, 4),
+            'headless': self.headless,
+            'subsystems_loaded': self.loaded_subsystems()
+        }
+        self.executor.submit(self._append_startup_metric, metric)
+        self.executor.submit(self.load_subsystems, performance_config.PRELOAD_SUBSYSTEMS)
+
+    def _append_startup_metric(self, metric):
+        try:
+            with open(performance_config.STARTUP_METRICS_FILE, 'a') as f:
+                f.write(json.dumps(metric) + "\n")
+        except OSError as e:
+            print(f"Startup metric error: {e}")
+
     def speak(self, text, language=None):
         """Speak with your voice style (async)"""
+        if self.headless:
+            return
         # Run in background thread to avoid blocking
-        self.executor.submit(self.voice.speak_like_you, text)
+        self.executor.submit(self._speak, text)
+
+    def _speak(self, text):
+        try:
+            voice = self.voice
+        except Exception as e:
+            # No audio device or audio libraries - carry on without speech
+            print(f"🔇 Voice disabled: {e}")
+            self.headless = True
+            return
+        voice.speak_like_you(text)
+
+    def cache_stats(self):
+        """Hit/miss/eviction counters for the response and search caches"""
+        stats = [self.response_cache.stats(), self.persistent_cache.stats(), self.search_cache.stats(),
+                 self.knowledge.stats()]
+        if self.semantic_cache:
+            stats.append(self.semantic_cache.stats())
+        return stats
 
-    def _clear_old_cache(self):
-        """Clear cache if TTL expired"""
-        now = datetime.now()
-        if (now - self.last_cache_clear).total_seconds() > self.cache_ttl:
-            self.response_cache.clear()
-            self.search_cache.clear()
-            self.last_cache_clear = now
+    @property
+    def ollama_client(self):
+        """Async Ollama client, created on the event loop on first use"""
+        if self._ollama_client is None:
+            import ollama
+            self._ollama_client = ollama.AsyncClient()
+        return self._ollama_client
+
+    def coalescing_stats(self):
+        """How many search and model calls were served by an identical in-flight call"""
+        return [self.search_flight.stats(), self.llm_flight.stats()]
 
     def search_web(self, query):
         """Use smart search algorithm with clean query (cached)"""
+        return self.runtime.run(self.asearch_web(query))
+
+    async def asearch_web(self, query):
+        """Async search_web - sources are queried concurrently"""
         # Extract just the main question, not the full context
         clean_query = query.split("Current question:")[-1].strip() if "Current question:" in query else query
 
         # Check cache first
         cache_key = clean_query.lower()
-        if cache_key in self.search_cache:
-            return self.search_cache[cache_key]
+        cached = self.search_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
-        # Search in background and cache result
-        result = self.search_engine.smart_search(clean_query)
-        self.search_cache[cache_key] = result
+        # Search in background (sharing any identical in-flight search) and cache result
+        search_engine = await self._asubsystem('search_engine')
+        result, _ = await self.search_flight.do(cache_key, search_engine.asmart_search, clean_query)
+        self.search_cache.set(cache_key, result)
         return result
     
 
     
-    def get_ai_response(self, prompt, context="", show_thinking=False):
-        """Get AI response (optimized - removed double call)"""
+    def new_renderer(self, header="\nAI:"):
+        """Return a token renderer if streaming is enabled, else None"""
+        return StreamRenderer(header) if self.stream_responses else None
+
+    def get_ai_response(self, prompt, context="", show_thinking=False, on_token=None):
+        """Get AI response (optimized - removed double call)
+
+        If on_token is given the answer is streamed: each token is passed to
+        on_token as it arrives and the full text is still returned.
+        """
+        return self.runtime.run(self.aget_ai_response(prompt, context, show_thinking, on_token))
+
+    async def aget_ai_response(self, prompt, context="", show_thinking=False, on_token=None,
+                               session=None, history_prompt=None, query_type=None, answer_type=None,
+                               memory_context=""):
+        """Async get_ai_response using the Ollama async client
+
+        With a session the prompt is sent as the next turn of that conversation
+        and the turn is recorded as history_prompt (default: prompt) -> answer;
+        memory_context is sent with this turn only.
+        query_type ('chat' or 'search', default: 'search' when there is context)
+        picks the model tier; answer_type (a GENERATION_LIMITS key, default:
+        query_type) caps the answer length.
+        """
         try:
-            # Check cache first
-            cache_key = f"{prompt}:{context}".lower()[:100]
-            if cache_key in self.response_cache:
-                return self.response_cache[cache_key]
+            system_prompt = SYSTEM_PROMPT
 
-            # System prompt for consistent behavior
-            system_prompt = "You are a helpful AI assistant. Respond naturally and conversationally. For greetings like 'hello', respond with a simple greeting. For questions, provide clear and accurate answers."
+            # Keep the prompt inside the token budget: the question first, then the search data
+            template = SEARCH_CONTEXT_TEMPLATE.format(context="", prompt="") if context else ""
+            memory_context = memory_context if session else ""
+            prompt, context = self.prompt_budget.fit(system_prompt, template, prompt, context, memory_context)
 
             if context:
-                full_prompt = f"Based on this search data: {context}\n\nQuestion: {prompt}\n\nProvide a helpful response in 2-3 sentences."
+                full_prompt = SEARCH_CONTEXT_TEMPLATE.format(context=context, prompt=prompt)
             else:
                 full_prompt = prompt
 
-            # Single call instead of two
-            response = ollama.chat(model='llama3.2', messages=[
-                {'role': 'system', 'content': system_prompt},
-                {'role': 'user', 'content': full_prompt}
-            ], stream=False)
+            if session:
+                # History comes on top of the fitted prompt within its own cap - only an over-cap history is trimmed
+                messages = self.prompt_budget.fit_messages(session.messages(full_prompt, memory_context))
+            else:
+                messages = [
+                    {'role': 'system', 'content': system_prompt},
+                    {'role': 'user', 'content': full_prompt}
+                ]
 
-            result = response['message']['content']
+            query_type = query_type or ('search' if context else 'chat')
+            prompt_tokens = self.prompt_budget.counter.count("\n".join(m['content'] for m in messages))
+            tier = self.router.route(query_type, prompt_tokens)
+            model = self.router.model(tier)
+            answer_type = answer_type or query_type
 
-            # Cache the response
-            self.response_cache[cache_key] = result
+            if session:
+                # The answer depends on the whole conversation, not just this prompt
+                cache_key = fingerprint(model, session.prefix_key(messages), full_prompt, context)
+            else:
+                cache_key = fingerprint(model, system_prompt, full_prompt, context)
 
+            # Check memory cache first, then the on-disk cache
+            result = self.response_cache.get(cache_key)
+            if result is None:
+                result = self.persistent_cache.get(cache_key)
+                if result is not None:
+                    self.response_cache.set(cache_key, result)
+            if result is not None:
+                if on_token:
+                    on_token(result)
+            else:
+                # Identical in-flight requests share one model call
+                result, coalesced = await self.llm_flight.do(
+                    cache_key, self._agenerate, messages, on_token, cache_key, context, tier, answer_type
+                )
+                if coalesced and on_token:
+                    on_token(result)
+
+            if session:
+                # Coalesced callers in the same session share one turn
+                self._record_turn(session, history_prompt or prompt, result, cache_key)
             return result
         except Exception as e:
             print(f"AI Error: {e}")
-            return "AI model not available"
-    
-    def summarize(self, text):
+            return AI_UNAVAILABLE
+
+    async def _agenerate(self, messages, on_token, cache_key, context, tier=MAIN, answer_type='chat'):
+        """Call the routed model and cache the answer"""
+        self.model_manager.model_used()
+        start = time.perf_counter()
+        try:
+            result, usage, first_token = await self._acall_model(self.router.model(tier), messages, on_token,
+                                                                 answer_type)
+        except Exception as e:
+            if tier == MAIN:
+                raise
+            # Usually the small model isn't pulled - stop routing to it
+            print(f"⚠️ {self.router.model(tier)} unavailable ({e}), using {self.router.model(MAIN)}")
+            self.router.disable(tier, str(e))
+            tier = MAIN
+            start = time.perf_counter()
+            result, usage, first_token = await self._acall_model(self.router.model(tier), messages, on_token,
+                                                                 answer_type)
+
+        elapsed = time.perf_counter() - start
+        self._record_usage(messages, usage)
+        self.router.record(tier, elapsed, usage, first_token, answer_type)
+        if performance_config.ENABLE_PERFORMANCE_LOGGING:
+            self.executor.submit(self._append_model_metric, tier, elapsed, usage, first_token, answer_type)
+
+        # Cache the response
+        self.response_cache.set(cache_key, result)
+        # Search-backed answers go stale sooner than plain conversation
+        disk_ttl = performance_config.CACHE_TTL if context else None
+        self.executor.submit(self.persistent_cache.set, cache_key, result, self.router.model(tier), disk_ttl)
+
+        return result
+
+    async def _acall_model(self, model, messages, on_token, answer_type=None):
+        """One chat call, returns (text, usage counters, seconds to first token)"""
+        if not on_token:
+            # Single call instead of two
+            response = await self.ollama_client.chat(model=model, messages=messages, stream=False,
+                                                     **self._chat_options(answer_type))
+            return response['message']['content'], response, None
+        return await self._astream_chat(model, messages, on_token, answer_type)
+
+    async def _astream_chat(self, model, messages, on_token, answer_type=None):
+        """Stream a chat completion, forwarding tokens and returning the full text"""
+        parts = []
+        usage = {}
+        first_token = None
+        start = time.perf_counter()
+        async for chunk in await self.ollama_client.chat(model=model, messages=messages, stream=True,
+                                                         **self._chat_options(answer_type)):
+            token = chunk['message']['content']
+            if token:
+                if first_token is None:
+                    first_token = time.perf_counter() - start
+                parts.append(token)
+                on_token(token)
+            if chunk.get('done'):
+                usage = chunk  # The final chunk carries the token counts and durations
+        return "".join(parts), usage, first_token
+
+    def _append_model_metric(self, tier, seconds, usage, first_token, answer_type=None):
+        """One line per model call in MODEL_METRICS_FILE, for tuning the tier split and length limits"""
+        metric = {
+            'timestamp': datetime.now().isoformat(),
+            'tier': tier,
+            'model': self.router.model(tier),
+            'answer_type': answer_type,
+            'done_reason': usage.get('done_reason'),
+            'seconds': round(seconds, 4),
+            'first_token_seconds': round(first_token, 4) if first_token is not None else None,
+            'prompt_tokens': usage.get('prompt_eval_count'),
+            'completion_tokens': usage.get('eval_count'),
+            'prompt_eval_ms': (usage.get('prompt_eval_duration') or 0) / 1e6,
+            'decode_ms': (usage.get('eval_duration') or 0) / 1e6
+        }
+        try:
+            with open(performance_config.MODEL_METRICS_FILE, 'a') as f:
+                f.write(json.dumps(metric) + "\n")
+        except OSError as e:
+            print(f"Model metric error: {e}")
+
+    def warm_up(self):
+        """Start loading the model now instead of on the first question"""
+        if performance_config.MODEL_WARMUP:
+            self.model_manager.start(self.runtime)
+
+    def start_memory_digests(self):
+        """Fold older conversations into topic digests whenever the user is idle"""
+        if performance_config.MEMORY_DIGEST_ENABLED and self._digest_task is None:
+            self._digest_task = self.runtime.submit(self._adigest_loop())
+
+    def _digest_idle(self):
+        """Idle long enough, but not so long the model was let go, and no model call running"""
+        last_activity = self.model_manager.last_activity
+        idle = time.monotonic() - last_activity
+        return (performance_config.MEMORY_DIGEST_IDLE_SECONDS <= idle < performance_config.MODEL_IDLE_TIMEOUT
+                and not self.llm_flight.stats()['in_flight']
+                and last_activity != self._digest_failed_at)
+
+    async def _adigest_loop(self):
+        while True:
+            await asyncio.sleep(performance_config.MEMORY_DIGEST_INTERVAL)
+            # Memory is built after the first prompt; nothing to digest before that
+            if 'memory_system' in self.__dict__ and self._digest_idle():
+                await self.adigest_topic()
+
+    async def adigest_topic(self):
+        """Write the next due topic digest, returns its topic (None if nothing was due)"""
+        memory = await self._asubsystem('memory_system')
+        job = await asyncio.to_thread(memory.next_digest)
+        if job is None:
+            return None
+        topic, prompt, through_id = job
+        # Same fast tier as session summaries
+        model = self.router.model(self.router.route('chat', 0))
+        try:
+            response = await self.ollama_client.chat(model=model, messages=[{'role': 'user', 'content': prompt}],
+                                                     stream=False, **self._chat_options('memory_digest'))
+        except Exception as e:
+            print(f"Memory digest error: {e}")
+            self._digest_failed_at = self.model_manager.last_activity
+            return None
+        await asyncio.to_thread(memory.apply_digest, topic, response['message']['content'], through_id)
+        return topic
+
+    def _chat_options(self, answer_type=None):
+        """Keep the model loaded between turns, with a window large enough for the session
+
+        answer_type adds its GENERATION_LIMITS (num_predict, stop sequences) so
+        the model stops decoding once the answer is as long as the call site needs.
+        """
+        options = {'num_ctx': performance_config.OLLAMA_NUM_CTX}
+        limits = performance_config.GENERATION_LIMITS.get(answer_type)
+        if limits:
+            options['num_predict'] = limits['num_predict']
+            options['stop'] = performance_config.STOP_SEQUENCES + limits.get('stop', [])
+        return {'keep_alive': performance_config.OLLAMA_KEEP_ALIVE, 'options': options}
+
+    def _record_turn(self, session, prompt, response, key=None):
+        """Add a finished turn to the session and roll old turns into the summary when over budget"""
+        if not session.record(prompt, response, key):
+            return
+        if session.needs_roll() and not self._session_rolling:
+            self._session_rolling = True
+            # Summarize after the answer is out, so the user never waits on it
+            asyncio.get_running_loop().create_task(self._aroll_session(session))
+
+    async def _aroll_session(self, session):
+        """Fold the oldest turns into the session summary"""
+        try:
+            summary, turns = session.turns_to_roll()
+            if not turns:
+                return
+            transcript = session.transcript(summary, turns)
+            # Summaries are short conversational work - the fast tier is enough
+            model = self.router.model(self.router.route('chat', 0))
+            try:
+                response = await self.ollama_client.chat(model=model, messages=[{
+                    'role': 'user',
+                    'content': f"Summarize this conversation in 3-4 sentences. Keep names, facts and open questions:\n{transcript}"
+                }], stream=False, **self._chat_options('session_summary'))
+                new_summary = response['message']['content']
+            except Exception as e:
+                print(f"Session summary error: {e}")
+                # Keep the gist without the model: clipped question/answer pairs
+                new_summary = " | ".join(
+                    f"Q: {self.prompt_budget.counter.truncate(user, 20)} A: {self.prompt_budget.counter.truncate(answer, 40)}"
+                    for user, answer in turns)
+            session.apply_roll(len(turns), new_summary)
+        finally:
+            self._session_rolling = False
+
+    def _record_usage(self, messages, response):
+        """Calibrate the token estimator with the prompt size Ollama reports"""
+        prompt_tokens = response.get('prompt_eval_count')
+        if prompt_tokens:
+            text = "\n".join(message['content'] for message in messages)
+            self.prompt_budget.counter.calibrate(text, prompt_tokens - MESSAGE_OVERHEAD * len(messages))
+
+    def summarize(self, text, on_token=None):
         """Summarize text"""
         prompt = f"Summarize this in 2-3 sentences: {text}"
-        return self.get_ai_response(prompt)
+        return self.runtime.run(self.aget_ai_response(prompt, on_token=on_token, answer_type='summary'))
     
     def save_to_memory(self, query, response):
         """Save conversation to advanced memory system"""
@@ -129,114 +545,60 @@ class TerminalAI:
         """Get intelligent context from advanced memory"""
         return self.memory_system.get_context_for_query("general")
     
-    def resolve_pronouns(self, query):
+    def resolve_pronouns(self, query, context=None):
         """Resolve pronouns using conversation context"""
-        context = self.memory_system.get_context_for_query(query)
+        if context is None:
+            context = self.memory_system.get_context_for_query(query)
         if not context:
             return query
             
         # Simple pronoun resolution
-        pronouns = {'it', 'that', 'this', 'they', 'them'}
-        query_words = query.lower().split()
-        
-        if any(pronoun in query_words for pronoun in pronouns):
+        if self._is_context_dependent(query):
             # Add context to help AI understand pronouns
             return f"Context: {context} | Question: {query}"
         
         return query
     
     def load_knowledge(self):
-        """Load saved knowledge"""
-        try:
-            with open(self.knowledge_file, 'r') as f:
-                self.knowledge = json.load(f)
-        except:
-            self.knowledge = {}
+        """Load saved knowledge into the indexed store"""
+        self.knowledge = KnowledgeStore(performance_config.KNOWLEDGE_LOG_FILE, legacy_path=self.knowledge_file)
+        self.knowledge.load()
+        if self.knowledge.needs_compaction() or self.knowledge.needs_snapshot():
+            self.executor.submit(self.knowledge.maintain)
     
-    def save_knowledge(self, query, answer):
-        """Save new knowledge"""
-        self.knowledge[query.lower()] = {
-            'answer': answer,
-            'timestamp': datetime.now().isoformat()
-        }
-        with open(self.knowledge_file, 'w') as f:
-            json.dump(self.knowledge, f, indent=2)
+    def save_knowledge(self, query, answer, query_type='search', owner=None):
+        """Save new knowledge (one appended log line, compacted now and then)"""
+        self.knowledge.add(query, answer, query_type, owner)
+        self.knowledge.maintain()
+
+    def shutdown(self):
+        """Flush on-disk stores before exit"""
+        if self._digest_task is not None:
+            self._digest_task.cancel()
+            self._digest_task = None
+        self.knowledge.close()
+        if 'memory_system' in self.__dict__:
+            self.memory_system.close()
+        if 'memory_namespaces' in self.__dict__:
+            self.memory_namespaces.close()
     
+    def answer_type(self, query, search_needed):
+        """How long the answer should be: 'greeting', 'chat' or 'search'"""
+        if search_needed:
+            return 'search'
+        if is_greeting(query):
+            return 'greeting'
+        return 'chat'
+
     def needs_search(self, query):
         """Smart search decision - avoid over-searching"""
         query_lower = query.lower()
         
-        # Don't search for basic conversational responses
-        skip_search = [
-            'hello', 'hi', 'thanks', 'thank you', 'bye', 'goodbye',
-            'how are you', 'what can you do', 'who are you', 'good morning',
-            'good evening', 'nice', 'great', 'okay', 'yes', 'no', 'sure',
-            'alright', 'fine', 'cool', 'awesome', 'perfect'
-        ]
+        # One pass over the query finds every keyword category
+        categories = SEARCH_DECISION_MATCHER.match(query_lower)
         
-        # Don't search for basic knowledge questions
-        basic_knowledge = [
-            'what is love', 'what is life', 'what is happiness', 'what is time',
-            'what is water', 'what is fire', 'what is earth', 'what is air',
-            'what is human', 'what is animal', 'what is plant', 'what is tree',
-            'what is sun', 'what is moon', 'what is oxygen', 'what is carbon',
-            'what is house', 'what is home', 'what is building', 'what is room'
-        ]
-        
-        # Don't search for basic anatomy/science facts
-        basic_science = [
-            'bones in human', 'bones in body', 'human bones', 'total bones'
-        ]
-        
-        # Don't search for general concepts or philosophical questions
-        general_concepts = [
-            'functions within', 'evolved over time', 'technological advancement',
-            'societal values', 'how they have changed', 'what do you think',
-            'your opinion', 'explain to me', 'tell me more', 'can you explain',
-            'search story', 'story search'
-        ]
-        
-        # Skip search for basic responses
-        if any(skip in query_lower for skip in skip_search):
-            return False
-            
-        if any(basic in query_lower for basic in basic_knowledge):
-            return False
-            
-        if any(science in query_lower for science in basic_science):
-            return False
-            
-        if any(concept in query_lower for concept in general_concepts):
-            return False
-        
-        # Only search for specific information needs
-        search_triggers = [
-            # Current/time-sensitive info
-            'current', 'latest', 'recent', 'today', 'now', '2024', '2025',
-            # Specific data requests
-            'price', 'cost', 'statistics', 'population', 'news', 'rate', 'crime',
-            # Weather and location
-            'weather', 'temperature', 'forecast',
-            # Specific factual queries
-            'best colleges', 'best hospitals', 'best restaurants',
-            'deaths in', 'mortality in', 'happened in', 'crime rate'
-        ]
-        
-        # Search for specific patterns
-        search_patterns = [
-            'tell me about current', 'latest information about', 'recent details about',
-            'what happened recently', 'how many people', 'current statistics',
-            'best in 2024', 'best in 2025', 'near me', 'in this pin code'
-        ]
-        
-        # Don't search for conversational requests
-        conversational = [
-            'can you ask me', 'ask me a question', 'quiz me', 'test me',
-            'can you help', 'help me with', 'i want to', 'let me',
-            'what do you think', 'your thoughts', 'your opinion'
-        ]
-        
-        if any(conv in query_lower for conv in conversational):
+        # Skip search for basic responses, knowledge, concepts and conversational requests
+        if categories & NO_SEARCH_CATEGORIES:
             return False
         
         # Don't search for simple "what is" questions about basic things
@@ -244,11 +606,10 @@ class TerminalAI:
             return False
         
         # Don't search for "how" questions about general concepts
-        if query_lower.startswith('how ') and any(word in query_lower for word in ['evolved', 'changed', 'developed', 'work', 'function']):
+        if query_lower.startswith('how ') and 'general_how' in categories:
             return False
         
-        return (any(trigger in query_lower for trigger in search_triggers) or 
-                any(pattern in query_lower for pattern in search_patterns))
+        return bool(categories & SEARCH_CATEGORIES)
     
     def extract_pincode_from_query(self, query):
         """Extract pincode from query"""
@@ -271,422 +632,660 @@ class TerminalAI:
                 return enhanced_query, location_info
         return query, None
     
-    def smart_response(self, query):
-        """Location-aware smart response (optimized)"""
-        # Only search when actually needed
-        if self.needs_search(query):
-            print("🔍 Searching for latest information...")
-
-            # Enhance query with location if pincode found
-            enhanced_query, location_info = self.enhance_query_with_location(query)
+    async def _asearch_with_location(self, query):
+        """Location lookup followed by the search it feeds"""
+        location_info = None
+        enhanced_query = query
+        if self.extract_pincode_from_query(query):
+            enhanced_query, location_info = await asyncio.to_thread(self.enhance_query_with_location, query)
 
             # Debug: show enhanced query
             if location_info:
                 print(f"📍 Searching for: {enhanced_query}")
 
-            # Use enhanced query for search (cached)
-            search_results = self.search_web(enhanced_query)
-            all_context = search_results[:1200]
+        # Use enhanced query for search (cached)
+        return location_info, await self.asearch_web(enhanced_query)
+
+    def _is_context_dependent(self, query):
+        """True if the query leans on earlier turns (pronouns), so cached answers don't apply"""
+        return any(word in PRONOUNS for word in query.lower().split())
+
+    async def _amemory_context(self, query, memory, session):
+        """Remembered context for this turn, without what the session already holds (turns, summary)"""
+        return await asyncio.to_thread(memory.get_context_for_query, query,
+                                       performance_config.CONTEXT_BUDGET['memory'], session.user_turns(),
+                                       session.summary)
+
+    async def _afinish_response(self, query, response, query_type, cacheable=True, memory=None, shared=True,
+                                owner=None):
+        """Cache, translate and remember a response
+
+        memory is a namespaced user's memory system (None = the terminal's own);
+        shared=False keeps the answer out of the semantic cache, and owner (a user id)
+        saves it in the semantic cache and knowledge store for that user alone.
+        A failed model call is returned but never saved, or the error text would
+        keep answering the question after the model is back.
+        """
+        failed = response == AI_UNAVAILABLE
+        if (cacheable and shared and self.semantic_cache and not failed
+                and not self._is_context_dependent(query)):
+            self.executor.submit(self.semantic_cache.add, query, response, query_type, owner)
+
+        # Translate response if needed, off the event loop (the language can
+        # only have changed if the translation service was built)
+        translator = self.__dict__.get('translation_service')
+        if translator is not None and translator.current_language != 'english':
+            response = await asyncio.to_thread(translator.translate_response, response,
+                                               translator.current_language)
+
+        if failed:
+            return response
+        if memory is None:
+            # Save to memory (async)
+            self.executor.submit(self.save_to_memory, query, response)
+            self.conversation_context.append(f"Q: {query} A: {response}")
+        else:
+            # Saved before the namespace is released, so an eviction never closes it mid-write
+            await asyncio.to_thread(memory.add_conversation, query, response)
+        if cacheable and query_type == 'search':
+            self.executor.submit(self.save_knowledge, query, response, query_type, owner)
+        return response
+
+    def smart_response(self, query, on_token=None, user=None):
+        """Location-aware smart response (optimized)
+
+        Pass on_token (e.g. a StreamRenderer) to stream the answer as it is generated,
+        and user to answer from that user's memory and chat session.
+        """
+        return self.runtime.run(self.asmart_response(query, on_token, user))
+
+    async def asmart_response(self, query, on_token=None, user=None):
+        """Async smart_response
+
+        Any user other than the terminal's own gets their memory and chat session
+        from the namespace LRU, held open until the answer is saved.
+        """
+        if user is None or user == self.user:
+            memory = await self._asubsystem('memory_system')
+            owner = TERMINAL_OWNER if self.user is None else self.user
+            return await self._arespond(query, on_token, memory, self.session, owner)
+
+        namespaces = await self._asubsystem('memory_namespaces')
+        namespace = await asyncio.to_thread(namespaces.acquire, user)
+        try:
+            return await self._arespond(query, on_token, namespace.memory, namespace.session, user, namespace=True)
+        finally:
+            await asyncio.to_thread(namespaces.release, user)
+
+    async def _arespond(self, query, on_token, memory, session, user=None, namespace=False):
+        """Answer a query from one user's memory and chat session
+
+        An answer whose prompt held the user's own context (recalled memory, their
+        location) is cached and saved for that user alone; other answers are shared.
+        """
+        search_needed = self.needs_search(query)
+        query_type = 'search' if search_needed else 'chat'
+        # Chat answers can be personal, so a namespaced user's only go through the shared cache when searched
+        shared = not namespace or search_needed
+        own_memory = memory if namespace else None
+
+        # Saved answers to the same question come straight from the knowledge index
+        if not self._is_context_dependent(query):
+            known = self.knowledge.lookup(query, query_type, user)
+            if known is not None:
+                if on_token:
+                    on_token(known)
+                # The next model turn has to see what the user was told
+                self._record_turn(session, query, known)
+                return await self._afinish_response(query, known, query_type, cacheable=False,
+                                                    memory=own_memory)
+
+        # Rephrased repeats are answered before searching or calling the LLM
+        if shared and self.semantic_cache and not self._is_context_dependent(query):
+            cached = await asyncio.to_thread(self.semantic_cache.lookup, query, query_type, user)
+            if cached is not None:
+                if on_token:
+                    on_token(cached)
+                self._record_turn(session, query, cached)
+                return await self._afinish_response(query, cached, query_type, cacheable=False,
+                                                    memory=own_memory)
+
+        # Only search when actually needed
+        if search_needed:
+            print("🔍 Searching for latest information...")
+
+            # The location lookup and search run in the background while the
+            # memory context is gathered; the search only waits on the lookup,
+            # which is skipped when there's no pincode
+            search_task = asyncio.create_task(self._asearch_with_location(query))
+            memory_context, location_pref = await asyncio.gather(
+                self._amemory_context(query, memory, session),
+                asyncio.to_thread(memory.get_preference, 'location')
+            )
+
+            location_info, search_results = await search_task
 
             # Enhanced AI prompt with conversation memory
             enhanced_prompt = f"Using ONLY the latest search results provided, give current 2025 information about: {query}. Do not use outdated data from 2020-2021. Focus on recent statistics and current trends."
 
-            # Add intelligent conversation context
-            context = self.memory_system.get_context_for_query(query)
-            if context:
-                enhanced_prompt += f"\nConversation context: {context}"
-
             # Check user preferences
-            location_pref = self.memory_system.get_preference('location')
+            location_context = ""
+            personal = bool(memory_context)
             if location_pref and 'near me' in query.lower():
-                enhanced_prompt += f"\nUser location preference: {location_pref}"
+                location_context += f"\nUser location preference: {location_pref}"
+                personal = True
 
             if location_info:
-                enhanced_prompt += f"\nLocation context: {location_info['area']}, {location_info['district']}, {location_info['state']}"
-
-            # Get response without thinking process (faster)
-            response = self.get_ai_response(enhanced_prompt, all_context, show_thinking=False)
+                location_context += f"\nLocation context: {location_info['area']}, {location_info['district']}, {location_info['state']}"
 
-            # Translate response if needed (async)
-            current_lang = self.translation_service.current_language
-            if current_lang != 'english':
-                response = self.translation_service.translate_response(response, current_lang)
+            # Split the token budget by priority: location, memory, then search results
+            reserved = self.prompt_budget.reserve(
+                SYSTEM_PROMPT, SEARCH_CONTEXT_TEMPLATE.format(context="", prompt=enhanced_prompt), memory_context)
+            sections = self.prompt_budget.allocate(
+                [('location', location_context), ('search', search_results)], reserved)
+            enhanced_prompt += sections['location']
 
-            # Save to memory (async)
-            self.executor.submit(self.save_to_memory, query, response)
-            self.executor.submit(self.save_knowledge, query, response)
-            self.conversation_context.append(f"Q: {query} A: {response}")
-            return response
+            # Only the question goes into the history - search data is for this turn alone
+            response = await self.aget_ai_response(enhanced_prompt, sections['search'], show_thinking=False,
+                                                   on_token=on_token, session=session, history_prompt=query,
+                                                   query_type=query_type, answer_type='search',
+                                                   memory_context=memory_context)
         else:
-            # Resolve pronouns and add context
-            resolved_query = self.resolve_pronouns(query)
-            context = self.memory_system.get_context_for_query(query)
+            # Earlier turns are real messages in the session, so pronouns resolve naturally;
+            # older ones are recalled from memory for every turn
+            memory_context = await self._amemory_context(query, memory, session)
+            personal = bool(memory_context)
+            response = await self.aget_ai_response(query, show_thinking=False, on_token=on_token,
+                                                   session=session, query_type=query_type,
+                                                   answer_type=self.answer_type(query, search_needed),
+                                                   memory_context=memory_context)
 
-            context_prompt = resolved_query
-            if context:
-                context_prompt = f"Conversation context: {context}\nCurrent question: {resolved_query}"
+        return await self._afinish_response(query, response, query_type, memory=own_memory, shared=shared,
+                                            owner=user if personal else None)
 
-            # Get response without thinking process (faster)
-            response = self.get_ai_response(context_prompt, show_thinking=False)
 
-            # Translate response if needed (async)
-            current_lang = self.translation_service.current_language
-            if current_lang != 'english':
-                response = self.translation_service.translate_response(response, current_lang)
+commands = CommandRegistry()
 
-            # Save to memory (async)
-            self.executor.submit(self.save_to_memory, query, response)
-            self.conversation_context.append(f"Q: {query} A: {response}")
-            return response
+BASIC = "📝 BASIC COMMANDS"
+SEARCH = "🔍 SEARCH & INFO"
+LANGUAGES = "🌍 LANGUAGES"
+STORIES = "📚 STORIES & FUN"
+SMART = "🧠 SMART FEATURES"
+MEMORY = "💾 MEMORY & LEARNING"
 
-def main():
-    ai = TerminalAI()
-    
+QUESTIONS = [
+    "What's your favorite color?",
+    "Which city are you from?",
+    "What's your hobby?",
+    "What's your favorite food?",
+    "What do you like to do in your free time?",
+    "What's your favorite movie?",
+    "What subject interests you most?",
+    "What's your dream destination?"
+]
+
+commands.describe("chat", "Start conversation", BASIC)
+commands.describe("quit", "Exit application", BASIC)
+
+# Heavy subsystems: handlers live in their own modules and are imported on first use
+commands.register("voice test", "voice_commands:voice_test", help="Test voice cloning", section=BASIC)
+commands.register("voice sample", "voice_commands:voice_sample", help="Show voice sample used", section=BASIC)
+commands.register("human effects on", "voice_commands:human_effects_on", usage="human effects on/off",
+                  help="Toggle breathing & pauses", section=BASIC)
+commands.register("human effects off", "voice_commands:human_effects_off", section=BASIC, hidden=True)
+
+
+@commands.command("search", usage="search [query]", help="Web search", section=SEARCH, args=True)
+def search_command(ai, query):
+    print(f"\nSearching: {query}")
+    results = ai.search_web(query)
+
+    # Summarize search results
+    renderer = ai.new_renderer("\nSummary:")
+    summary = ai.runtime.run(ai.aget_ai_response(f"Summarize and explain: {query}", results, on_token=renderer,
+                                                 answer_type='summary'))
+    if renderer and renderer.streamed:
+        renderer.finish()
+    else:
+        print(f"\nSummary:\n{summary}")
+    ai.speak(summary)
+
+
+commands.register("smart search", "assistant_commands:smart_search", usage="smart search [query]",
+                  help="AI-powered search", section=SEARCH, args=True)
+
+
+@commands.command("wiki", usage="wiki [topic]", help="Wikipedia search", section=SEARCH, args=True)
+def wiki_command(ai, query):
+    print(f"\nWikipedia: {query}")
+    result = ai.search_wiki(query)
+
+    # Summarize wiki result
+    renderer = ai.new_renderer("\nExplanation:")
+    summary = ai.runtime.run(ai.aget_ai_response(f"Explain this simply: {query}", result, on_token=renderer,
+                                                 answer_type='summary'))
+    if renderer and renderer.streamed:
+        renderer.finish()
+    else:
+        print(f"\nExplanation:\n{summary}")
+    ai.speak(summary)
+
+
+@commands.command("summarize", usage="summarize [text]", help="Summarize text", section=SEARCH, args=True)
+def summarize_command(ai, text):
+    print("\nSummarizing...")
+    renderer = ai.new_renderer("")
+    summary = ai.summarize(text, on_token=renderer)
+    if renderer and renderer.streamed:
+        renderer.finish()
+    else:
+        print(summary)
+    ai.speak(summary)
+
+
+@commands.command("weather", usage="weather [location]", help="Weather info", section=SEARCH, args=True)
+def weather_command(ai, location):
+    location = location.strip()
+    print(f"\nGetting weather for: {location}")
+
+    # Check if it's a pincode
+    if location.isdigit() and len(location) == 6:
+        weather_data = ai.weather_service.get_weather_by_pincode(location, ai.location_finder)
+    else:
+        weather_data = ai.weather_service.get_weather_by_location(location)
+
+    response = ai.weather_service.format_weather_response(weather_data)
+    print(response)
+
+    # Speak weather info
+    if weather_data:
+        speech_text = f"Weather in {weather_data['location']}: {weather_data['temperature']} degrees, {weather_data['condition']}"
+        ai.speak(speech_text)
+    else:
+        ai.speak("Weather information not available")
+
+
+@commands.command("forecast", usage="forecast [location]", help="Weather forecast", section=SEARCH, args=True)
+def forecast_command(ai, location):
+    location = location.strip()
+    print(f"\nGetting forecast for: {location}")
+
+    forecast = ai.weather_service.get_forecast(location)
+    print(f"\n🌦️ Forecast:\n{forecast}")
+    ai.speak(f"Weather forecast for {location}: {forecast[:100]}")
+
+
+@commands.command("location", usage="location [pincode]", help="Location lookup", section=SEARCH,
+                  args=True, aliases=["pincode"])
+def location_command(ai, args):
+    pincode = args.split()[-1]  # Get last word as pincode
+    print(f"\nFinding location for pincode: {pincode}")
+
+    location_info = ai.location_finder.find_location_by_pincode(pincode)
+    response = ai.location_finder.format_location_response(location_info)
+
+    print(response)
+
+    # Speak location details
+    if location_info:
+        speech_text = f"Location found. {location_info['area']} in {location_info['district']} district, {location_info['state']} state."
+        ai.speak(speech_text)
+    else:
+        ai.speak("Location not found for this pincode")
+
+
+def set_language(ai, lang):
+    lang = lang.strip().lower()
+    if ai.translation_service.set_language(lang):
+        print(f"Language set to {lang.title()}")
+        ai.speak(f"Language changed to {lang}", lang)
+    else:
+        print("Supported languages: English, Hindi, Telugu")
+
+
+commands.register("english", lambda ai, args: set_language(ai, 'english'), usage="english/hindi/telugu",
+                  help="Switch language", section=LANGUAGES)
+commands.register("hindi", lambda ai, args: set_language(ai, 'hindi'), section=LANGUAGES, hidden=True)
+commands.register("telugu", lambda ai, args: set_language(ai, 'telugu'), section=LANGUAGES, hidden=True)
+commands.register("language", set_language, usage="language [name]", help="Switch language by name",
+                  section=LANGUAGES, args=True)
+
+
+@commands.command("languages", help="List supported languages", section=LANGUAGES)
+def languages_command(ai, args):
+    current = ai.translation_service.current_language
+    print(f"\nSupported Languages:")
+    print(f"1. English {'(current)' if current == 'english' else ''}")
+    print(f"2. Hindi {'(current)' if current == 'hindi' else ''}")
+    print(f"3. Telugu {'(current)' if current == 'telugu' else ''}")
+    print(f"\nUsage: Type 'english', 'hindi', or 'telugu' to switch")
+    ai.speak(f"Current language is {current}. You can switch to English, Hindi, or Telugu.")
+
+
+@commands.command("translate", usage="translate [text] to [lang]", help="Translate text", section=LANGUAGES, args=True)
+def translate_command(ai, text_to_translate):
+    parts = text_to_translate.split(' to ')
+    if len(parts) == 2:
+        text, target_lang = parts
+        translation = ai.translation_service.translate_text(text.strip(), target_lang.strip())
+        print(f"\nTranslation: {translation}")
+        ai.speak(translation, target_lang.strip())
+    else:
+        print("Usage: translate [text] to [language]")
+
+
+commands.register("story", "story_commands:story", usage="story [ghost/adventure]", help="Get stories",
+                  section=STORIES, args=True)
+commands.register("random story", "story_commands:random_story", help="Random story", section=STORIES)
+commands.register("search story", "story_commands:search_story", usage="search story [keyword]",
+                  help="Find stories by keyword", section=STORIES, args=None)
+
+
+@commands.command("ask me", usage="ask me a question", help="AI asks you", section=STORIES, args=None,
+                  aliases=["can you ask me"])
+def ask_me_command(ai, args):
+    import random
+    question = random.choice(QUESTIONS)
+
+    print("\nAI:")
+    print(f"Here's a question for you: {question}")
+    ai.speak(f"Here's a question for you: {question}")
+
+    # Wait for user's answer
+    print("\n[Waiting for your answer...]")
+
+
+commands.register("quiz me", ask_me_command, help="Interactive quiz", section=STORIES, args=None)
+
+commands.register("personality mode", "assistant_commands:personality_mode", help="Activate personality", section=SMART)
+commands.register("remind", "assistant_commands:remind", usage="remind [msg] at [time]", help="Set reminders",
+                  section=SMART, args=True)
+commands.register("habit", "assistant_commands:habit", usage="habit [name]", help="Track habits",
+                  section=SMART, args=True)
+commands.register("goal", "assistant_commands:goal", usage="goal [name] [target]", help="Set goals",
+                  section=SMART, args=True)
+commands.register("daily summary", "assistant_commands:daily_summary", help="Progress overview", section=SMART)
+commands.register("suggestions", "assistant_commands:suggestions", help="Get personalized tips", section=SMART)
+
+
+@commands.command("memory", help="View statistics", section=MEMORY)
+def memory_command(ai, args):
+    stats = ai.memory_system.get_memory_stats()
+    print(f"\n📊 Memory Statistics:")
+    print(f"Total conversations: {stats['total_conversations']}")
+    print(f"Topics discussed: {stats['topics_discussed']}")
+    print(f"Preferences learned: {stats['preferences_learned']}")
+    print(f"Most discussed: {stats['most_discussed_topic']}")
+
+
+@commands.command("learn", usage="learn [key] [value]", help="Teach preferences", section=MEMORY, args=True)
+def learn_command(ai, args):
+    # Learn user preferences: "learn location Mumbai"
+    parts = args.split(' ', 1)
+    if len(parts) == 2:
+        key, value = parts
+        ai.memory_system.learn_preference(key, value)
+        print(f"✅ Learned: {key} = {value}")
+        ai.speak(f"I'll remember that your {key} is {value}")
+
+
+@commands.command("correct", usage="correct [answer]", help="Correct the last answer", section=MEMORY, args=True)
+def correct_command(ai, correction):
+    # Learn from corrections: "correct that was wrong, actual answer is..."
+    if ai.conversation_memory:
+        last_response = ai.conversation_memory[-1]['answer']
+        ai.memory_system.add_correction(last_response, correction)
+        print("✅ Thanks for the correction! I'll remember that.")
+        ai.speak("Thanks for the correction, I'll remember that")
+
+
+@commands.command("export", help="Export conversations", section=MEMORY)
+def export_command(ai, args):
+    filename = ai.memory_system.export_conversations()
+    print(f"\n💾 Conversations exported to: {filename}")
+    ai.speak(f"Conversations exported to {filename}")
+
+
+@commands.command("search memory", usage="search memory [term]", help="Search history", section=MEMORY, args=True)
+def search_memory_command(ai, search_term):
+    results = ai.memory_system.search_conversations(search_term)
+    print(f"\n🔍 Found {len(results)} conversations about '{search_term}':")
+    for conv in results[:3]:
+        print(f"- {conv['query'][:60]}...")
+
+
+@commands.command("topic", usage="topic [name]", help="Topic summary", section=MEMORY, args=True)
+def topic_command(ai, topic):
+    summary = ai.memory_system.get_topic_summary(topic)
+    print(f"\n📋 {summary}")
+
+
+@commands.command("clear memory", help="Forget everything", section=MEMORY)
+def clear_memory_command(ai, args):
+    ai.memory_system.clear()
+    ai.conversation_memory = []
+    ai.conversation_context = []
+    ai.session.reset()
+    print("🗑️ All memory cleared.")
+    ai.speak("All memory cleared")
+
+
+@commands.command("status", help="Model load state and startup time", section=BASIC)
+def status_command(ai, args):
+    print(f"\n🤖 Model Status:")
+    try:
+        loaded = ai.runtime.run(ai.model_manager.loaded_models(), timeout=5)
+    except Exception as e:
+        loaded = None
+        print(f"Ollama not reachable: {e}")
+
+    stats = ai.model_manager.stats()
+    for model, state in stats['models'].items():
+        line = f"{model}: {state['state']}"
+        if state['load_seconds'] is not None:
+            line += f" (warm-up took {state['load_seconds']:.1f}s)"
+        if state['error']:
+            line += f" - {state['error']}"
+        if loaded is not None:
+            # Ollama reports tagged names
+            entry = loaded.get(model) or loaded.get(f"{model}:latest")
+            line += f", in memory until {entry['expires_at']}" if entry else ", not in memory"
+        print(line)
+
+    print(f"Keep-alive pings: {stats['pings']}, idle for {stats['idle_seconds']:.0f}s")
+
+    print(f"\n⚡ Model Tiers:")
+    for tier, metrics in ai.router.stats().items():
+        line = f"{tier} ({metrics['model']}): {metrics['calls']} calls"
+        if metrics['p50_seconds'] is not None:
+            line += f", p50 {metrics['p50_seconds']:.2f}s, p95 {metrics['p95_seconds']:.2f}s"
+        if metrics['decode_tokens_per_second']:
+            line += f", {metrics['completion_tokens']} tokens at {metrics['decode_tokens_per_second']:.0f} tok/s"
+        if metrics['disabled']:
+            line += f" - disabled: {metrics['disabled']}"
+        print(line)
+
+    print(f"\n✂️ Answer Lengths:")
+    for answer_type, metrics in ai.router.answer_stats().items():
+        limit = performance_config.GENERATION_LIMITS.get(answer_type, {}).get('num_predict')
+        print(f"{answer_type}: {metrics['calls']} calls, avg {metrics['avg_completion_tokens']:.0f}/{limit} tokens, "
+              f"avg decode {metrics['avg_decode_seconds']:.2f}s, {metrics['length_stops']} stopped at the limit")
+    if ai.time_to_first_prompt is not None:
+        print(f"Time to first prompt: {ai.time_to_first_prompt:.2f}s")
+    print(f"Subsystems loaded: {', '.join(ai.loaded_subsystems()) or 'none'}")
+
+
+@commands.command("cache stats", help="Cache hit/miss counters", section=MEMORY)
+def cache_stats_command(ai, args):
+    print("\n📦 Cache Statistics:")
+    for stats in ai.cache_stats():
+        limit = f"/{stats['max_entries']}" if stats['max_entries'] else ""
+        print(f"{stats['name']}: {stats['entries']}{limit} entries, "
+              f"hit rate {stats['hit_rate']:.0%} ({stats['hits']} hits, {stats['misses']} misses), "
+              f"{stats['evictions']} evicted, {stats['expirations']} expired")
+    for stats in ai.coalescing_stats():
+        print(f"{stats['name']} in flight: {stats['calls']} calls, {stats['executed']} executed, "
+              f"{stats['coalesced']} coalesced")
+    session = ai.session.stats()
+    print(f"chat session: {session['turns']} turns, {session['history_tokens']}/{session['max_tokens']} "
+          f"history tokens, {session['rolls']} rolled into summary")
+    budget = ai.prompt_budget.stats()
+    print(f"prompt budget: last prompt {budget['last_prompt_tokens']}/{budget['limit']} tokens, "
+          f"{budget['truncations']} sections truncated, {budget['tokens_per_piece']} tokens/word "
+          f"({budget['calibration_samples']} calibration samples)")
+
+
+def print_help(headless=False):
+    """Print the command overview generated from the registry"""
     print("🤖 Advanced AI Assistant System")
     print("=" * 50)
-    
-    print("\n📝 BASIC COMMANDS:")
-    print("  chat                    - Start conversation")
-    print("  quit                    - Exit application")
-    print("  voice test              - Test voice cloning")
-    print("  voice sample            - Show voice sample used")
-    print("  human effects on/off    - Toggle breathing & pauses")
-    
-    print("\n🔍 SEARCH & INFO:")
-    print("  search [query]          - Web search")
-    print("  smart search [query]    - AI-powered search")
-    print("  wiki [topic]            - Wikipedia search")
-    print("  weather [location]      - Weather info")
-    print("  location [pincode]      - Location lookup")
-    
-    print("\n🌍 LANGUAGES:")
-    print("  english/hindi/telugu    - Switch language")
-    print("  translate [text] to [lang] - Translate text")
-    
-    print("\n📚 STORIES & FUN:")
-    print("  story [ghost/adventure] - Get stories")
-    print("  random story            - Random story")
-    print("  ask me a question       - AI asks you")
-    print("  quiz me                 - Interactive quiz")
-    
-    print("\n🧠 SMART FEATURES:")
-    print("  personality mode        - Activate personality")
-    print("  remind [msg] at [time]  - Set reminders")
-    print("  habit [name]            - Track habits")
-    print("  goal [name] [target]    - Set goals")
-    print("  daily summary           - Progress overview")
-    print("  suggestions             - Get personalized tips")
-    
-    print("\n💾 MEMORY & LEARNING:")
-    print("  memory                  - View statistics")
-    print("  learn [key] [value]     - Teach preferences")
-    print("  export                  - Export conversations")
-    print("  search memory [term]    - Search history")
-    
+
+    for line in commands.help_lines():
+        print(line)
+
     print("\n" + "=" * 50)
-    
-    print("🧠 Consciousness: Active | 🤖 Personality: Ready | 🎤 Voice Clone Active")
+
+    voice_status = "🔇 Headless (no audio)" if headless else "🎤 Voice Clone Active"
+    print(f"🧠 Consciousness: Active | 🤖 Personality: Ready | {voice_status}")
     print("\nType any command or just start chatting! 💬")
-    
+
+
+def handle_command(ai, user_input):
+    """Run a built-in command, returns False if the input is a chat message"""
+    return commands.dispatch(ai, user_input)
+
+
+async def chat_turn(ai, user_input):
+    """Answer a chat message"""
+    # Stream tokens to the terminal as they are generated
+    renderer = ai.new_renderer()
+
+    # Detect input language and translate if needed (on a worker thread, like the search)
+    translator = await ai._asubsystem('translation_service')
+    input_lang = await asyncio.to_thread(translator.detect_language, user_input)
+    if input_lang != 'english':
+        translated_input = await asyncio.to_thread(translator.translate_text, user_input, 'english')
+        print(f"Translated: {translated_input}")
+        response = await ai.asmart_response(translated_input, on_token=renderer)
+    else:
+        response = await ai.asmart_response(user_input, on_token=renderer)
+
+    # Display in English, but speak in selected language
+    current_lang = translator.current_language
+
+    if renderer and renderer.streamed:
+        renderer.finish()  # Already displayed token by token
+    else:
+        print("\nAI:")
+        print(response)  # Always display in English
+
+    if current_lang != 'english':
+        print(f"[Speaking in {current_lang}]")
+
+    ai.speak(response)  # This will handle translation for voice only
+
+    # Manual health check command
+    if user_input.lower() == 'health':
+        health_status = ai.healer.monitor_and_heal()
+        status_msg = "System healthy" if health_status else "Issues detected and fixed"
+        print(status_msg)
+        ai.speak(status_msg)
+
+
+async def repl(ai):
+    """Async prompt loop - you can type ahead while an answer streams or is spoken"""
+    loop = asyncio.get_running_loop()
+    lines = asyncio.Queue()
+    # Dedicated threads so a blocked input() or a slow command never starves the search pool
+    input_executor = ThreadPoolExecutor(max_workers=1)
+    command_executor = ThreadPoolExecutor(max_workers=1)
+
+    async def read_input():
+        while True:
+            try:
+                line = await loop.run_in_executor(input_executor, input)
+            except EOFError:
+                line = 'quit'
+            await lines.put(line.strip())
+            if line.strip().lower() == 'quit':
+                return
+
+    reader = asyncio.create_task(read_input())
+
+    ai.mark_first_prompt()
+    print(f"⚡ Ready in {ai.time_to_first_prompt:.2f}s")
+
     while True:
-        try:
-            user_input = input("\n> ").strip()
-            
-            if user_input.lower() == 'quit':
-                print("Goodbye!")
-                break
-                
-            elif user_input.lower() == 'voice test':
-                ai.voice.test_voice()
-                
-            elif user_input.lower() == 'voice sample':
-                if ai.voice.sample_voice:
-                    print(f"Voice sample: {os.path.basename(ai.voice.sample_voice)}")
-                else:
-                    print("No voice sample found")
-                    
-            elif user_input.lower() == 'human effects on':
-                ai.voice.human_effects = True
-                print("🎤 Human voice effects enabled (breathing, pauses, throat clearing)")
-                
-            elif user_input.lower() == 'human effects off':
-                ai.voice.human_effects = False
-                print("🎤 Human voice effects disabled (clean speech only)")
-            
+        # Only show the prompt when nothing typed ahead is waiting
+        if lines.empty():
+            print("\n> ", end="", flush=True)
+        user_input = await lines.get()
 
-                    
-            elif user_input.lower().startswith('language ') or user_input.lower() in ['telugu', 'hindi', 'english']:
-                if user_input.lower() in ['telugu', 'hindi', 'english']:
-                    lang = user_input.lower()
-                else:
-                    lang = user_input[9:].strip().lower()
-                    
-                if ai.translation_service.set_language(lang):
-                    print(f"Language set to {lang.title()}")
-                    ai.speak(f"Language changed to {lang}", lang)
-                else:
-                    print("Supported languages: English, Hindi, Telugu")
-                    
-            elif user_input.lower() == 'languages':
-                current = ai.translation_service.current_language
-                print(f"\nSupported Languages:")
-                print(f"1. English {'(current)' if current == 'english' else ''}")
-                print(f"2. Hindi {'(current)' if current == 'hindi' else ''}")
-                print(f"3. Telugu {'(current)' if current == 'telugu' else ''}")
-                print(f"\nUsage: Type 'english', 'hindi', or 'telugu' to switch")
-                ai.speak(f"Current language is {current}. You can switch to English, Hindi, or Telugu.")
-                    
-            elif user_input.lower().startswith('translate '):
-                text_to_translate = user_input[10:]
-                parts = text_to_translate.split(' to ')
-                if len(parts) == 2:
-                    text, target_lang = parts
-                    translation = ai.translation_service.translate_text(text.strip(), target_lang.strip())
-                    print(f"\nTranslation: {translation}")
-                    ai.speak(translation, target_lang.strip())
-                else:
-                    print("Usage: translate [text] to [language]")
-                    
-            elif user_input.lower() == 'memory':
-                stats = ai.memory_system.get_memory_stats()
-                print(f"\n📊 Memory Statistics:")
-                print(f"Total conversations: {stats['total_conversations']}")
-                print(f"Topics discussed: {stats['topics_discussed']}")
-                print(f"Preferences learned: {stats['preferences_learned']}")
-                print(f"Most discussed: {stats['most_discussed_topic']}")
-                
-            elif user_input.lower().startswith('search memory '):
-                search_term = user_input[14:]
-                results = ai.memory_system.search_conversations(search_term)
-                print(f"\n🔍 Found {len(results)} conversations about '{search_term}':")
-                for conv in results[-3:]:
-                    print(f"- {conv['query'][:60]}...")
-                    
-            elif user_input.lower().startswith('topic '):
-                topic = user_input[6:]
-                summary = ai.memory_system.get_topic_summary(topic)
-                print(f"\n📋 {summary}")
-                
-            elif user_input.lower() == 'export':
-                filename = ai.memory_system.export_conversations()
-                print(f"\n💾 Conversations exported to: {filename}")
-                ai.speak(f"Conversations exported to {filename}")
-                
-            elif user_input.lower().startswith('learn '):
-                # Learn user preferences: "learn location Mumbai"
-                parts = user_input[6:].split(' ', 1)
-                if len(parts) == 2:
-                    key, value = parts
-                    ai.memory_system.learn_preference(key, value)
-                    print(f"✅ Learned: {key} = {value}")
-                    ai.speak(f"I'll remember that your {key} is {value}")
-                    
-            elif user_input.lower().startswith('correct '):
-                # Learn from corrections: "correct that was wrong, actual answer is..."
-                correction = user_input[8:]
-                if ai.conversation_memory:
-                    last_response = ai.conversation_memory[-1]['answer']
-                    ai.memory_system.add_correction(last_response, correction)
-                    print("✅ Thanks for the correction! I'll remember that.")
-                    ai.speak("Thanks for the correction, I'll remember that")
-                    
-            elif user_input.lower() == 'clear memory':
-                ai.memory_system = AdvancedMemorySystem()  # Reset
-                ai.conversation_memory = []
-                ai.conversation_context = []
-                print("🗑️ All memory cleared.")
-                ai.speak("All memory cleared")
-                
-            elif user_input.lower().startswith('search '):
-                query = user_input[7:]
-                print(f"\nSearching: {query}")
-                results = ai.search_web(query)
-                
-                # Summarize search results
-                summary = ai.get_ai_response(f"Summarize and explain: {query}", results[:500])
-                print(f"\nSummary:\n{summary}")
-                ai.speak(summary)
-                    
-            elif user_input.lower().startswith('wiki '):
-                query = user_input[5:]
-                print(f"\nWikipedia: {query}")
-                result = ai.search_wiki(query)
-                
-                # Summarize wiki result
-                summary = ai.get_ai_response(f"Explain this simply: {query}", result)
-                print(f"\nExplanation:\n{summary}")
-                ai.speak(summary)
-                    
-            elif user_input.lower().startswith('summarize '):
-                text = user_input[10:]
-                print("\nSummarizing...")
-                summary = ai.summarize(text)
-                print(summary)
-                ai.speak(summary)
-                
-            elif user_input.lower().startswith('weather '):
-                location = user_input[8:].strip()
-                print(f"\nGetting weather for: {location}")
-                
-                # Check if it's a pincode
-                if location.isdigit() and len(location) == 6:
-                    weather_data = ai.weather_service.get_weather_by_pincode(location, ai.location_finder)
-                else:
-                    weather_data = ai.weather_service.get_weather_by_location(location)
-                
-                response = ai.weather_service.format_weather_response(weather_data)
-                print(response)
-                
-                # Speak weather info
-                if weather_data:
-                    speech_text = f"Weather in {weather_data['location']}: {weather_data['temperature']} degrees, {weather_data['condition']}"
-                    ai.speak(speech_text)
-                else:
-                    ai.speak("Weather information not available")
-                    
-            elif user_input.lower().startswith('forecast '):
-                location = user_input[9:].strip()
-                print(f"\nGetting forecast for: {location}")
-                
-                forecast = ai.weather_service.get_forecast(location)
-                print(f"\n🌦️ Forecast:\n{forecast}")
-                ai.speak(f"Weather forecast for {location}: {forecast[:100]}")
-                
-            elif user_input.lower().startswith('location ') or user_input.lower().startswith('pincode '):
-                pincode = user_input.split()[-1]  # Get last word as pincode
-                print(f"\nFinding location for pincode: {pincode}")
-                
-                location_info = ai.location_finder.find_location_by_pincode(pincode)
-                response = ai.location_finder.format_location_response(location_info)
-                
-                print(response)
-                
-                # Speak location details
-                if location_info:
-                    speech_text = f"Location found. {location_info['area']} in {location_info['district']} district, {location_info['state']} state."
-                    ai.speak(speech_text)
-                else:
-                    ai.speak("Location not found for this pincode")
-                    
-            elif 'ask me' in user_input.lower() or 'quiz me' in user_input.lower():
-                # AI asks user a question
-                questions = [
-                    "What's your favorite color?",
-                    "Which city are you from?",
-                    "What's your hobby?",
-                    "What's your favorite food?",
-                    "What do you like to do in your free time?",
-                    "What's your favorite movie?",
-                    "What subject interests you most?",
-                    "What's your dream destination?"
-                ]
-                
-                import random
-                question = random.choice(questions)
-                
-                print("\nAI:")
-                print(f"Here's a question for you: {question}")
-                ai.speak(f"Here's a question for you: {question}")
-                
-                # Wait for user's answer
-                print("\n[Waiting for your answer...]")
-                
-            elif user_input.lower().startswith('story '):
-                story_type = user_input[6:].strip()
-                print(f"\nFinding {story_type} stories...")
-                
-                stories = ai.story_finder.search_stories(story_type)
-                if stories:
-                    story = stories[0]  # Get first story
-                    formatted_story = ai.story_finder.format_story(story)
-                    print(f"\n{formatted_story}")
-                    
-                    # Speak story title and beginning
-                    speech_text = f"Here's a {story_type} story: {story['title']}. {story['content'][:100]}..."
-                    ai.speak(speech_text)
-                else:
-                    print(f"No {story_type} stories found.")
-                    ai.speak(f"No {story_type} stories found")
-                    
-            elif user_input.lower() == 'random story':
-                print("\nFinding a random story...")
-                story = ai.story_finder.get_random_story()
-                
-                if story:
-                    formatted_story = ai.story_finder.format_story(story)
-                    print(f"\n{formatted_story}")
-                    
-                    speech_text = f"Here's a random story: {story['title']}. {story['content'][:100]}..."
-                    ai.speak(speech_text)
-                else:
-                    print("No stories available.")
-                    ai.speak("No stories available")
-                    
-            elif user_input.lower() == 'search story' or user_input.lower().startswith('search story '):
-                if user_input.lower() == 'search story':
-                    # Show all available stories
-                    print("\nAvailable story types:")
-                    print("- ghost/horror - Scary and supernatural stories")
-                    print("- adventure - Action and exploration stories")
-                    print("- romance - Love and relationship stories")
-                    print("- general - Sci-fi and fantasy stories")
-                    print("\nTry: 'story ghost' or 'random story'")
-                    ai.speak("I have ghost stories, adventure stories, romance stories, and general stories available")
-                else:
-                    keyword = user_input[13:].strip()
-                    print(f"\nSearching stories with keyword: {keyword}")
-                    
-                    stories = ai.story_finder.search_by_keyword(keyword)
-                    if stories:
-                        print(f"\nFound {len(stories)} stories:")
-                        for i, story in enumerate(stories, 1):
-                            print(f"\n{i}. {story['title']} ({story['source']})")
-                            print(f"   {story['content'][:100]}...")
-                        
-                        ai.speak(f"Found {len(stories)} stories matching {keyword}")
-                    else:
-                        print(f"No stories found with keyword: {keyword}")
-                        ai.speak(f"No stories found with keyword {keyword}")
-                        
-
-                    
-            else:
-                # Handle language commands first
-                if user_input.lower() in ['telugu', 'hindi', 'english', 'languages']:
-                    continue  # Already handled above
-                
-                # Detect input language and translate if needed
-                input_lang = ai.translation_service.detect_language(user_input)
-                if input_lang != 'english':
-                    translated_input = ai.translation_service.translate_text(user_input, 'english')
-                    print(f"Translated: {translated_input}")
-                    response = ai.smart_response(translated_input)
-                else:
-                    response = ai.smart_response(user_input)
-                
-                # Display in English, but speak in selected language
-                current_lang = ai.translation_service.current_language
-                
-                print("\nAI:")
-                print(response)  # Always display in English
-                
-                if current_lang != 'english':
-                    print(f"[Speaking in {current_lang}]")
-                
-                ai.speak(response)  # This will handle translation for voice only
-                
-                # Manual health check command
-                if user_input.lower() == 'health':
-                    health_status = ai.healer.monitor_and_heal()
-                    status_msg = "System healthy" if health_status else "Issues detected and fixed"
-                    print(status_msg)
-                    ai.speak(status_msg)
-                    
-        except KeyboardInterrupt:
-            print("\nGoodbye!")
+        if user_input.lower() == 'quit':
+            print("Goodbye!")
             break
+
+        if not user_input:
+            continue
+        ai.model_manager.touch()
+
+        try:
+            # Commands are synchronous, so they run off the event loop
+            handled = await loop.run_in_executor(command_executor, handle_command, ai, user_input)
+            if not handled:
+                await chat_turn(ai, user_input)
         except Exception as e:
             print(f"Error: {e}")
 
+    reader.cancel()
+    input_executor.shutdown(wait=False)
+    command_executor.shutdown(wait=False)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Terminal AI assistant")
+    parser.add_argument('--headless', '--no-audio', dest='headless', action='store_true',
+                        help="run without speech, never loads the audio stack")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="report import and constructor costs, write them as JSON and exit")
+    parser.add_argument('--user', help="keep memory in this user's own namespace")
+    return parser.parse_args(argv)
+
+
+def profile_startup(headless=False):
+    """Print where startup time goes and save it for regression tracking"""
+    from startup_profiler import StartupProfiler
+
+    profiler = StartupProfiler(headless)
+    # Subsystem modules are imported lazily, and ollama on the first model call
+    modules = ['terminal_ai', 'ollama'] + [module_name for name, (module_name, _) in SUBSYSTEMS.items()
+                                           if not (headless and name in AUDIO_SUBSYSTEMS)]
+    profiler.profile_imports(modules)
+    ai = profiler.profile_terminal_ai(TerminalAI, SUBSYSTEMS, AUDIO_SUBSYSTEMS)
+    profiler.report()
+    print(f"\n📄 Startup profile written to {profiler.save()}")
+    if ai:
+        ai.runtime.stop()
+
+
+def main():
+    args = parse_args()
+    if args.profile_startup:
+        profile_startup(args.headless)
+        return
+
+    ai = TerminalAI(headless=args.headless or None, user=args.user)
+    ai.warm_up()
+    ai.start_memory_digests()
+    print_help(ai.headless)
+
+    try:
+        ai.runtime.run(repl(ai))
+    except KeyboardInterrupt:
+        print("\nGoodbye!")
+    finally:
+        # Pending memory and knowledge writes reach disk on quit and Ctrl+C
+        ai.shutdown()
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,185 @@
+"""
+Test Suite for the Async Runtime
+Checks the background event loop runs and schedules coroutines, refuses blocking calls
+from its own thread, and that streamed chat turns and async searches give the same
+results as the sync wrappers
+"""
+
+import asyncio
+import inspect
+import io
+import threading
+from contextlib import redirect_stdout
+
+import pytest
+
+from conftest import FakeSearchEngine, headless_ai
+from async_runtime import AsyncRuntime
+
+try:
+    import search_engine
+except ImportError:  # The search libraries are not installed
+    search_engine = None
+
+def test_run_and_submit():
+    """Test run() blocks for a result, submit() returns a future and stop() ends the thread"""
+    print("\n" + "="*60)
+    print("TEST 1: Run, Submit and Stop")
+    print("="*60)
+
+    runtime = AsyncRuntime()
+
+    async def double(value):
+        await asyncio.sleep(0.01)
+        return value * 2
+
+    async def fail():
+        raise ValueError("bad input")
+
+    assert runtime.run(double(21)) == 42
+    with pytest.raises(ValueError):
+        runtime.run(fail())
+
+    futures = [runtime.submit(double(i)) for i in range(5)]
+    assert [future.result(timeout=5) for future in futures] == [0, 2, 4, 6, 8]
+    assert not runtime.in_loop_thread()
+    assert runtime.run(asyncio.to_thread(runtime.in_loop_thread)) is False
+
+    # Coroutines still pending when the loop stops are cancelled, and the loop is closed
+    pending = runtime.submit(asyncio.sleep(3600))
+    runtime.stop()
+    assert not runtime.thread.is_alive() and runtime.loop.is_closed()
+    assert pending.cancelled()
+    print("✅ Run, Submit and Stop Test PASSED")
+
+def test_run_from_loop_thread():
+    """Test a blocking run() from the loop's own thread raises instead of deadlocking"""
+    print("\n" + "="*60)
+    print("TEST 2: No Blocking Calls on the Loop")
+    print("="*60)
+
+    runtime = AsyncRuntime()
+
+    async def inner():
+        return "never"
+
+    async def outer():
+        assert runtime.in_loop_thread()
+        coro = inner()
+        try:
+            runtime.run(coro)
+        except RuntimeError as e:
+            # The refused coroutine is closed, not left un-awaited
+            return str(e), inspect.getcoroutinestate(coro)
+        return None, None
+
+    message, state = runtime.run(outer(), timeout=5)
+    assert "event loop thread" in message and state == inspect.CORO_CLOSED
+    runtime.stop()
+    print("✅ No Blocking Calls Test PASSED")
+
+class FakeTranslator:
+    """Translation service for English input, without the network"""
+    current_language = 'english'
+
+    def detect_language(self, text):
+        return 'english'
+
+def run_turns(stream):
+    """Two turns on a fresh headless TerminalAI: (answers, shown text, model calls, session turns)
+
+    Each run gets its own directory - memory is built lazily, so two instances open at
+    once would share the files of whichever directory is current.
+    """
+    from terminal_ai import chat_turn
+
+    with headless_ai() as (ai, _):
+        tokens = []
+        answers = [ai.smart_response("tell me a joke", on_token=tokens.append if stream else None)]
+        shown = ["".join(tokens)]
+        if stream:
+            # A full terminal turn streams its answer token by token
+            ai.stream_responses = True
+            ai.__dict__['translation_service'] = FakeTranslator()
+            output = io.StringIO()
+            with redirect_stdout(output):
+                ai.runtime.run(chat_turn(ai, "another one"))
+            answers.append(ai.session.turns[-1][1] if ai.session.turns else None)
+            shown.append(output.getvalue())
+        else:
+            answers.append(ai.smart_response("another one"))
+        return answers, shown, ai.ollama_client.calls, list(ai.session.turns)
+
+def test_streamed_turn_matches_sync():
+    """Test a streamed chat turn shows and returns what the sync path returns"""
+    print("\n" + "="*60)
+    print("TEST 3: Streamed and Sync Turns Agree")
+    print("="*60)
+
+    answers, shown, calls, turns = run_turns(stream=True)
+    sync_answers, _, sync_calls, sync_turns = run_turns(stream=False)
+    assert answers == sync_answers == ["answer 1", "answer 2"]
+    assert shown == ["answer 1", "\nAI:\nanswer 2\n"]
+    assert calls == sync_calls and turns == sync_turns
+    print("✅ Streamed Turn Test PASSED")
+
+def test_search_web_matches_sync():
+    """Test search_web and asearch_web return the same (cached) result"""
+    print("\n" + "="*60)
+    print("TEST 4: Sync and Async search_web Agree")
+    print("="*60)
+
+    with headless_ai() as (ai, _):
+        ai.__dict__['search_engine'] = engine = FakeSearchEngine()
+        query = "Context: earlier | Current question: weather in Pune"
+        assert ai.search_web(query) == "results for weather in Pune"
+        assert ai.runtime.run(ai.asearch_web(query)) == "results for weather in Pune"
+        assert engine.calls == ["weather in Pune"]  # The second call came from the cache
+
+        async def twice():
+            return await asyncio.gather(ai.asearch_web("gold price"), ai.asearch_web("gold price"))
+
+        assert ai.runtime.run(twice()) == ["results for gold price"] * 2
+        assert engine.calls.count("gold price") == 1
+    print("✅ search_web Test PASSED")
+
+def test_engine_async_matches_sync():
+    """Test MultiSearchEngine's async search combines the same results, querying sources concurrently"""
+    print("\n" + "="*60)
+    print("TEST 5: Sync and Async Engine Search Agree")
+    print("="*60)
+
+    if search_engine is None:
+        pytest.skip("search engine requires the search libraries")
+
+    engine = search_engine.MultiSearchEngine()
+    engine.sources = {source: (lambda query, source=source: f"{source} says {query}")
+                      for source in ('web', 'news', 'wiki')}
+    for query in ("population of Pune", "what is photosynthesis", "latest news today"):
+        assert asyncio.run(engine.asmart_search(query)) == engine.smart_search(query)
+    sources = ['web', 'news', 'wiki', 'unknown']
+    assert asyncio.run(engine.asearch("rain", sources)) == engine.search("rain", sources)
+
+    # Every source waits for the others, so this only finishes if they run at the same time
+    barrier = threading.Barrier(3, timeout=5)
+
+    def together(query):
+        barrier.wait()
+        return query
+
+    engine.sources = {'web': together, 'news': together, 'wiki': together}
+    assert asyncio.run(engine.asearch("rain", ['web', 'news', 'wiki']))
+    print("✅ Engine Search Test PASSED")
+
+def run_all_tests():
+    """Run all tests"""
+    test_run_and_submit()
+    test_run_from_loop_thread()
+    test_streamed_turn_matches_sync()
+    test_search_web_matches_sync()
+    if search_engine is not None:
+        test_engine_async_matches_sync()
+    print("\n✅ ALL ASYNC RUNTIME TESTS COMPLETED SUCCESSFULLY!")
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,113 @@
+"""
+Test Suite for the Cache Engine
+Checks TTL expiry, LRU eviction and the hit/miss counters
+"""
+
+import os
+import tempfile
+import time
+from cache_engine import LRUCache
+from response_cache import PersistentResponseCache, fingerprint
+
+def test_hits_and_misses():
+    """Test basic get/set and counters"""
+    print("\n" + "="*60)
+    print("TEST 1: Hits and Misses")
+    print("="*60)
+
+    cache = LRUCache(max_entries=10, ttl=60, max_bytes=0)
+    cache.set("python", "A programming language")
+
+    assert cache.get("python") == "A programming language"
+    assert cache.get("java") is None
+
+    stats = cache.stats()
+    print(f"📊 Hits: {stats['hits']}, Misses: {stats['misses']}")
+    assert stats['hits'] == 1 and stats['misses'] == 1
+    print("✅ Hit/Miss Test PASSED")
+
+def test_lru_eviction():
+    """Test least recently used entries are evicted first"""
+    print("\n" + "="*60)
+    print("TEST 2: LRU Eviction")
+    print("="*60)
+
+    cache = LRUCache(max_entries=2, ttl=60, max_bytes=0)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now least recently used
+    cache.set("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()['evictions'] == 1
+    print("✅ LRU Eviction Test PASSED")
+
+def test_byte_budget():
+    """Test the byte budget evicts large entries"""
+    print("\n" + "="*60)
+    print("TEST 3: Byte Budget")
+    print("="*60)
+
+    cache = LRUCache(max_entries=100, ttl=60, max_bytes=2000)
+    for i in range(10):
+        cache.set(f"key{i}", "x" * 500)
+
+    stats = cache.stats()
+    print(f"📊 Entries: {stats['entries']}, Bytes: {stats['bytes']}")
+    assert stats['bytes'] <= 2000
+    assert stats['evictions'] > 0
+    print("✅ Byte Budget Test PASSED")
+
+def test_ttl_expiry():
+    """Test entries expire after their TTL"""
+    print("\n" + "="*60)
+    print("TEST 4: TTL Expiry")
+    print("="*60)
+
+    cache = LRUCache(max_entries=10, ttl=0.05, max_bytes=0)
+    cache.set("weather", "Sunny")
+    cache.set("news", "Headline", ttl=60)
+    time.sleep(0.1)
+
+    assert cache.get("weather") is None
+    assert cache.get("news") == "Headline"
+    assert cache.stats()['expirations'] == 1
+    print("✅ TTL Expiry Test PASSED")
+
+def test_persistent_cache():
+    """Test the on-disk response cache survives a restart"""
+    print("\n" + "="*60)
+    print("TEST 5: Persistent Response Cache")
+    print("="*60)
+
+    prefix = "Using ONLY the latest search results provided, give current 2025 information about: " * 2
+    key1 = fingerprint("llama3.2", "system", prefix + "crime rate in Pune")
+    key2 = fingerprint("llama3.2", "system", prefix + "crime rate in Delhi")
+    assert key1 != key2  # Long shared prefixes must not collide
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = os.path.join(tmp, "cache.db")
+        cache = PersistentResponseCache(db_file, ttl=60)
+        cache.set(key1, "Pune answer")
+        cache.close()
+
+        # Reopen as if the assistant restarted
+        cache = PersistentResponseCache(db_file, ttl=60)
+        assert cache.get(key1) == "Pune answer"
+        assert cache.get(key2) is None
+        cache.close()
+
+    print("✅ Persistent Cache Test PASSED")
+
+def run_all_tests():
+    """Run all tests"""
+    test_hits_and_misses()
+    test_lru_eviction()
+    test_byte_budget()
+    test_ttl_expiry()
+    test_persistent_cache()
+    print("\n✅ ALL CACHE TESTS COMPLETED SUCCESSFULLY!")
+
+if __name__ == "__main__":
+    run_all_tests()
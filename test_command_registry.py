@@ -0,0 +1,82 @@
+"""
+Test Suite for the Command Registry
+Checks trie dispatch, argument handling, lazy handlers and the generated help
+"""
+
+import sys
+from command_registry import CommandRegistry
+
+def build_registry(calls):
+    commands = CommandRegistry()
+
+    @commands.command("search", usage="search [query]", help="Web search", section="Search", args=True)
+    def search(ai, query):
+        calls.append(("search", query))
+
+    @commands.command("search memory", usage="search memory [term]", help="Search history", section="Memory", args=True)
+    def search_memory(ai, term):
+        calls.append(("search memory", term))
+
+    @commands.command("search story", help="Find stories", section="Stories", args=None)
+    def search_story(ai, keyword):
+        calls.append(("search story", keyword))
+
+    @commands.command("memory", help="View statistics", section="Memory", aliases=["stats"])
+    def memory(ai, args):
+        calls.append(("memory", args))
+
+    return commands
+
+def test_dispatch():
+    """Test the longest matching command wins and chat falls through"""
+    print("\n" + "="*60)
+    print("TEST 1: Trie Dispatch")
+    print("="*60)
+
+    calls = []
+    commands = build_registry(calls)
+
+    assert commands.dispatch(None, "search Latest AI News")
+    assert commands.dispatch(None, "search memory python")
+    assert commands.dispatch(None, "Search Story")
+    assert commands.dispatch(None, "search story ghost")
+    assert commands.dispatch(None, "stats")
+    assert calls == [("search", "Latest AI News"), ("search memory", "python"),
+                     ("search story", ""), ("search story", "ghost"), ("memory", "")]
+
+    # Exact commands don't take text, argument commands need it
+    assert not commands.dispatch(None, "memory please")
+    assert not commands.dispatch(None, "search")
+    assert not commands.dispatch(None, "hello, how are you?")
+    print("✅ Trie Dispatch Test PASSED")
+
+def test_lazy_handlers_and_help():
+    """Test "module:function" handlers import on first use and help skips aliases"""
+    print("\n" + "="*60)
+    print("TEST 2: Lazy Handlers and Help")
+    print("="*60)
+
+    commands = build_registry([])
+    lazy = commands.register("hsv", "colorsys:rgb_to_hsv", help="Lazy handler", section="Search")
+
+    command, args = commands.lookup("hsv")
+    assert command is lazy and not lazy.resolved
+    assert "colorsys" not in sys.modules
+    assert lazy.handler(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+    assert lazy.resolved and "colorsys" in sys.modules
+
+    help_text = "\n".join(commands.help_lines())
+    assert help_text.index("Search:") < help_text.index("Memory:") < help_text.index("Stories:")
+    assert "search memory [term]" in help_text
+    assert "stats" not in help_text
+    print(help_text)
+    print("✅ Lazy Handlers and Help Test PASSED")
+
+def run_all_tests():
+    """Run all tests"""
+    test_dispatch()
+    test_lazy_handlers_and_help()
+    print("\n✅ ALL COMMAND REGISTRY TESTS COMPLETED SUCCESSFULLY!")
+
+if __name__ == "__main__":
+    run_all_tests()
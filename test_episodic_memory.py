@@ -0,0 +1,164 @@
+"""
+Test Suite for Episodic Memory
+Checks background embedding, cosine top-k over the memory-mapped vectors, the ring
+buffer, reopening from disk, blending recalled turns into the memory context and sending that
+context with every chat turn
+"""
+
+import os
+import re
+import tempfile
+import zlib
+
+import pytest
+
+from conftest import headless_ai
+from episodic_memory import EpisodicMemory, np
+from memory_storage import JSONMemoryStorage
+from memory_system import AdvancedMemorySystem
+
+# numpy is optional - without it episodic memory stays disabled
+pytestmark = pytest.mark.skipif(np is None, reason="episodic memory requires numpy")
+
+def bag_of_words(text, dim=512):
+    """Deterministic stand-in for an embedding model"""
+    vector = [0.0] * dim
+    for word in re.findall(r"\w+", text.lower()):
+        vector[zlib.crc32(word.encode()) % dim] += 1.0
+    return vector
+
+def test_search():
+    """Test embeddings are stored in the background and searched by cosine similarity"""
+    print("\n" + "="*60)
+    print("TEST 1: Top-k Cosine Search")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "vectors.f32")
+        memory = EpisodicMemory(path, capacity=4, embed_fn=bag_of_words)
+        memory.add(1, "my dog is called bruno")
+        memory.add(2, "capital of france is paris")
+        memory.add(3, "bruno the dog likes walks")
+        memory.wait()
+
+        results = memory.search("my dog bruno", 2)
+        assert [conversation_id for conversation_id, _ in results] == [1, 3]
+        assert results[0][1] > results[1][1] > 0
+
+        # Ring buffer: the fifth vector overwrites the first
+        memory.add(4, "weather in delhi")
+        memory.add(5, "paris museums")
+        memory.wait()
+        assert len(memory) == 4
+        assert 1 not in [conversation_id for conversation_id, _ in memory.search("dog bruno", 4)]
+        memory.close()
+
+        reopened = EpisodicMemory(path, capacity=4, embed_fn=bag_of_words)
+        assert reopened.search("paris", 1)[0][0] in (2, 5) and len(reopened) == 4
+        reopened.clear()
+        assert reopened.search("paris", 1) == []
+        reopened.close()
+    print("✅ Search Test PASSED")
+
+def test_damaged_files():
+    """Test a missing or truncated ids file starts an empty index instead of failing"""
+    print("\n" + "="*60)
+    print("TEST 2: Damaged Files")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "vectors.f32")
+        memory = EpisodicMemory(path, capacity=4, embed_fn=bag_of_words)
+        memory.add(1, "my dog is called bruno")
+        memory.wait()
+        memory.close()
+
+        with open(path + ".ids", 'r+b') as f:
+            f.truncate(8)
+        reopened = EpisodicMemory(path, capacity=4, embed_fn=bag_of_words)
+        assert reopened.search("dog bruno", 1) == [] and len(reopened) == 0
+        reopened.add(2, "capital of france is paris")
+        reopened.wait()
+        assert reopened.search("paris", 1)[0][0] == 2
+        reopened.close()
+
+        os.remove(path + ".ids")
+        assert len(EpisodicMemory(path, capacity=4, embed_fn=bag_of_words)) == 0
+
+        def flaky(text):
+            if "hello" in text:
+                raise ConnectionError("ollama is not running")
+            return bag_of_words(text)
+
+        failing = EpisodicMemory(os.path.join(directory, "other.f32"), capacity=4, embed_fn=flaky)
+        failing.add(1, "my dog is called bruno")
+        failing.add(2, "hello")
+        failing.wait()
+        assert failing.search("hello bruno", 1) == [] and failing.failures == 2
+        assert len(failing) == 1
+        failing.close()
+    print("✅ Damaged Files Test PASSED")
+
+def test_context_blend():
+    """Test an old relevant turn reaches the memory context alongside recent ones"""
+    print("\n" + "="*60)
+    print("TEST 3: Recall Blended with Recency")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        storage = JSONMemoryStorage(os.path.join(directory, "memory.json"),
+                                    os.path.join(directory, "preferences.json"))
+        episodic = EpisodicMemory(os.path.join(directory, "vectors.f32"), capacity=100, embed_fn=bag_of_words)
+        memory = AdvancedMemorySystem(storage, episodic)
+
+        memory.add_conversation("my sister lives in chennai", "Nice, Chennai is a coastal city.")
+        for i in range(10):
+            memory.add_conversation(f"small talk number {i}", f"reply {i}")
+        episodic.wait()
+
+        context = memory.get_context_for_query("which city my sister lives in")
+        assert "chennai" in context.lower()
+        assert "reply 9" in context  # The latest turn is still there
+        assert context.count("Q: ") == 4
+        memory.close()
+    print("✅ Blend Test PASSED")
+
+def test_recall_every_turn():
+    """Test an old turn is recalled on a later chat turn, not only when the session starts"""
+    print("\n" + "="*60)
+    print("TEST 4: Recall on Every Turn")
+    print("="*60)
+
+    with headless_ai() as (ai, directory):
+        client = ai.ollama_client
+        storage = JSONMemoryStorage(os.path.join(directory, "memory.json"),
+                                    os.path.join(directory, "preferences.json"))
+        episodic = EpisodicMemory(os.path.join(directory, "vectors.f32"), capacity=100, embed_fn=bag_of_words)
+        ai.__dict__['memory_system'] = memory = AdvancedMemorySystem(storage, episodic)
+        memory.add_conversation("my sister lives in chennai", "Nice, Chennai is a coastal city.")
+        for i in range(10):
+            memory.add_conversation(f"small talk number {i}", f"reply {i}")
+        episodic.wait()
+
+        ai.smart_response("tell me a joke")
+        ai.smart_response("which city my sister lives in")
+        first, later = client.calls
+        [recalled] = [m['content'] for m in later if m['role'] == 'system' and 'Remembered' in m['content']]
+        assert "chennai" in recalled.lower()
+        assert later[-2]['role'] == 'system' and later[-1]['content'] == "which city my sister lives in"
+        # Recalled context is for one turn only - the history holds just the chat
+        assert later[1:3] == [{'role': 'user', 'content': "tell me a joke"},
+                              {'role': 'assistant', 'content': "answer 1"}]
+        assert "tell me a joke" not in recalled  # Already in the session, not repeated
+    print("✅ Recall Every Turn Test PASSED")
+
+def run_all_tests():
+    """Run all tests"""
+    test_search()
+    test_damaged_files()
+    test_context_blend()
+    test_recall_every_turn()
+    print("\n✅ ALL EPISODIC MEMORY TESTS COMPLETED SUCCESSFULLY!")
+
+if __name__ == "__main__":
+    run_all_tests()
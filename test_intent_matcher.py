@@ -0,0 +1,87 @@
+"""
+Test Suite and Microbenchmark for the Intent Matcher
+Checks the compiled matcher agrees with plain substring scans and measures the speedup
+"""
+
+import time
+from intent_matcher import (IntentMatcher, SEARCH_DECISION_MATCHER, SEARCH_DECISION_TABLES,
+                            SEARCH_TYPE_MATCHER, TOPIC_MATCHER)
+
+SAMPLE_QUERIES = [
+    "hello",
+    "what is the latest news about AI today",
+    "best colleges near me in this pin code 411001",
+    "how has technology evolved over time",
+    "crime rate in Delhi 2025",
+    "tell me more about the population of India",
+    "can you explain quantum computing",
+    "what is the weather forecast for Mumbai tomorrow",
+    "how many people died in road accidents last year",
+    "recipe for paneer butter masala",
+]
+
+def scan_categories(tables, text):
+    """Reference implementation: one `in` scan per keyword"""
+    text = text.lower()
+    return {category for category, keywords in tables.items()
+            if any(keyword in text for keyword in keywords)}
+
+def test_matches_substring_scans():
+    """Test the matcher finds exactly what the substring scans find"""
+    print("\n" + "="*60)
+    print("TEST 1: Agreement with Substring Scans")
+    print("="*60)
+
+    for query in SAMPLE_QUERIES:
+        assert SEARCH_DECISION_MATCHER.match(query) == scan_categories(SEARCH_DECISION_TABLES, query), query
+
+    # Overlapping and nested keywords are all reported
+    matcher = IntentMatcher({'a': ['crime rate'], 'b': ['crime'], 'c': ['rate'], 'd': ['hi']})
+    assert matcher.match("crime rate in this city") == {'a', 'b', 'c', 'd'}
+    print("✅ Agreement Test PASSED")
+
+def test_priority_order():
+    """Test first() follows table order"""
+    print("\n" + "="*60)
+    print("TEST 2: Priority Order")
+    print("="*60)
+
+    assert SEARCH_TYPE_MATCHER.first("latest research paper") == 'news'
+    assert SEARCH_TYPE_MATCHER.first("research paper") == 'academic'
+    assert SEARCH_TYPE_MATCHER.first("zzz", 'general') == 'general'
+    assert TOPIC_MATCHER.first("ghost story", 'general') == 'stories'
+    print("✅ Priority Order Test PASSED")
+
+def benchmark(rounds=2000):
+    """Compare the compiled matcher with per-keyword scans"""
+    print("\n" + "="*60)
+    print("BENCHMARK: Compiled Matcher vs Substring Scans")
+    print("="*60)
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for query in SAMPLE_QUERIES:
+            scan_categories(SEARCH_DECISION_TABLES, query)
+    scan_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for query in SAMPLE_QUERIES:
+            SEARCH_DECISION_MATCHER.match(query)
+    match_time = time.perf_counter() - start
+
+    calls = rounds * len(SAMPLE_QUERIES)
+    print(f"⏱️  Substring scans: {scan_time / calls * 1e6:.2f} µs/query")
+    print(f"⏱️  Compiled matcher: {match_time / calls * 1e6:.2f} µs/query")
+    print(f"🚀 Speedup: {scan_time / match_time:.1f}x faster")
+    return scan_time / match_time
+
+def run_all_tests():
+    """Run all tests"""
+    test_matches_substring_scans()
+    test_priority_order()
+    benchmark()
+    print("\n✅ ALL INTENT MATCHER TESTS COMPLETED SUCCESSFULLY!")
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,289 @@
+"""
+Test Suite for the Knowledge Store
+Checks BM25 lookups of saved answers, expiry by age and query type, the append-only
+log with its snapshot, compaction and importing the old whole-file format
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+
+from conftest import FakeClient, FakeSearchEngine, headless_ai, settle
+from knowledge_store import KnowledgeStore, normalize
+
+TTLS = {'news': 60, 'default': 3600}
+
+def make_store(directory, **kwargs):
+    return KnowledgeStore(os.path.join(directory, "knowledge.jsonl"), ttls=TTLS, min_score=0.5,
+                          min_coverage=0.75, **kwargs)
+
+def test_lookup():
+    """Test rephrased questions hit and unrelated or partial ones miss"""
+    print("\n" + "="*60)
+    print("TEST 1: Indexed Lookup")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = make_store(directory)
+        store.add("What is the population of Hyderabad?", "About 10 million people live in Hyderabad.")
+        store.add("Colleges in Warangal", "NIT Warangal and Kakatiya University.")
+        store.add("Who invented the telephone?", "Alexander Graham Bell.")
+
+        assert normalize("What are the colleges") == ['college']
+        assert store.lookup("hyderabad population") == "About 10 million people live in Hyderabad."
+        assert store.lookup("tell me about colleges in warangal") == "NIT Warangal and Kakatiya University."
+        assert store.lookup("population of Warangal") is None  # Shares only one term each way
+        assert store.lookup("who invented the radio") is None
+
+        # Same shape, different entity: never the other city's answer
+        store.add("crime rate in Delhi 2025", "Delhi recorded 1,500 cases per lakh.")
+        assert store.lookup("crime rate in Pune 2025") is None
+        assert store.lookup("Delhi crime rate 2025") == "Delhi recorded 1,500 cases per lakh."
+        assert store.lookup("hyderabad population", query_type='chat') is None
+        assert store.stats()['hits'] == 3
+        store.close()
+    print("✅ Indexed Lookup Test PASSED")
+
+def test_expiry():
+    """Test time-sensitive answers expire sooner and expired entries leave the index"""
+    print("\n" + "="*60)
+    print("TEST 2: Expiry by Age and Query Type")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = make_store(directory)
+        store.add("latest news about cricket", "India won the series.")
+        store.add("history of cricket", "Cricket began in England.")
+        news = store.entries[store._key("latest news about cricket")]
+        history = store.entries[store._key("history of cricket")]
+        assert news['expires'] - time.time() <= 60 < history['expires'] - time.time()
+
+        news['expires'] = time.time() - 1
+        assert store.lookup("latest cricket news") is None
+        assert len(store) == 1 and store.stats()['expirations'] == 1
+        assert 'india' not in store.postings
+        assert store.lookup("cricket history") == "Cricket began in England."
+        store.close()
+    print("✅ Expiry Test PASSED")
+
+def test_log_and_snapshot():
+    """Test saves append one line each and reloads read the snapshot plus the log tail"""
+    print("\n" + "="*60)
+    print("TEST 3: Append-Only Log and Snapshot")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = make_store(directory)
+        store.add("capital of telangana", "Hyderabad.")
+        store.add("capital of telangana", "Hyderabad, since 2014.")  # Replaces, appends
+        store.close()  # Takes a snapshot
+        with open(store.path) as f:
+            assert len(f.readlines()) == 2
+
+        # Written after the snapshot, plus a line torn by a crash
+        store = make_store(directory)
+        store.load()
+        store.add("largest ocean", "The Pacific.")
+        store._close_files()
+        with open(store.path, 'a') as f:
+            f.write('{"key": "torn')
+
+        reloaded = make_store(directory)
+        reloaded.load()
+        assert len(reloaded) == 2 and reloaded.dead == 1
+        assert reloaded.since_snapshot == 1  # Only the tail was parsed
+        assert reloaded.lookup("telangana capital") == "Hyderabad, since 2014."
+        assert reloaded.lookup("largest ocean") == "The Pacific."
+
+        # The torn line was cut off, so a record appended now is read by the next load
+        with open(store.path) as f:
+            assert f.read().endswith("}\n")
+        reloaded.add("longest river", "The Nile.")
+        reloaded._close_files()
+        again = make_store(directory)
+        again.load()
+        assert again.lookup("longest river") == "The Nile."
+        again.close()
+    print("✅ Log and Snapshot Test PASSED")
+
+def test_compaction():
+    """Test compaction drops replaced and deleted records and keeps answers readable"""
+    print("\n" + "="*60)
+    print("TEST 4: Compaction")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = make_store(directory, compact_after=8)
+        for version in range(5):
+            store.add("tallest mountain", f"Mount Everest (v{version}).")
+        store.add("deepest lake", "Lake Baikal.")
+        store.delete("deepest lake")
+        assert store.needs_compaction()
+
+        assert store.compact()
+        assert store.dead == 0 and not store.needs_compaction()
+        with open(store.path) as f:
+            assert len(f.readlines()) == 1
+        assert not os.path.exists(store.path + ".tmp")
+        assert store.lookup("tallest mountain") == "Mount Everest (v4)."
+
+        reloaded = make_store(directory)
+        reloaded.load()
+        assert len(reloaded) == 1 and reloaded.since_snapshot == 0
+        assert reloaded.lookup("deepest lake") is None
+        assert reloaded.lookup("mountain tallest") == "Mount Everest (v4)."
+        reloaded.close()
+        store.close()
+    print("✅ Compaction Test PASSED")
+
+def test_snapshot_without_dead_records():
+    """Test a log of new answers only is snapshotted, never rewritten"""
+    print("\n" + "="*60)
+    print("TEST 5: Snapshots Without Compaction")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = make_store(directory, compact_after=8)
+        for i in range(40):
+            store.add(f"fact number {i}", f"Answer {i}.")
+            store.maintain()
+        assert store.compactions == 0 and store.dead == 0
+        # Snapshots only once the tail is as long as the index
+        assert os.path.exists(store.snapshot_path) and store.since_snapshot < len(store)
+
+        reloaded = make_store(directory)
+        reloaded.load()
+        assert len(reloaded) == 40 and reloaded.lookup("fact number 7") == "Answer 7."
+        reloaded.close()
+        store.close()
+    print("✅ Snapshots Without Compaction Test PASSED")
+
+def test_add_during_compaction():
+    """Test answers saved while the log is being rewritten are kept"""
+    print("\n" + "="*60)
+    print("TEST 6: Saves During Compaction")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = make_store(directory)
+        for version in range(3):
+            for i in range(1000):
+                store.add(f"fact number {i}", f"Answer {i} (v{version}).")
+
+        compacting = threading.Thread(target=store.compact)
+        compacting.start()
+        for i in range(0, 1000, 2):
+            store.add(f"fact number {i}", f"Answer {i} (v3).")
+        store.delete("fact number 1")
+        compacting.join()
+
+        def check(knowledge):
+            assert len(knowledge) == 999
+            assert knowledge.lookup("fact number 10") == "Answer 10 (v3)."
+            assert knowledge.lookup("fact number 11") == "Answer 11 (v2)."
+            assert knowledge.lookup("fact number 1") is None
+
+        check(store)
+        with open(store.path) as f:
+            assert len(f.readlines()) == len(store) + store.dead
+        store.close()
+        reloaded = make_store(directory)
+        reloaded.load()
+        check(reloaded)
+        reloaded.close()
+    print("✅ Saves During Compaction Test PASSED")
+
+def test_legacy_import():
+    """Test the old whole-file JSON is imported into the log once, without expired answers"""
+    print("\n" + "="*60)
+    print("TEST 7: Legacy Import")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        legacy_path = os.path.join(directory, "knowledge.json")
+        old = {
+            "tallest mountain": {'answer': "Mount Everest.", 'timestamp': "2020-01-01T00:00:00"},
+            "largest ocean": {'answer': "The Pacific.", 'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S")}
+        }
+        with open(legacy_path, 'w') as f:
+            json.dump(old, f)
+
+        store = make_store(directory, legacy_path=legacy_path)
+        store.load()
+        assert len(store) == 1
+        assert store.lookup("largest ocean") == "The Pacific."
+        store.close()
+        assert os.path.exists(legacy_path)
+    print("✅ Legacy Import Test PASSED")
+
+def test_owners():
+    """Test answers saved for one owner stay theirs, ahead of shared ones, across reloads"""
+    print("\n" + "="*60)
+    print("TEST 8: Per-User Answers")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = make_store(directory)
+        store.add("best restaurants near me", "Leopold Cafe in Mumbai.", owner="alice")
+        assert store.lookup("best restaurants near me") is None
+        assert store.lookup("best restaurants near me", owner="bob") is None
+        store.add("best restaurants near me", "It depends on your city.")
+
+        def check(knowledge):
+            assert len(knowledge) == 2
+            assert knowledge.lookup("best restaurants near me", owner="bob") == "It depends on your city."
+            assert knowledge.lookup("best restaurants near me", owner="alice") == "Leopold Cafe in Mumbai."
+
+        check(store)
+        store.close()
+        for use_snapshot in (True, False):
+            if not use_snapshot:
+                os.remove(store.snapshot_path)
+            reloaded = make_store(directory)
+            reloaded.load()
+            check(reloaded)
+            reloaded.close()
+    print("✅ Per-User Answers Test PASSED")
+
+def test_failed_answer_not_saved():
+    """Test an unavailable model's error text is never saved as the answer"""
+    print("\n" + "="*60)
+    print("TEST 9: Failed Answers Are Not Saved")
+    print("="*60)
+
+    from terminal_ai import AI_UNAVAILABLE
+
+    with headless_ai(FakeClient(failures=1)) as (ai, _):
+        ai.__dict__['search_engine'] = FakeSearchEngine()
+        query = "latest crime rate in Pune"
+        assert ai.needs_search(query)
+        assert ai.smart_response(query) == AI_UNAVAILABLE
+        settle(ai)
+        assert len(ai.knowledge) == 0
+        assert ai.memory_system.get_memory_stats()['total_conversations'] == 0
+
+        # Once the model is back the question reaches it again
+        assert ai.smart_response(query) == "answer 2"
+        assert len(ai.ollama_client.calls) == 2
+        settle(ai)
+        assert ai.knowledge.lookup(query) == "answer 2"
+        assert ai.memory_system.get_memory_stats()['total_conversations'] == 1
+    print("✅ Failed Answer Test PASSED")
+
+def run_all_tests():
+    """Run all tests"""
+    test_lookup()
+    test_expiry()
+    test_log_and_snapshot()
+    test_compaction()
+    test_snapshot_without_dead_records()
+    test_add_during_compaction()
+    test_legacy_import()
+    test_owners()
+    test_failed_answer_not_saved()
+    print("\n✅ ALL KNOWLEDGE STORE TESTS COMPLETED SUCCESSFULLY!")
+
+if __name__ == "__main__":
+    run_all_tests()
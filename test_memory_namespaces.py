@@ -0,0 +1,263 @@
+"""
+Test Suite for Memory Namespaces
+Checks each user gets separate memory files, the LRU caps how many are open,
+evicted namespaces are flushed to disk, namespaces in use are never closed and
+the terminal answers each user from their own history
+"""
+
+import os
+import tempfile
+import threading
+from collections import Counter
+
+from conftest import FakeSearchEngine, headless_ai, settle
+from memory_namespaces import MemoryNamespaces
+from memory_storage import JSONMemoryStorage, namespace_directory
+from memory_system import AdvancedMemorySystem
+
+def json_namespaces(root, max_loaded, session_factory=None):
+    """Namespaces on the JSON backend, so flushing is visible in the files"""
+    def factory(directory):
+        os.makedirs(directory, exist_ok=True)
+        return AdvancedMemorySystem(JSONMemoryStorage(os.path.join(directory, "memory.json"),
+                                                      os.path.join(directory, "preferences.json"),
+                                                      fsync_delay=60, snapshot_every=1000))
+    return MemoryNamespaces(root, max_loaded, factory, session_factory)
+
+def test_isolation():
+    """Test users never see each other's memory, on the configured backend"""
+    print("\n" + "="*60)
+    print("TEST 1: Isolated Namespaces")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as root:
+        namespaces = MemoryNamespaces(root, max_loaded=4)
+        with namespaces.use("alice") as namespace:
+            namespace.memory.add_conversation("weather in Pune", "Humid.")
+            namespace.memory.learn_preference("location", "Pune")
+        with namespaces.use("bob") as namespace:
+            assert namespace.memory.get_memory_stats()['total_conversations'] == 0
+            assert namespace.memory.get_preference("location") is None
+        with namespaces.use("alice") as namespace:
+            assert namespace.memory.get_preference("location") == "Pune"
+        assert namespaces.loaded() == ["bob", "alice"]
+
+        # Any id maps to a directory inside the root
+        assert namespace_directory("alice", root) == os.path.join(root, "alice")
+        unsafe = namespace_directory("../../etc/passwd", root)
+        assert os.path.dirname(unsafe) == root and os.path.basename(unsafe).startswith("id-")
+        namespaces.close()
+        assert namespaces.loaded() == []
+    print("✅ Isolation Test PASSED")
+
+def test_lru_eviction():
+    """Test the least recently used namespace is flushed and closed past max_loaded"""
+    print("\n" + "="*60)
+    print("TEST 2: LRU Eviction Flushes")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as root:
+        namespaces = json_namespaces(root, max_loaded=2)
+        for user in ("u1", "u2"):
+            with namespaces.use(user) as namespace:
+                namespace.memory.add_conversation(f"hello from {user}", "hi")
+        memory_file = os.path.join(root, "u1", "memory.json")
+        assert not os.path.exists(memory_file)  # Still only in the journal
+
+        with namespaces.use("u1"):
+            pass  # u1 is now the most recently used
+        with namespaces.use("u3"):
+            pass
+        assert namespaces.loaded() == ["u1", "u3"]
+        assert os.path.exists(os.path.join(root, "u2", "memory.json"))  # Snapshot written on eviction
+
+        with namespaces.use("u2") as namespace:  # Loaded again from disk
+            assert [c['query'] for c in namespace.memory.search_conversations("hello")] == ["hello from u2"]
+        stats = namespaces.stats()
+        assert stats['loads'] == 4 and stats['evictions'] == 2 and stats['loaded'] == 2
+        namespaces.close()
+        assert os.path.exists(memory_file)
+    print("✅ LRU Eviction Test PASSED")
+
+def test_in_use_kept_open():
+    """Test a namespace inside use() is never closed under its caller"""
+    print("\n" + "="*60)
+    print("TEST 3: Namespaces in Use Stay Open")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as root:
+        namespaces = json_namespaces(root, max_loaded=1)
+        with namespaces.use("busy") as busy:
+            with namespaces.use("other"):
+                assert namespaces.loaded() == ["busy", "other"]  # Over the cap while both are in use
+            assert namespaces.loaded() == ["busy"]
+            busy.memory.add_conversation("still writable", "yes")
+        with namespaces.use("other"):
+            pass
+        assert namespaces.loaded() == ["other"]
+        with namespaces.use("busy") as namespace:
+            assert namespace.memory.get_memory_stats()['total_conversations'] == 1
+        namespaces.close()
+    print("✅ In Use Test PASSED")
+
+class SlowMemory:
+    """Memory system whose close() blocks until it is let go (release=None never blocks)"""
+    def __init__(self, release=None):
+        self.release = release
+        self.closing = threading.Event()
+        self.closed = threading.Event()
+
+    def close(self):
+        self.closing.set()
+        if self.release is not None:
+            self.release.wait(5)
+        self.closed.set()
+
+def in_thread(target, *args):
+    """Start target in a thread, returns an Event set once it has returned"""
+    done = threading.Event()
+
+    def run():
+        target(*args)
+        done.set()
+
+    threading.Thread(target=run, daemon=True).start()
+    return done
+
+def test_slow_load_and_close():
+    """Test one user's slow load or eviction never blocks another user's acquire"""
+    print("\n" + "="*60)
+    print("TEST 4: Loads and Closes Outside the Lock")
+    print("="*60)
+
+    release = threading.Event()
+    loading = threading.Event()
+    built = Counter()
+    slow = []  # Memory systems built for "slow", oldest first
+    closed_before_reopen = []
+
+    def factory(directory):
+        user_id = os.path.basename(directory)
+        built[user_id] += 1
+        if user_id != "slow":
+            return SlowMemory()
+        if slow:
+            closed_before_reopen.append(slow[-1].closed.is_set())
+        else:
+            loading.set()
+            release.wait(5)
+        slow.append(SlowMemory(release))
+        return slow[-1]
+
+    namespaces = MemoryNamespaces("users", max_loaded=1, factory=factory)
+    seen = []
+
+    def visit(user_id):
+        with namespaces.use(user_id):
+            seen.append(namespaces.loaded())
+
+    # The waits below only time out if a user is blocked behind "slow"
+    loaders = [in_thread(namespaces.acquire, "slow") for _ in range(2)]
+    assert loading.wait(5)
+    # "slow" is still loading - another user is served meanwhile
+    assert in_thread(visit, "fast").wait(5)
+    release.set()
+    assert all(done.wait(5) for done in loaders)
+    assert built["slow"] == 1  # Both callers share the one load
+    for _ in range(2):
+        namespaces.release("slow")
+
+    # Evicting "slow" hangs in close(), yet other users still load
+    release.clear()
+    evicting = in_thread(namespaces.acquire, "next")
+    assert slow[0].closing.wait(5)
+    assert not evicting.is_set() and namespaces.loaded() == ["next"]
+    assert in_thread(visit, "other").wait(5)
+    assert seen[-1] == ["next", "other"]
+
+    # A reopen waits until the evicted files are closed
+    reopen = in_thread(namespaces.acquire, "slow")
+    release.set()
+    assert evicting.wait(5) and reopen.wait(5)
+    assert built["slow"] == 2 and closed_before_reopen == [True]
+    print("✅ Load and Close Test PASSED")
+
+class RecordingCache:
+    """Semantic cache that never hits and records what is added"""
+    def __init__(self):
+        self.added = []
+
+    def lookup(self, query, query_type='chat', owner=None):
+        return None
+
+    def add(self, query, response, query_type='chat', owner=None):
+        self.added.append(query)
+
+def test_users_in_terminal():
+    """Test two users of one TerminalAI never see each other's history"""
+    print("\n" + "="*60)
+    print("TEST 5: Per-User Chat History")
+    print("="*60)
+
+    with headless_ai() as (ai, root):
+        client = ai.ollama_client
+        ai.semantic_cache = cache = RecordingCache()
+        ai.__dict__['memory_system'] = AdvancedMemorySystem(JSONMemoryStorage(
+            os.path.join(root, "memory.json"), os.path.join(root, "preferences.json")))
+        ai.__dict__['memory_namespaces'] = namespaces = json_namespaces(
+            os.path.join(root, "users"), 2, ai._new_session)
+        ai.smart_response("my name is Alice", user="alice")
+        ai.smart_response("what is my name", user="bob")
+        assert "Alice" not in str(client.calls[-1])
+        ai.smart_response("what is my name", user="alice")
+        assert {'role': 'user', 'content': "my name is Alice"} in client.calls[-1]
+
+        assert not cache.added  # Chat answers never reach the shared cache
+        assert ai.session.turns == []  # The terminal's own session is untouched
+        with namespaces.use("bob") as namespace:
+            assert [user for user, _ in namespace.session.turns] == ["what is my name"]
+            assert namespace.memory.get_memory_stats()['total_conversations'] == 1
+        with namespaces.use("alice") as namespace:
+            assert namespace.memory.get_memory_stats()['total_conversations'] == 2
+    print("✅ Per-User History Test PASSED")
+
+def test_personal_search_answers():
+    """Test a search answer built from one user's own context is never given to another"""
+    print("\n" + "="*60)
+    print("TEST 6: Personal Search Answers Stay Personal")
+    print("="*60)
+
+    with headless_ai() as (ai, root):
+        client = ai.ollama_client
+        ai.__dict__['search_engine'] = FakeSearchEngine()
+        ai.__dict__['memory_namespaces'] = namespaces = json_namespaces(
+            os.path.join(root, "users"), 4, ai._new_session)
+        with namespaces.use("alice") as namespace:
+            namespace.memory.learn_preference("location", "Mumbai")
+
+        query = "best restaurants near me"
+        assert ai.smart_response(query, user="alice") == "answer 1"
+        assert "Mumbai" in str(client.calls[-1])
+        settle(ai)
+        assert ai.smart_response(query, user="bob") == "answer 2"  # Not Alice's answer
+        assert "Mumbai" not in str(client.calls[-1])
+        settle(ai)
+
+        # Bob's prompt held nothing of his own, so his answer is shared; Alice keeps hers
+        assert ai.smart_response(query, user="carol") == "answer 2"
+        assert ai.smart_response(query, user="alice") == "answer 1"
+        assert len(client.calls) == 2
+    print("✅ Personal Answers Test PASSED")
+
+def run_all_tests():
+    """Run all tests"""
+    test_isolation()
+    test_lru_eviction()
+    test_in_use_kept_open()
+    test_slow_load_and_close()
+    test_users_in_terminal()
+    test_personal_search_answers()
+    print("\n✅ ALL MEMORY NAMESPACE TESTS COMPLETED SUCCESSFULLY!")
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,350 @@
+"""
+Test Suite for Memory Storage
+Checks the JSON and SQLite backends behave the same behind AdvancedMemorySystem,
+the SQLite backend keeps the full history and imports the old JSON files, and the
+JSON backend's ring buffer and write-ahead journal, and topic digests
+"""
+
+import json
+import os
+import tempfile
+import time
+
+from conftest import headless_ai
+from memory_storage import JSONMemoryStorage, SQLiteMemoryStorage
+from memory_system import AdvancedMemorySystem
+from prompt_budget import TOKEN_COUNTER
+
+def backends(directory):
+    """One memory system per backend"""
+    json_storage = JSONMemoryStorage(os.path.join(directory, "memory.json"),
+                                     os.path.join(directory, "preferences.json"), max_conversations=100)
+    sqlite_storage = SQLiteMemoryStorage(os.path.join(directory, "memory.db"))
+    return [AdvancedMemorySystem(json_storage), AdvancedMemorySystem(sqlite_storage)]
+
+def test_same_behaviour():
+    """Test context, search, topics, preferences and corrections on both backends"""
+    print("\n" + "="*60)
+    print("TEST 1: Backends Behave the Same")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for memory in backends(directory):
+            memory.add_conversation("weather in Hyderabad today", "Sunny, 34 degrees.")
+            memory.add_conversation("tell me a ghost story", "Once upon a time...")
+            memory.add_conversation("will it rain tomorrow", "Light rain is forecast.")
+            memory.add_conversation("what is python", "A programming language.")
+
+            assert memory.topics == {'weather': 2, 'stories': 1, 'general': 1}
+            context = memory.get_context_for_query("weather forecast")
+            assert "Sunny" in context and "Light rain" in context and "programming" in context
+            assert [c['query'] for c in memory.search_conversations("rain")] == ["will it rain tomorrow"]
+            assert [c['query'] for c in memory.search_conversations("hyderabad sun")] == ["weather in Hyderabad today"]
+            assert memory.search_conversations("hyderabad rain") == []
+            assert memory.search_conversations('"unbalanced') == []
+            assert "Conversations: 2" in memory.get_topic_summary("weather")
+
+            memory.learn_preference("location", "Mumbai")
+            memory.add_correction("Sunny", "It was cloudy")
+            stats = memory.get_memory_stats()
+            assert memory.get_preference("location") == "Mumbai"
+            assert stats['total_conversations'] == 4 and stats['corrections_made'] == 1
+            assert stats['most_discussed_topic'] == 'weather'
+
+            memory.clear()
+            assert memory.get_memory_stats()['total_conversations'] == 0
+            assert memory.get_preference("location") is None
+            memory.close()
+    print("✅ Same Behaviour Test PASSED")
+
+def test_full_history():
+    """Test SQLite keeps every conversation across restarts while JSON keeps the last N"""
+    print("\n" + "="*60)
+    print("TEST 2: Full History")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_file = os.path.join(directory, "memory.db")
+        memory = AdvancedMemorySystem(SQLiteMemoryStorage(db_file))
+        for i in range(150):
+            memory.add_conversation(f"question {i}", f"answer {i}")
+        memory.close()
+
+        reopened = AdvancedMemorySystem(SQLiteMemoryStorage(db_file))
+        assert reopened.get_memory_stats()['total_conversations'] == 150
+        assert [c['query'] for c in reopened.search_conversations("question")][0] == "question 149"
+        assert sum(1 for _ in reopened.storage.iter_conversations(page_size=40)) == 150
+        reopened.close()
+
+        json_file = os.path.join(directory, "memory.json")
+        memory = AdvancedMemorySystem(JSONMemoryStorage(json_file, os.path.join(directory, "p.json"),
+                                                        max_conversations=100))
+        for i in range(150):
+            memory.add_conversation(f"question {i}", f"answer {i}")
+        memory.close()
+        with open(json_file) as f:
+            assert len(json.load(f)['conversations']) == 100
+    print("✅ Full History Test PASSED")
+
+def test_import_json():
+    """Test a new SQLite database starts from the JSON backend's files"""
+    print("\n" + "="*60)
+    print("TEST 3: Import from JSON")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        memory_file = os.path.join(directory, "memory.json")
+        preferences_file = os.path.join(directory, "preferences.json")
+        old = AdvancedMemorySystem(JSONMemoryStorage(memory_file, preferences_file))
+        old.add_conversation("colleges near 500001", "Osmania University.")
+        old.learn_preference("location", "Hyderabad")
+        old.close()
+
+        memory = AdvancedMemorySystem(SQLiteMemoryStorage(os.path.join(directory, "memory.db"),
+                                                          import_files=(memory_file, preferences_file)))
+        assert memory.get_preference("location") == "Hyderabad"
+        [conversation] = memory.search_conversations("Osmania")
+        assert conversation['entities']['pincodes'] == ['500001']
+
+        # Deleting a conversation takes its entity rows with it
+        memory.storage.conn.execute("DELETE FROM conversations WHERE id = ?", (conversation['id'],))
+        assert memory.storage._count("entities") == 0
+        memory.close()
+    print("✅ Import Test PASSED")
+
+def test_ring_buffer():
+    """Test the JSON backend evicts from the buffer, id map, topics and index together"""
+    print("\n" + "="*60)
+    print("TEST 4: Ring Buffer")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        memory_file = os.path.join(directory, "memory.json")
+        preferences_file = os.path.join(directory, "preferences.json")
+        storage = JSONMemoryStorage(memory_file, preferences_file, max_conversations=5)
+        memory = AdvancedMemorySystem(storage)
+        for i in range(12):
+            query = f"weather report {i}" if i % 3 == 0 else f"ghost story {i}"
+            memory.add_conversation(query, f"answer {i}")
+
+        assert [c['id'] for c in storage.conversations] == [8, 9, 10, 11, 12]
+        assert set(storage.by_id) == {8, 9, 10, 11, 12}
+        assert memory.topics == {'weather': 1, 'stories': 4}
+        assert [c['id'] for c in storage.topic_conversations('stories', 2)] == [11, 12]
+        assert len(storage.index) == 5
+        assert memory.search_conversations("report 3") == []  # Evicted
+        assert [c['query'] for c in memory.search_conversations("weather")] == ["weather report 9"]
+        memory.close()
+
+        # Ids stay monotonic across restarts and after clearing
+        reopened = JSONMemoryStorage(memory_file, preferences_file, max_conversations=5)
+        assert reopened.add_conversation({'timestamp': '', 'query': 'q', 'response': 'a', 'topic': 'general'}) == 13
+        reopened.clear()
+        assert reopened.add_conversation({'timestamp': '', 'query': 'q', 'response': 'a', 'topic': 'general'}) == 14
+        reopened.close()
+
+        # Files from before monotonic ids repeat ids after truncation
+        with open(memory_file, 'w') as f:
+            json.dump({'conversations': [{'id': 100, 'timestamp': '', 'query': 'a', 'response': 'b', 'topic': 'general'},
+                                         {'id': 100, 'timestamp': '', 'query': 'c', 'response': 'd', 'topic': 'general'}]}, f)
+        legacy = JSONMemoryStorage(memory_file, preferences_file)
+        assert [c['id'] for c in legacy.conversations] == [1, 2] and legacy.next_id == 3
+    print("✅ Ring Buffer Test PASSED")
+
+def test_journal():
+    """Test JSON-backend changes survive a crash through the journal, with batched fsyncs and snapshots"""
+    print("\n" + "="*60)
+    print("TEST 5: Write-Ahead Journal")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        memory_file = os.path.join(directory, "memory.json")
+        preferences_file = os.path.join(directory, "preferences.json")
+
+        def open_storage(**kwargs):
+            options = dict(fsync_delay=60, fsync_batch=3, snapshot_every=1000)
+            options.update(kwargs)
+            return JSONMemoryStorage(memory_file, preferences_file, **options)
+
+        storage = open_storage()
+        memory = AdvancedMemorySystem(storage)
+        for i in range(6):
+            memory.add_conversation(f"question {i}", f"answer {i}")
+        memory.learn_preference("location", "Pune")
+        assert storage.syncs == 2 and storage.unsynced == 1
+        assert not os.path.exists(memory_file)  # Nothing rewritten yet
+
+        # Crash: no flush, and the last journal line is torn
+        storage.sync_timer.cancel()
+        storage._journal.close()
+        with open(storage.journal_file, 'a') as f:
+            f.write('{"op": "conversation", "conv')
+        with open(storage.journal_file) as f:
+            journal = f.read()
+
+        recovered = AdvancedMemorySystem(open_storage())
+        assert recovered.get_memory_stats()['total_conversations'] == 6
+        assert recovered.get_preference("location") == "Pune"
+        recovered.close()  # Flush hook: snapshot and empty journal
+        assert os.path.getsize(recovered.storage.journal_file) == 0
+
+        # Crash after a snapshot but before the journal restarted: events already in it are skipped
+        with open(recovered.storage.journal_file, 'w') as f:
+            f.write(journal)
+        again = open_storage()
+        assert again.count_conversations() == 6 and again.next_id == 7
+        again.close()
+
+        # Background snapshot every snapshot_every events
+        storage = open_storage(snapshot_every=4)
+        for i in range(4):
+            storage.add_conversation({'timestamp': '', 'query': f'q{i}', 'response': 'a', 'topic': 'general'})
+        for _ in range(100):
+            if storage.snapshots:
+                break
+            time.sleep(0.01)
+        assert storage.snapshots == 1 and storage.journal_events == 0
+        with open(memory_file) as f:
+            assert len(json.load(f)['conversations']) == 10
+        storage.close()
+
+        # Two crashes in a row: events written after the first torn line survive the second
+        def crash(storage):
+            storage._journal.close()
+            with open(storage.journal_file, 'a') as f:
+                f.write('{"op": "preference", "k')
+
+        storage = open_storage(fsync_batch=1)
+        storage.add_conversation({'timestamp': '', 'query': 'first', 'response': 'a', 'topic': 'general'})
+        crash(storage)
+        storage = open_storage(fsync_batch=1)
+        storage.add_conversation({'timestamp': '', 'query': 'second', 'response': 'a', 'topic': 'general'})
+        crash(storage)
+        storage = open_storage()
+        assert [c['query'] for c in storage.recent_conversations(2)] == ['first', 'second']
+        assert storage.count_conversations() == 12
+        storage.close()
+    print("✅ Journal Test PASSED")
+
+def test_topic_digests():
+    """Test older turns are folded into a topic digest that replaces them in the context"""
+    print("\n" + "="*60)
+    print("TEST 6: Topic Digests")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for memory in backends(directory):
+            for i in range(6):
+                memory.add_conversation(f"weather in city {i}", f"forecast {i}")
+            assert memory.next_digest() is None  # 4 older turns, 5 needed
+
+            memory.add_conversation("weather in city 6", "forecast 6")
+            topic, prompt, through_id = memory.next_digest()
+            assert topic == 'weather' and through_id == 5
+            assert "city 4" in prompt and "city 5" not in prompt and "Notes so far: none" in prompt
+
+            memory.apply_digest(topic, "User checks the weather in cities 0-4 often. " * 30, through_id)
+            assert memory.next_digest() is None
+            context = memory.get_context_for_query("weather tomorrow", max_tokens=120)
+            assert context.startswith("Earlier on weather: User checks")
+            assert "forecast 6" in context and "forecast 5" in context
+            assert "forecast 4" not in context  # Folded into the digest
+            assert TOKEN_COUNTER.count(context) <= 120
+            assert "Digest: User checks" in memory.get_topic_summary("weather")
+            # Left out when the chat summary already says the same
+            context = memory.get_context_for_query("weather tomorrow", max_tokens=120,
+                                                   known="The user checks weather in cities often, 0-4.")
+            assert "Earlier on weather" not in context and "forecast 6" in context and "forecast 4" not in context
+
+            # The next batch extends the digest
+            for i in range(7, 12):
+                memory.add_conversation(f"weather in city {i}", f"forecast {i}")
+            topic, prompt, through_id = memory.next_digest()
+            assert through_id == 10 and "Notes so far: User checks" in prompt and "city 4" not in prompt
+
+            memory.clear()
+            assert memory.storage.get_digest('weather') is None
+            memory.close()
+
+        # Digests survive a JSON-backend restart through the journal
+        json_file = os.path.join(directory, "digest.json")
+        storage = JSONMemoryStorage(json_file, os.path.join(directory, "p.json"), fsync_batch=1)
+        storage.set_digest('stories', "Likes ghost stories.", 3, '')
+        storage._journal.close()
+        reopened = JSONMemoryStorage(json_file, os.path.join(directory, "p.json"))
+        assert reopened.get_digest('stories')['through_id'] == 3
+        reopened.close()
+    print("✅ Topic Digests Test PASSED")
+
+def test_digest_every_turn():
+    """Test a digest reaches later chat turns until the session summary covers it"""
+    print("\n" + "="*60)
+    print("TEST 7: Digests on Every Turn")
+    print("="*60)
+
+    with headless_ai() as (ai, directory):
+        client = ai.ollama_client
+        ai.__dict__['memory_system'] = memory = AdvancedMemorySystem(JSONMemoryStorage(
+            os.path.join(directory, "memory.json"), os.path.join(directory, "preferences.json")))
+        for i in range(7):
+            memory.add_conversation(f"story about a ghost {i}", f"boo {i}")
+        topic, _, through_id = memory.next_digest()
+        memory.apply_digest(topic, "Likes ghost stories set in old forts.", through_id)
+
+        ai.smart_response("hello")
+        ai.smart_response("another ghost story please")
+        [memory_message] = [m for m in client.calls[-1] if m['content'].startswith("Remembered")]
+        assert "Likes ghost stories set in old forts." in memory_message['content']
+
+        ai.session.apply_roll(1, "User likes ghost stories set in old forts.")
+        ai.smart_response("one more ghost story")
+        assert not any("Likes ghost stories" in m['content'] for m in client.calls[-1]
+                       if m['content'].startswith("Remembered"))
+    print("✅ Digests on Every Turn Test PASSED")
+
+def test_search_parity():
+    """Test both backends match every query word as a word prefix and nothing else"""
+    print("\n" + "="*60)
+    print("TEST 8: Same Search Results")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = []
+        for memory in backends(directory):
+            assert getattr(memory.storage, 'fts', True)  # SQLite without FTS5 matches substrings
+            memory.add_conversation("rain in Pune", "Heavy showers.")
+            memory.add_conversation("rainfall record in Pune", "About 700 mm a year.")
+            memory.add_conversation("colleges in Hyderabad", "Osmania University.")
+            memory.add_conversation("college fees in Warangal", "Around a lakh a year.")
+            memory.add_conversation("train to Pune", "Leaves at 6 am.")
+
+            searches = {}
+            for term in ("rain pune", "pune rain", "college hyd", "coll war", "fee college",
+                         "ain pune", "rain hyderabad", "pune"):
+                searches[term] = sorted(c['query'] for c in memory.search_conversations(term))
+            results.append(searches)
+            memory.close()
+
+    json_results, sqlite_results = results
+    assert json_results == sqlite_results
+    assert json_results["rain pune"] == json_results["pune rain"] == ["rain in Pune", "rainfall record in Pune"]
+    assert json_results["college hyd"] == ["colleges in Hyderabad"]
+    assert json_results["coll war"] == json_results["fee college"] == ["college fees in Warangal"]
+    assert json_results["ain pune"] == json_results["rain hyderabad"] == []  # Prefixes only, never inside a word
+    assert len(json_results["pune"]) == 3
+    print("✅ Search Parity Test PASSED")
+
+def run_all_tests():
+    """Run all tests"""
+    test_same_behaviour()
+    test_full_history()
+    test_import_json()
+    test_ring_buffer()
+    test_journal()
+    test_topic_digests()
+    test_digest_every_turn()
+    test_search_parity()
+    print("\n✅ ALL MEMORY STORAGE TESTS COMPLETED SUCCESSFULLY!")
+
+if __name__ == "__main__":
+    run_all_tests()
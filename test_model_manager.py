@@ -0,0 +1,93 @@
+"""
+Test Suite for the Model Manager
+Checks background warm-up and keep-alive pings with a fake Ollama client, and that
+pings follow the router's enabled tiers
+"""
+
+import asyncio
+from model_manager import ModelManager
+from model_router import ModelRouter, FAST
+
+class FakeClient:
+    def __init__(self, missing=()):
+        self.loads = []
+        self.missing = missing  # Models that were never pulled
+
+    async def generate(self, model, prompt, keep_alive, options):
+        self.loads.append((model, prompt, keep_alive, options))
+        await asyncio.sleep(0.01)
+        if model in self.missing:
+            raise RuntimeError(f"model '{model}' not found")
+        return {}
+
+def test_warm_up_and_pings():
+    """Test models load at startup and pings stop when a real call or idleness makes them pointless"""
+    print("\n" + "="*60)
+    print("TEST 1: Warm-up and Keep-alive")
+    print("="*60)
+
+    client = FakeClient()
+    manager = ModelManager(lambda: client, ["llama3.2", "llama3.2"], "30m", {'num_ctx': 4096},
+                           ping_interval=0.05, idle_timeout=10)
+
+    async def run():
+        task = asyncio.ensure_future(manager.run())
+        await asyncio.sleep(0.03)
+        assert manager.states["llama3.2"]['state'] == 'ready'
+        await asyncio.sleep(0.1)
+        assert manager.pings >= 1
+
+        # Real model calls refresh keep_alive themselves
+        manager.model_used()
+        await asyncio.sleep(0.03)  # Let a ping already under way finish
+        pings = manager.pings
+        for _ in range(4):
+            manager.model_used()
+            await asyncio.sleep(0.03)
+        assert manager.pings == pings
+
+        # Nobody around - let Ollama unload the model
+        manager.idle_timeout = 0
+        await asyncio.sleep(0.15)
+        assert manager.pings == pings
+        task.cancel()
+
+    asyncio.run(run())
+    assert client.loads[0] == ("llama3.2", '', "30m", {'num_ctx': 4096})
+    assert manager.states["llama3.2"]['load_seconds'] is not None
+    print(f"📊 {manager.stats()['pings']} pings, {len(client.loads)} loads")
+    print("✅ Warm-up and Keep-alive Test PASSED")
+
+def test_pings_follow_router():
+    """Test a tier that fails to load is disabled and no longer pinged"""
+    print("\n" + "="*60)
+    print("TEST 2: Pings Follow the Router")
+    print("="*60)
+
+    router = ModelRouter({'fast': {'model': 'llama3.2:1b', 'max_prompt_tokens': 500},
+                          'main': {'model': 'llama3.2', 'max_prompt_tokens': None}})
+    client = FakeClient(missing={'llama3.2:1b'})
+    manager = ModelManager(lambda: client, router.models, "30m", ping_interval=0.05, idle_timeout=10,
+                           on_error=router.disable_model)
+    assert manager.models == ['llama3.2', 'llama3.2:1b']
+
+    async def run():
+        task = asyncio.ensure_future(manager.run())
+        await asyncio.sleep(0.2)
+        task.cancel()
+
+    asyncio.run(run())
+    assert FAST in router.disabled and manager.models == ['llama3.2']
+    assert manager.states['llama3.2:1b']['state'] == 'error'
+    assert manager.pings >= 1
+    assert [model for model, *_ in client.loads].count('llama3.2:1b') == 1  # Warm-up only
+    print("✅ Router Pings Test PASSED")
+
+def run_all_tests():
+    """Run all tests"""
+    test_warm_up_and_pings()
+    test_pings_follow_router()
+    print("\n✅ ALL MODEL MANAGER TESTS COMPLETED SUCCESSFULLY!")
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,111 @@
+"""
+Test Suite for the Model Router
+Checks tier selection, per-tier metrics and the generation limit picked per answer type
+"""
+
+import performance_config
+from conftest import headless_ai
+from model_router import ModelRouter, FAST, MAIN
+
+TIERS = {
+    'fast': {'model': 'llama3.2:1b', 'max_prompt_tokens': 500},
+    'main': {'model': 'llama3.2', 'max_prompt_tokens': None}
+}
+
+def test_routing():
+    """Test conversation goes fast, grounded answers go main, long or failing fast calls go main"""
+    print("\n" + "="*60)
+    print("TEST 1: Tier Routing")
+    print("="*60)
+
+    router = ModelRouter(TIERS, latency_budget={'search': 5.0})
+    assert router.route('chat', 40) == FAST
+    assert router.route('chat', 900) == MAIN
+    assert router.route('search', 400) == MAIN
+
+    # Main tier keeps missing the search budget: small grounded prompts degrade to fast
+    for _ in range(5):
+        router.record(MAIN, 8.0, {})
+    assert router.route('search', 400) == FAST
+    assert router.route('search', 900) == MAIN
+
+    router.disable(FAST, "model not found")
+    assert router.route('chat', 40) == MAIN
+    assert router.models() == ['llama3.2']
+    print("✅ Tier Routing Test PASSED")
+
+def test_metrics():
+    """Test latency percentiles and token rates per tier"""
+    print("\n" + "="*60)
+    print("TEST 2: Tier Metrics")
+    print("="*60)
+
+    router = ModelRouter(TIERS, latency_budget={})
+    for seconds in (0.2, 0.3, 0.4, 2.0):
+        router.record(FAST, seconds, {'prompt_eval_count': 100, 'eval_count': 50,
+                                      'prompt_eval_duration': 1e8, 'eval_duration': 5e8}, 0.1)
+    stats = router.stats()[FAST]
+    print(f"📊 {stats}")
+    assert stats['calls'] == 4
+    assert stats['p50_seconds'] == 0.4 and stats['p95_seconds'] == 2.0
+    assert stats['decode_tokens_per_second'] == 100
+    assert stats['prompt_tokens_per_second'] == 1000
+    assert router.stats()[MAIN]['calls'] == 0
+    print("✅ Tier Metrics Test PASSED")
+
+def test_answer_type_metrics():
+    """Test decode counters per answer type and answers cut off by num_predict"""
+    print("\n" + "="*60)
+    print("TEST 3: Answer Type Metrics")
+    print("="*60)
+
+    router = ModelRouter(TIERS)
+    router.record(FAST, 0.4, {'eval_count': 12, 'eval_duration': 200_000_000, 'done_reason': 'stop'},
+                  answer_type='greeting')
+    router.record(FAST, 0.6, {'eval_count': 40, 'eval_duration': 600_000_000, 'done_reason': 'length'},
+                  answer_type='greeting')
+    router.record(MAIN, 3.0, {'eval_count': 120, 'eval_duration': 2_000_000_000}, answer_type='search')
+    router.record(MAIN, 1.0, {})
+
+    stats = router.answer_stats()
+    assert set(stats) == {'greeting', 'search'}
+    assert stats['greeting']['calls'] == 2
+    assert stats['greeting']['length_stops'] == 1
+    assert stats['greeting']['avg_completion_tokens'] == 26
+    assert abs(stats['greeting']['avg_decode_seconds'] - 0.4) < 1e-9
+    assert router.stats()[MAIN]['calls'] == 2
+    print("✅ Answer Type Metrics Test PASSED")
+
+def test_answer_type_limits():
+    """Test only real greetings get the short greeting limit"""
+    print("\n" + "="*60)
+    print("TEST 4: Answer Type Limits")
+    print("="*60)
+
+    with headless_ai() as (ai, _):
+        assert ai.answer_type("hi there!", False) == 'greeting'
+        assert ai.answer_type("thank you so much", False) == 'greeting'
+        assert ai.answer_type("thanks a lot, bye", False) == 'greeting'
+        for reply in ("no", "yes", "again", "there", "so much", "fine", "great"):
+            assert ai.answer_type(reply, False) == 'chat'  # Replies and suffixes alone are not greetings
+        assert ai.answer_type("define machine learning", False) == 'chat'  # "fine" is not a greeting here
+        assert ai.answer_type("hi, what is DNS", False) == 'chat'
+        assert ai.answer_type("hello", True) == 'search'
+
+        greeting = ai._chat_options('greeting')['options']
+        chat = ai._chat_options(ai.answer_type("define machine learning", False))['options']
+        assert greeting['num_predict'] == 40 and "\n\n" in greeting['stop']
+        assert chat['num_predict'] == performance_config.GENERATION_LIMITS['chat']['num_predict']
+        assert "\n\n" not in chat['stop']
+    print("✅ Answer Type Limits Test PASSED")
+
+def run_all_tests():
+    """Run all tests"""
+    test_routing()
+    test_metrics()
+    test_answer_type_metrics()
+    test_answer_type_limits()
+    print("\n✅ ALL MODEL ROUTER TESTS COMPLETED SUCCESSFULLY!")
+
+if __name__ == "__main__":
+    run_all_tests()
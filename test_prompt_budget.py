@@ -0,0 +1,105 @@
+"""
+Test Suite for the Prompt Budget
+Checks token truncation, priority allocation, whole message lists and calibration
+"""
+
+from prompt_budget import TokenCounter, PromptBudget
+
+def test_truncate_at_word_boundary():
+    """Test truncation stays in budget and never cuts a word"""
+    print("\n" + "="*60)
+    print("TEST 1: Word Boundary Truncation")
+    print("="*60)
+
+    counter = TokenCounter()
+    text = "Population statistics for Mumbai show steady growth. " * 50
+    for budget in (5, 17, 64, 300):
+        fitted = counter.truncate(text, budget)
+        assert counter.count(fitted) <= budget
+        kept = fitted.rstrip("…")
+        assert text.startswith(kept)
+        assert not text[len(kept):len(kept) + 1].isalnum()  # Cut between words
+    assert counter.truncate("short text", 100) == "short text"
+    for budget in (0, 1, 2):  # Too small for a word plus the ellipsis
+        assert counter.truncate(text, budget) == ""
+    print("✅ Word Boundary Truncation Test PASSED")
+
+def test_priority_allocation():
+    """Test sections are filled by priority within caps and the total limit"""
+    print("\n" + "="*60)
+    print("TEST 2: Priority Allocation")
+    print("="*60)
+
+    counter = TokenCounter()
+    budget = PromptBudget(limit=200, caps={'memory': 50}, counter=counter)
+    location = "Location context: Pune, Maharashtra"
+    memory = "Q: earlier question A: earlier answer " * 20
+    search = "search result text " * 200
+
+    fitted = budget.allocate([('location', location), ('memory', memory), ('search', search)], reserved=40)
+    assert fitted['location'] == location
+    assert counter.count(fitted['memory']) <= 50
+    total = sum(counter.count(text) for text in fitted.values())
+    assert total <= 160
+    print(f"📏 Used {total}/160 tokens after the reserved system prompt")
+
+    # The question always wins over the search data
+    prompt, context = budget.fit("system", "", "What is the crime rate?", search)
+    assert prompt == "What is the crime rate?"
+    assert budget.last_prompt_tokens <= 200
+    print("✅ Priority Allocation Test PASSED")
+
+def test_fit_messages():
+    """Test history is dropped oldest first so system prompt, history and new turn fit the limit plus the history cap"""
+    print("\n" + "="*60)
+    print("TEST 3: Whole Message List")
+    print("="*60)
+
+    counter = TokenCounter()
+    budget = PromptBudget(limit=100, caps={'history': 50}, counter=counter)
+    assert budget.message_limit() == 150  # History is sent on top of the prompt
+    messages = [{'role': 'system', 'content': "You are helpful."},
+                {'role': 'system', 'content': "Summary: " + "the user asked about trains " * 10}]
+    for i in range(6):
+        messages += [{'role': 'user', 'content': f"question {i} " * 5},
+                     {'role': 'assistant', 'content': f"answer {i} " * 5}]
+    messages += [{'role': 'system', 'content': "Remembered: sister lives in Chennai"},
+                 {'role': 'user', 'content': "Which city does my sister live in?"}]
+
+    fitted = budget.fit_messages(messages)
+    assert budget.message_tokens(fitted) <= 150 and budget.last_prompt_tokens <= 150
+    assert fitted[0] == messages[0] and fitted[-2:] == messages[-2:]
+    kept = [m['content'] for m in fitted if m['role'] == 'user'][:-1]
+    assert kept and kept == [m['content'] for m in messages if m['role'] == 'user'][-1 - len(kept):-1]
+    assert budget.fit_messages(fitted) == fitted  # Already fits: unchanged
+
+    # With no turns left to drop, the summary is cut
+    budget = PromptBudget(limit=60, caps={}, counter=counter)
+    fitted = budget.fit_messages(messages[:2] + messages[-2:])
+    assert budget.message_tokens(fitted) <= 60 and fitted[-1] == messages[-1]
+    print("✅ Whole Message List Test PASSED")
+
+def test_calibration():
+    """Test reported prompt sizes move the estimate, cache hits are ignored"""
+    print("\n" + "="*60)
+    print("TEST 4: Calibration")
+    print("="*60)
+
+    counter = TokenCounter(tokens_per_piece=1.0)
+    text = "tokenization differs between models " * 10
+    counter.calibrate(text, 80)
+    assert counter.tokens_per_piece == 2.0
+    counter.calibrate(text, 3)  # Prefix cache hit, only a few new tokens evaluated
+    assert counter.tokens_per_piece == 2.0
+    print("✅ Calibration Test PASSED")
+
+def run_all_tests():
+    """Run all tests"""
+    test_truncate_at_word_boundary()
+    test_priority_allocation()
+    test_fit_messages()
+    test_calibration()
+    print("\n✅ ALL PROMPT BUDGET TESTS COMPLETED SUCCESSFULLY!")
+
+if __name__ == "__main__":
+    run_all_tests()
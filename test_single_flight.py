@@ -0,0 +1,99 @@
+"""
+Test Suite for Single-Flight Request Coalescing
+Checks that concurrent identical calls share one execution, and one chat turn
+"""
+
+import asyncio
+import threading
+import time
+from conftest import FakeClient, headless_ai
+from single_flight import SingleFlight, AsyncSingleFlight
+
+def test_thread_coalescing():
+    """Test identical concurrent calls from threads run once"""
+    print("\n" + "="*60)
+    print("TEST 1: Thread Coalescing")
+    print("="*60)
+
+    flight = SingleFlight()
+    calls = []
+
+    def slow_search(query):
+        calls.append(query)
+        time.sleep(0.1)
+        return f"results for {query}"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("ai", slow_search, "ai")))
+               for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = flight.stats()
+    print(f"📊 Calls: {stats['calls']}, Executed: {stats['executed']}, Coalesced: {stats['coalesced']}")
+    assert calls == ["ai"]
+    assert results == ["results for ai"] * 5
+    assert stats['coalesced'] == 4
+    print("✅ Thread Coalescing Test PASSED")
+
+def test_async_coalescing():
+    """Test identical concurrent awaits share one task"""
+    print("\n" + "="*60)
+    print("TEST 2: Async Coalescing")
+    print("="*60)
+
+    flight = AsyncSingleFlight()
+    calls = []
+
+    async def slow_answer(prompt):
+        calls.append(prompt)
+        await asyncio.sleep(0.05)
+        return f"answer to {prompt}"
+
+    async def run():
+        return await asyncio.gather(
+            flight.do("hello", slow_answer, "hello"),
+            flight.do("hello", slow_answer, "hello"),
+            flight.do("weather", slow_answer, "weather")
+        )
+
+    results = asyncio.run(run())
+    assert calls == ["hello", "weather"]
+    assert results[0] == ("answer to hello", False)
+    assert results[1] == ("answer to hello", True)
+    assert flight.stats()['coalesced'] == 1
+    assert flight.stats()['in_flight'] == 0
+    print("✅ Async Coalescing Test PASSED")
+
+def test_coalesced_turn_recorded_once():
+    """Test callers sharing one model call add one turn to their session"""
+    print("\n" + "="*60)
+    print("TEST 3: One Turn per Coalesced Call")
+    print("="*60)
+
+    # Slow enough for the two identical calls to overlap
+    with headless_ai(FakeClient(delay=0.05)) as (ai, _):
+        async def ask_twice():
+            return await asyncio.gather(ai.aget_ai_response("tell me a joke", session=ai.session),
+                                        ai.aget_ai_response("tell me a joke", session=ai.session))
+
+        assert ai.runtime.run(ask_twice()) == ["answer 1", "answer 1"]
+        assert len(ai.ollama_client.calls) == 1 and ai.llm_flight.stats()['coalesced'] == 1
+        assert ai.session.turns == [("tell me a joke", "answer 1")]
+
+        # Asking again later is a new turn, even when the answer comes from the cache
+        ai.runtime.run(ai.aget_ai_response("tell me a joke", session=ai.session))
+        assert len(ai.session.turns) == 2
+    print("✅ Coalesced Turn Test PASSED")
+
+def run_all_tests():
+    """Run all tests"""
+    test_thread_coalescing()
+    test_async_coalescing()
+    test_coalesced_turn_recorded_once()
+    print("\n✅ ALL SINGLE-FLIGHT TESTS COMPLETED SUCCESSFULLY!")
+
+if __name__ == "__main__":
+    run_all_tests()
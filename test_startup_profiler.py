@@ -0,0 +1,61 @@
+"""
+Test Suite for the Startup Profiler
+Checks import-time parsing, constructor timing and the JSON report
+"""
+
+import json
+import os
+import tempfile
+import time
+from startup_profiler import StartupProfiler, parse_importtime
+
+IMPORTTIME_OUTPUT = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     _json
+import time:       800 |        920 |   json
+import time:      1500 |       2420 | search_engine
+"""
+
+def test_parse_importtime():
+    """Test -X importtime lines become self/cumulative timings"""
+    print("\n" + "="*60)
+    print("TEST 1: Import Time Parsing")
+    print("="*60)
+
+    modules = parse_importtime(IMPORTTIME_OUTPUT)
+    assert modules == {'_json': (120, 120), 'json': (800, 920), 'search_engine': (1500, 2420)}
+
+    profiler = StartupProfiler()
+    profiler.imports = modules
+    assert [name for name, _ in profiler.top_imports(2)] == ['search_engine', 'json']
+    print("✅ Import Time Parsing Test PASSED")
+
+def test_constructor_report():
+    """Test constructor timings are sorted and written as JSON"""
+    print("\n" + "="*60)
+    print("TEST 2: Constructor Report")
+    print("="*60)
+
+    profiler = StartupProfiler()
+    profiler.time_constructor("fast", lambda: None)
+    profiler.time_constructor("slow", lambda: time.sleep(0.02))
+    profiler.time_constructor("broken", lambda: 1 / 0)
+    profiler.report()
+
+    path = os.path.join(tempfile.mkdtemp(), "startup_profile.json")
+    profiler.save(path)
+    with open(path) as f:
+        report = json.load(f)
+
+    assert report['constructors'][0]['name'] == 'slow'
+    assert report['constructors'][0]['ms'] >= 20
+    assert {entry['name'] for entry in report['constructors']} == {'fast', 'slow', 'broken'}
+    print("✅ Constructor Report Test PASSED")
+
+def run_all_tests():
+    """Run all tests"""
+    test_parse_importtime()
+    test_constructor_report()
+    print("\n✅ ALL STARTUP PROFILER TESTS COMPLETED SUCCESSFULLY!")
+
+if __name__ == "__main__":
+    run_all_tests()
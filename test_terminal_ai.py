@@ -0,0 +1,118 @@
+"""
+Test Suite for TerminalAI Subsystems
+Checks headless mode never imports the audio stack, audio subsystems are unavailable
+when headless and each lazy subsystem is built once even when preload and first use overlap
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import performance_config
+import terminal_ai
+from conftest import headless_ai
+
+HEADLESS_SCRIPT = """
+import sys
+from terminal_ai import TerminalAI
+
+ai = TerminalAI(headless=True)
+ai.speak("hello")
+try:
+    ai.voice
+except AttributeError as e:
+    print("voice:", e)
+ai.shutdown()
+print("audio modules:", sorted(name for name in ('voice_clone', 'pygame', 'pydub', 'gtts') if name in sys.modules))
+"""
+
+class SlowSubsystem:
+    """Subsystem slow enough to build for two callers to overlap"""
+    built = 0
+
+    def __init__(self):
+        time.sleep(0.05)
+        SlowSubsystem.built += 1
+
+def test_headless_imports():
+    """Test a headless TerminalAI never imports voice_clone or the audio libraries"""
+    print("\n" + "="*60)
+    print("TEST 1: Headless Imports")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        # A fresh interpreter, so modules imported by other tests don't count
+        env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run([sys.executable, "-c", HEADLESS_SCRIPT], cwd=directory, env=env,
+                                capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert "voice: 'voice' is not available in headless mode" in result.stdout
+    assert "audio modules: []" in result.stdout
+    print("✅ Headless Imports Test PASSED")
+
+def test_headless_voice():
+    """Test audio subsystems raise AttributeError and are skipped by load_subsystems"""
+    print("\n" + "="*60)
+    print("TEST 2: No Voice When Headless")
+    print("="*60)
+
+    with headless_ai() as (ai, _):
+        try:
+            ai.voice
+            raise AssertionError("voice built in headless mode")
+        except AttributeError:
+            pass
+        assert not hasattr(ai, 'voice')
+        try:
+            ai.not_a_subsystem
+            raise AssertionError("unknown attribute resolved")
+        except AttributeError:
+            pass
+        ai.load_subsystems(['voice'])
+        assert 'voice' not in ai.loaded_subsystems()
+    print("✅ No Voice Test PASSED")
+
+def test_built_once():
+    """Test a subsystem is built once when the background preload and first use overlap"""
+    print("\n" + "="*60)
+    print("TEST 3: Built Once")
+    print("="*60)
+
+    terminal_ai.SUBSYSTEMS['slow_subsystem'] = (__name__, 'SlowSubsystem')
+    preload = performance_config.PRELOAD_SUBSYSTEMS
+    performance_config.PRELOAD_SUBSYSTEMS = ['slow_subsystem']
+    SlowSubsystem.built = 0
+    try:
+        with headless_ai() as (ai, _):
+            ai.mark_first_prompt()  # Starts the preload on the executor
+            seen = []
+            users = [threading.Thread(target=lambda: seen.append(ai.slow_subsystem)) for _ in range(3)]
+            for thread in users:
+                thread.start()
+            seen.append(ai.runtime.run(ai._asubsystem('slow_subsystem')))
+            for thread in users:
+                thread.join()
+
+            assert SlowSubsystem.built == 1
+            assert all(subsystem is seen[0] for subsystem in seen) and len(seen) == 4
+            assert 'slow_subsystem' in ai.loaded_subsystems()
+
+            ai.reset_subsystem('slow_subsystem')  # The next use builds a fresh one
+            assert ai.slow_subsystem is not seen[0] and SlowSubsystem.built == 2
+    finally:
+        performance_config.PRELOAD_SUBSYSTEMS = preload
+        del terminal_ai.SUBSYSTEMS['slow_subsystem']
+    print("✅ Built Once Test PASSED")
+
+def run_all_tests():
+    """Run all tests"""
+    test_headless_imports()
+    test_headless_voice()
+    test_built_once()
+    print("\n✅ ALL TERMINAL AI SUBSYSTEM TESTS COMPLETED SUCCESSFULLY!")
+
+if __name__ == "__main__":
+    run_all_tests()
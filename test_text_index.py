@@ -0,0 +1,83 @@
+"""
+Test Suite for the Text Index
+Checks AND queries, prefix matching, ranking, removal and search speed at 100k documents
+"""
+
+import random
+import time
+
+from text_index import InvertedIndex
+
+def test_and_prefix():
+    """Test every query word must match, as a word prefix"""
+    print("\n" + "="*60)
+    print("TEST 1: AND Queries and Prefix Matching")
+    print("="*60)
+
+    index = InvertedIndex()
+    index.add(1, "colleges in Hyderabad")
+    index.add(2, "weather in Hyderabad today")
+    index.add(3, "college fees in Warangal")
+
+    assert sorted(index.search("college")) == [1, 3]
+    assert index.search("coll hyd") == [1]
+    assert index.search("college hyd") == [1]  # An indexed word still matches longer ones
+    assert index.search("hyderabad weather") == [2]
+    assert index.search("hyderabad fees") == []
+    assert index.search("zebra") == []
+    assert index.search("!!") == []
+    print("✅ AND and Prefix Test PASSED")
+
+def test_ranking_and_removal():
+    """Test better matches rank first, ties go to newer documents, removal updates the index"""
+    print("\n" + "="*60)
+    print("TEST 2: Ranking and Removal")
+    print("="*60)
+
+    index = InvertedIndex()
+    index.add(1, "python python python snake")
+    index.add(2, "a long answer that mentions python once among many other words here")
+    index.add(3, "rain today")
+    index.add(4, "rain today")
+
+    assert index.search("python") == [1, 2]
+    assert index.search("rain") == [4, 3]
+    assert index.search("rain", limit=1) == [4]
+
+    index.remove(1, "python python python snake")
+    assert index.search("python") == [2]
+    assert "snake" not in index.postings and "snake" not in index.vocabulary
+    assert len(index) == 3
+    print("✅ Ranking and Removal Test PASSED")
+
+def test_speed():
+    """Test searches stay around a millisecond at 100k documents"""
+    print("\n" + "="*60)
+    print("TEST 3: Search Speed at 100k Documents")
+    print("="*60)
+
+    rng = random.Random(7)
+    words = [f"word{i}" for i in range(5000)] + ["weather", "college", "story", "python"]
+    index = InvertedIndex()
+    for doc_id in range(100_000):
+        index.add(doc_id, " ".join(rng.choice(words) for _ in range(12)))
+
+    queries = ["weather", "college python", "story weath", "word12 word4", "pyth"]
+    start = time.perf_counter()
+    for _ in range(20):
+        for query in queries:
+            index.search(query)
+    average_ms = (time.perf_counter() - start) / (20 * len(queries)) * 1000
+    print(f"Average search: {average_ms:.3f} ms")
+    assert average_ms < 10
+    print("✅ Speed Test PASSED")
+
+def run_all_tests():
+    """Run all tests"""
+    test_and_prefix()
+    test_ranking_and_removal()
+    test_speed()
+    print("\n✅ ALL TEXT INDEX TESTS COMPLETED SUCCESSFULLY!")
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,150 @@
+"""
+Text Index
+Incrementally maintained inverted index for in-memory search: multi-term AND
+queries, prefix matching through a sorted vocabulary and BM25 ranking, with
+newer documents first on ties. Very common words are bounded by ranking only
+the newest max_candidates matches.
+"""
+
+import bisect
+import heapq
+import math
+import re
+from collections import Counter
+from itertools import groupby, islice
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """Lowercase words"""
+    return WORD_PATTERN.findall(text.lower())
+
+
+class InvertedIndex:
+    """Term -> {doc id: term frequency}, updated one document at a time"""
+
+    def __init__(self, k1=1.2, b=0.75, max_expansions=64, max_candidates=500):
+        self.k1 = k1
+        self.b = b
+        self.max_expansions = max_expansions  # Vocabulary terms a prefix may stand for
+        self.max_candidates = max_candidates  # Newest matches ranked per search
+        self.postings = {}
+        self.vocabulary = []  # Sorted terms, for prefix lookups
+        self.lengths = {}  # doc id -> length in words
+        self.total_length = 0
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def add(self, doc_id, text):
+        """Index a document (ids should grow over time: ties rank the larger id first)"""
+        terms = Counter(tokenize(text))
+        for term, count in terms.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = {}
+                bisect.insort(self.vocabulary, term)
+            postings[doc_id] = count
+        self.lengths[doc_id] = sum(terms.values())
+        self.total_length += self.lengths[doc_id]
+
+    def remove(self, doc_id, text):
+        """Drop a document, given the text it was indexed with"""
+        for term in set(tokenize(text)):
+            postings = self.postings.get(term)
+            if postings is None or postings.pop(doc_id, None) is None or postings:
+                continue
+            del self.postings[term]
+            del self.vocabulary[bisect.bisect_left(self.vocabulary, term)]
+        self.total_length -= self.lengths.pop(doc_id, 0)
+
+    def clear(self):
+        self.postings = {}
+        self.vocabulary = []
+        self.lengths = {}
+        self.total_length = 0
+
+    def expand(self, prefix):
+        """Indexed terms starting with prefix (the exact term first, if indexed)"""
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        terms = []
+        for term in self.vocabulary[start:start + self.max_expansions]:
+            if not term.startswith(prefix):
+                break
+            terms.append(term)
+        return terms
+
+    def _matches(self, word):
+        """Postings of every indexed term word is a prefix of (word itself included)"""
+        return [self.postings[term] for term in self.expand(word)]
+
+    def _newest_first(self, postings):
+        """Ids of the documents in any of postings, newest first
+
+        Documents are added in id order, so each postings dict is already sorted.
+        """
+        if len(postings) == 1:
+            yield from reversed(postings[0])
+            return
+        merged = heapq.merge(*(reversed(p) for p in postings), reverse=True)
+        for doc_id, _ in groupby(merged):
+            yield doc_id
+
+    @staticmethod
+    def _documents(postings):
+        """Ids of the documents in any of postings"""
+        return postings[0].keys() if len(postings) == 1 else set().union(*postings)
+
+    @staticmethod
+    def _frequencies(postings, doc_ids):
+        """doc id -> frequency summed over postings, for doc_ids only"""
+        if len(postings) == 1:
+            p = postings[0]
+            return {doc_id: p[doc_id] for doc_id in doc_ids}
+        frequencies = dict.fromkeys(doc_ids, 0)
+        wanted = set(doc_ids)
+        for p in postings:
+            for doc_id in wanted.intersection(p):
+                frequencies[doc_id] += p[doc_id]
+        return frequencies
+
+    def search(self, query, limit=10):
+        """Ids of the documents matching every query word, best first
+
+        Every word also matches longer words (typing "hyd" finds "hyderabad"),
+        the same as the SQLite backend's FTS5 prefix queries.
+        """
+        words = list(dict.fromkeys(tokenize(query)))
+        if not words or not self.lengths:
+            return []
+        matches = [self._matches(word) for word in words]
+        if not all(matches):
+            return []
+
+        if len(matches) == 1:
+            candidates = list(islice(self._newest_first(matches[0]), self.max_candidates))
+        else:
+            # Intersect the words' documents, rarest first, then rank only the newest matches
+            documents = sorted((self._documents(postings) for postings in matches), key=len)
+            common = documents[0] & documents[1]
+            for docs in documents[2:]:
+                common &= docs
+            candidates = sorted(common, reverse=True)[:self.max_candidates]
+
+        n = len(self.lengths)
+        average_length = self.total_length / n
+        weights = []  # (idf, candidate frequencies) per word
+        for postings in matches:
+            df = min(n, sum(map(len, postings)))
+            weights.append((math.log(1 + (n - df + 0.5) / (df + 0.5)), self._frequencies(postings, candidates)))
+
+        def score(doc_id):
+            norm = self.k1 * (1 - self.b + self.b * self.lengths[doc_id] / average_length)
+            total = 0.0
+            for idf, frequencies in weights:
+                tf = frequencies[doc_id]
+                total += idf * tf * (self.k1 + 1) / (tf + norm)
+            return total, doc_id
+
+        return heapq.nlargest(limit, candidates, key=score)
@@ -0,0 +1,45 @@
+"""
+Voice Commands
+Terminal commands for the voice clone system, imported on first use
+"""
+
+import os
+
+
+def _voice(ai):
+    if ai.headless:
+        print("🔇 Voice is off in headless mode")
+        return None
+    return ai.voice
+
+
+def voice_test(ai, args):
+    voice = _voice(ai)
+    if voice:
+        voice.test_voice()
+
+
+def voice_sample(ai, args):
+    voice = _voice(ai)
+    if not voice:
+        return
+    if voice.sample_voice:
+        print(f"Voice sample: {os.path.basename(voice.sample_voice)}")
+    else:
+        print("No voice sample found")
+
+
+def human_effects_on(ai, args):
+    voice = _voice(ai)
+    if not voice:
+        return
+    voice.human_effects = True
+    print("🎤 Human voice effects enabled (breathing, pauses, throat clearing)")
+
+
+def human_effects_off(ai, args):
+    voice = _voice(ai)
+    if not voice:
+        return
+    voice.human_effects = False
+    print("🎤 Human voice effects disabled (clean speech only)")